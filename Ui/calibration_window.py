@@ -1,24 +1,34 @@
 import tkinter as tk
 from tkinter import Canvas
-import cv2
 import numpy as np
-from PIL import Image, ImageTk
-import time
 
 from core.calibration import CalibrationLogic
-from vision.pose_estimator import PoseEstimator, preprocess_image
+from vision.pose_estimator import PoseEstimator
+from vision.preprocessing import FramePreprocessor
+from .preview import PreviewRenderer
 
 
 class CalibrationWindow(tk.Tk):
-    def __init__(self, camera_stream, on_complete_callback):
+    def __init__(self, camera_stream, on_complete_callback, recorder=None, roi_mode=False,
+                 preview_fps=15.0, preview_scale=1.0, model_complexity=1, pose_estimator=None):
         super().__init__()
         self.title("EA-WIP Calibration")
         self.geometry("640x480")
         
         self.camera_stream = camera_stream
         self.on_complete_callback = on_complete_callback
+        self.recorder = recorder
+        self.preview_fps = preview_fps
+        self.preview_scale = preview_scale
         
-        self.pose_estimator = PoseEstimator()
+        if pose_estimator is None:
+            pose_estimator = PoseEstimator(roi_mode=roi_mode, model_complexity=model_complexity)
+        else:
+            # shared estimator: adaptive quality may have stepped it down during an earlier inference run
+            pose_estimator.set_model_complexity(model_complexity)
+            pose_estimator.reset_roi()
+        self.pose_estimator = pose_estimator
+        self.preprocessor = FramePreprocessor(target_size=(640, 480), pool_size=1)
         self.calibration_logic = CalibrationLogic(fps=30, calibration_duration=8.0)
         
         self.setup_gui()
@@ -29,6 +39,13 @@ class CalibrationWindow(tk.Tk):
         self.canvas.pack()
         
         self.canvas_video = self.canvas.create_image(320, 240)
+        self.preview = PreviewRenderer(
+            self.canvas,
+            self.canvas_video,
+            self.pose_estimator,
+            max_fps=self.preview_fps,
+            scale=self.preview_scale
+        )
         
         self.state_label = self.canvas.create_text(
             10, 10, 
@@ -47,30 +64,37 @@ class CalibrationWindow(tk.Tk):
         )
     
     def update_video_feed(self):
-        frame = self.camera_stream.read()
+        captured = self.camera_stream.read_frame(timeout=0)
         
-        if frame is None:
+        if captured is None:
             self.after(10, self.update_video_feed)
             return
         
-        frame = preprocess_image(frame, target_size=(640, 480))
-        results = self.pose_estimator.process(frame)
+        frame_rgb = self.preprocessor.to_rgb(captured.image)
+        results = self.pose_estimator.process_rgb(frame_rgb)
+        
+        current_time = captured.timestamp
         
         if results.pose_landmarks:
             heel_data = self.pose_estimator.extract_heel_data(results)
             
+            if self.recorder is not None:
+                self.recorder.append(
+                    current_time,
+                    landmarks=self.pose_estimator.extract_landmark_array(results),
+                    heel_data=heel_data,
+                    frame_index=captured.sequence
+                )
+            
             if heel_data:
-                current_time = time.time()
                 self.calibration_logic.process_frame(
                     heel_data['left_height'],
                     heel_data['right_height'],
                     current_time
                 )
-            
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_rgb = self.pose_estimator.draw_landmarks(frame_rgb, results)
         else:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if self.recorder is not None:
+                self.recorder.append(current_time, frame_index=captured.sequence)
         
         progress = (self.calibration_logic.frame_count / self.calibration_logic.max_frames) * 100
         self.canvas.itemconfig(
@@ -82,7 +106,7 @@ class CalibrationWindow(tk.Tk):
             text=f"Progress: {progress:.1f}%"
         )
         
-        self.display_image(frame_rgb)
+        self.preview.render(frame_rgb, results, is_rgb=True)
         
         if self.calibration_logic.is_calibration_complete():
             self.finish_calibration()
@@ -90,11 +114,6 @@ class CalibrationWindow(tk.Tk):
         
         self.after(10, self.update_video_feed)
     
-    def display_image(self, img):
-        imgtk = ImageTk.PhotoImage(image=Image.fromarray(img))
-        self.canvas.itemconfig(self.canvas_video, image=imgtk)
-        self.canvas.image = imgtk
-    
     def finish_calibration(self):
         results = self.calibration_logic.get_calibration_results()
         
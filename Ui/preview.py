@@ -0,0 +1,55 @@
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class PreviewRenderer:
+    def __init__(self, canvas, image_item, pose_estimator, size=(640, 480), max_fps=15.0, scale=1.0):
+        self.canvas = canvas
+        self.image_item = image_item
+        self.pose_estimator = pose_estimator
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.size = (max(int(size[0] * scale), 1), max(int(size[1] * scale), 1))
+        
+        width, height = self.size
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self._image = Image.new('RGB', self.size)
+        self.photo = ImageTk.PhotoImage('RGB', self.size)
+        self.canvas.itemconfig(self.image_item, image=self.photo)
+        
+        self._last_render = None
+        self.rendered_frames = 0
+        self.skipped_frames = 0
+    
+    def due(self):
+        return self._last_render is None or time.monotonic() - self._last_render >= self.min_interval
+    
+    def render(self, frame, pose_results=None, force=False, is_rgb=False):
+        if not force and not self.due():
+            self.skipped_frames += 1
+            return False
+        self._last_render = time.monotonic()
+        
+        height, width = frame.shape[:2]
+        if is_rgb:
+            # copy so the landmark overlay never touches a frame shared with inference
+            if (width, height) != self.size:
+                cv2.resize(frame, self.size, dst=self._rgb, interpolation=cv2.INTER_AREA)
+            else:
+                np.copyto(self._rgb, frame)
+        else:
+            if (width, height) != self.size:
+                frame = cv2.resize(frame, self.size, dst=self._resized, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        
+        if pose_results is not None:
+            self.pose_estimator.draw_landmarks(self._rgb, pose_results)
+        
+        # load into the existing PIL image and Tk photo instead of building new ones per frame
+        self._image.frombytes(self._rgb.data)
+        self.photo.paste(self._image)
+        self.rendered_frames += 1
+        return True
\ No newline at end of file
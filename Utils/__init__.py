@@ -1,3 +1,7 @@
 from .config import Config
+from .recording import SessionRecorder, open_session, session_to_trace
+from .metrics import Metrics, MetricsExporter, LatencyHistogram
+from .profiles import ProfileStore
 
-__all__ = ['Config']
\ No newline at end of file
+__all__ = ['Config', 'SessionRecorder', 'open_session', 'session_to_trace', 'Metrics', 'MetricsExporter',
+           'LatencyHistogram', 'ProfileStore']
\ No newline at end of file
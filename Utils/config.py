@@ -2,28 +2,54 @@ class Config:
     DEFAULT_UDP_IP = "127.0.0.1"
     DEFAULT_UDP_PORT = 5005
     DEFAULT_UDP_RECV_PORT = 6000
+    DEFAULT_UDP_PROTOCOL = "text"
+    DEFAULT_UDP_BATCH_SIZE = 1
+    DEFAULT_FANOUT_PORT = None
+    DEFAULT_OUTPUT_RATE = None
+    DEFAULT_MAX_PREDICTION = 0.1
     
     DEFAULT_CAMERA_ID = 0
+    DEFAULT_CAMERA_WIDTH = 640
+    DEFAULT_CAMERA_HEIGHT = 480
+    DEFAULT_CAMERA_FOURCC = None
     DEFAULT_FPS = 30
+    DEFAULT_PREVIEW_FPS = 15.0
+    DEFAULT_PREVIEW_SCALE = 1.0
+    DEFAULT_FUSION_MAX_SKEW = 0.034
+    DEFAULT_FUSION_MAX_WAIT = 0.015
     
     DEFAULT_CALIBRATION_DURATION = 8.0
     DEFAULT_BASE_SPEED = 1.3
     
+    DEFAULT_PROFILE_DIR = "profiles"
+    DEFAULT_PROFILE_MAX_AGE_DAYS = 30.0
+    
     LAMBDA_WEIGHT = 0.5
     THETA_O = 0.25
     
     MEDIAPIPE_MIN_DETECTION_CONFIDENCE = 0.5
     MEDIAPIPE_MIN_TRACKING_CONFIDENCE = 0.5
+    MEDIAPIPE_MODEL_COMPLEXITY = 1
     
     @classmethod
-    def get_udp_config(cls, ip=None, port=None):
+    def get_udp_config(cls, ip=None, port=None, protocol=None, batch_size=None, fanout_port=None,
+                       output_rate=None, max_prediction=None):
         return {
             'ip': ip if ip is not None else cls.DEFAULT_UDP_IP,
-            'port': port if port is not None else cls.DEFAULT_UDP_PORT
+            'port': port if port is not None else cls.DEFAULT_UDP_PORT,
+            'protocol': protocol if protocol is not None else cls.DEFAULT_UDP_PROTOCOL,
+            'batch_size': batch_size if batch_size is not None else cls.DEFAULT_UDP_BATCH_SIZE,
+            'fanout_port': fanout_port if fanout_port is not None else cls.DEFAULT_FANOUT_PORT,
+            'output_rate': output_rate if output_rate is not None else cls.DEFAULT_OUTPUT_RATE,
+            'max_prediction': max_prediction if max_prediction is not None else cls.DEFAULT_MAX_PREDICTION
         }
     
     @classmethod
-    def get_camera_config(cls, camera_id=None):
+    def get_camera_config(cls, camera_id=None, width=None, height=None, fps=None, fourcc=None):
         return {
-            'camera_id': camera_id if camera_id is not None else cls.DEFAULT_CAMERA_ID
+            'camera_id': camera_id if camera_id is not None else cls.DEFAULT_CAMERA_ID,
+            'width': width if width is not None else cls.DEFAULT_CAMERA_WIDTH,
+            'height': height if height is not None else cls.DEFAULT_CAMERA_HEIGHT,
+            'fps': fps if fps is not None else cls.DEFAULT_FPS,
+            'fourcc': fourcc if fourcc is not None else cls.DEFAULT_CAMERA_FOURCC
         }
\ No newline at end of file
@@ -0,0 +1,281 @@
+import json
+import math
+import os
+import socket
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LatencyHistogram:
+    def __init__(self, min_seconds=1e-5, max_seconds=10.0, buckets_per_decade=20):
+        self.min_seconds = min_seconds
+        self.buckets_per_decade = buckets_per_decade
+        self._log_min = math.log10(min_seconds)
+        
+        # log-spaced upper bounds (~12% wide at 20 per decade), the last bucket takes
+        # everything above max_seconds so memory stays fixed whatever gets recorded
+        num_buckets = int(math.ceil((math.log10(max_seconds) - self._log_min) * buckets_per_decade)) + 1
+        self.upper_bounds = [min_seconds * 10 ** (i / buckets_per_decade) for i in range(num_buckets)]
+        self.upper_bounds.append(math.inf)
+        self.counts = [0] * len(self.upper_bounds)
+        
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # recorded from the pipeline, read from the exporter and HTTP threads
+        self._lock = threading.Lock()
+    
+    def record(self, seconds):
+        if seconds <= self.min_seconds:
+            index = 0
+        else:
+            index = int(math.ceil((math.log10(seconds) - self._log_min) * self.buckets_per_decade))
+            if index >= len(self.counts):
+                index = len(self.counts) - 1
+        
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+    
+    def percentile(self, q):
+        with self._lock:
+            return self._percentile(q)
+    
+    def _percentile(self, q):
+        if self.count == 0:
+            return 0.0
+        
+        target = q / 100.0 * self.count
+        cumulative = 0
+        lower = 0.0
+        for upper, count in zip(self.upper_bounds, self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                # geometric bucket centre, within ~6% of the true value
+                if lower <= 0.0 or upper == math.inf:
+                    return min(upper, self.max)
+                return min(math.sqrt(lower * upper), self.max)
+            lower = upper
+        return self.max
+    
+    def summary(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+                'p50_ms': self._percentile(50) * 1000,
+                'p95_ms': self._percentile(95) * 1000,
+                'p99_ms': self._percentile(99) * 1000,
+                'max_ms': self.max * 1000
+            }
+    
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * len(self.upper_bounds)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+
+class RateCounter:
+    def __init__(self, window=60):
+        self.ticks = deque(maxlen=window)
+    
+    def tick(self):
+        self.ticks.append(time.monotonic())
+    
+    def rate(self):
+        ticks = list(self.ticks)
+        if len(ticks) < 2 or ticks[-1] <= ticks[0]:
+            return 0.0
+        return (len(ticks) - 1) / (ticks[-1] - ticks[0])
+
+
+class Metrics:
+    def __init__(self, rate_window=60):
+        self.rate_window = rate_window
+        self.stages = {}
+        self.rates = {}
+        self.counters = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def histogram(self, stage):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, LatencyHistogram())
+        return histogram
+    
+    def record(self, stage, seconds):
+        self.histogram(stage).record(seconds)
+    
+    def tick(self, name):
+        counter = self.rates.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.rates.setdefault(name, RateCounter(self.rate_window))
+        counter.tick()
+    
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def snapshot(self):
+        with self._lock:
+            stages = list(self.stages.items())
+            rates = list(self.rates.items())
+            counters = dict(self.counters)
+        
+        return {
+            'uptime_s': time.monotonic() - self.started,
+            'stages': {name: histogram.summary() for name, histogram in stages},
+            'fps': {name: counter.rate() for name, counter in rates},
+            'counters': counters
+        }
+    
+    def format_report(self):
+        snapshot = self.snapshot()
+        lines = [f"{'stage':<16}{'count':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)"]
+        for name, stats in snapshot['stages'].items():
+            lines.append(f"{name:<16}{stats['count']:>8}{stats['mean_ms']:>9.2f}{stats['p50_ms']:>9.2f}"
+                         f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}")
+        for name, fps in snapshot['fps'].items():
+            lines.append(f"{name + ' fps':<16}{fps:>8.1f}")
+        for name, value in snapshot['counters'].items():
+            lines.append(f"{name:<16}{value:>8}")
+        return '\n'.join(lines)
+    
+    def reset(self):
+        with self._lock:
+            for histogram in self.stages.values():
+                histogram.reset()
+            self.rates = {}
+            self.counters = {}
+            self.started = time.monotonic()
+    
+    def write_json(self, path):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(temp_path, path)
+    
+    def send_udp(self, address, sock=None):
+        payload = json.dumps(self.snapshot()).encode('utf-8')
+        if sock is not None:
+            sock.sendto(payload, address)
+            return
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.sendto(payload, address)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip('/') not in ('', '/metrics'):
+            self.send_error(404)
+            return
+        
+        body = json.dumps(self.server.metrics.snapshot()).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(':')
+    return (host or '127.0.0.1', int(port))
+
+
+class MetricsExporter:
+    def __init__(self, metrics, path=None, udp_address=None, http_port=None, http_host='127.0.0.1',
+                 interval=5.0):
+        self.metrics = metrics
+        self.path = path
+        self.udp_address = parse_address(udp_address) if isinstance(udp_address, str) else udp_address
+        self.http_port = http_port
+        self.http_host = http_host
+        self.interval = interval
+        
+        self.server = None
+        self.sock = None
+        self.thread = None
+        self._stop_event = threading.Event()
+    
+    def start(self):
+        if self.http_port is not None:
+            self.server = ThreadingHTTPServer((self.http_host, self.http_port), _MetricsHandler)
+            self.server.daemon_threads = True
+            self.server.metrics = self.metrics
+            self.http_port = self.server.server_address[1]
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        
+        if self.udp_address is not None:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+        if self.path is not None or self.udp_address is not None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        
+        return self
+    
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.export()
+    
+    def export(self):
+        try:
+            if self.path is not None:
+                self.metrics.write_json(self.path)
+            if self.udp_address is not None:
+                self.metrics.send_udp(self.udp_address, sock=self.sock)
+        except Exception as e:
+            print(f"Metrics Export Error: {e}")
+    
+    def stop(self):
+        self._stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.export()
+        
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+LATENCY_STAGES = (
+    ('queue', 'Capture -> processing start'),
+    ('processing', 'Processing start -> packet sent'),
+    ('motion_to_packet', 'Capture -> packet sent')
+)
+
+
+def format_latency_report(metrics, camera_dropped=0):
+    snapshot = metrics.snapshot()
+    lines = [f"{'End-to-end latency (ms)':<36}{'p50':>6}{'p95':>9}{'p99':>9}{'max':>9}"]
+    for stage, label in LATENCY_STAGES:
+        stats = snapshot['stages'].get(stage)
+        if stats is None:
+            continue
+        lines.append(f"  {label:<34}{stats['p50_ms']:>6.1f}{stats['p95_ms']:>9.1f}"
+                     f"{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+    
+    counters = snapshot['counters']
+    lines.append(f"  Frames dropped before processing: {counters.get('frames_dropped', 0)} "
+                 f"(camera total {camera_dropped})")
+    lines.append(f"  Frames without pose (no packet):  {counters.get('frames_without_pose', 0)}")
+    return '\n'.join(lines)
\ No newline at end of file
@@ -0,0 +1,96 @@
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+
+PROFILE_VERSION = 1
+PROFILE_SUFFIX = '.json'
+
+CALIBRATION_KEYS = ('mu_h_left', 'mu_h_right', 'sigma_h_left', 'sigma_h_right', 'threshold_left',
+                    'threshold_right', 'h_c_left', 'h_c_right', 'f_c_left', 'f_c_right')
+
+
+def camera_metadata(camera_id, camera_stream):
+    return {
+        'camera_id': camera_id,
+        'width': camera_stream.width,
+        'height': camera_stream.height,
+        'fps': camera_stream.fps
+    }
+
+
+class ProfileStore:
+    def __init__(self, directory, max_age_days=30.0, fps_tolerance=0.1):
+        self.directory = directory
+        self.max_age_days = max_age_days
+        self.fps_tolerance = fps_tolerance
+    
+    def path(self, user):
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', user.strip()).strip('.') or 'default'
+        return os.path.join(self.directory, name + PROFILE_SUFFIX)
+    
+    def save(self, user, calib_results, camera):
+        os.makedirs(self.directory, exist_ok=True)
+        profile = {
+            'version': PROFILE_VERSION,
+            'user': user,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'camera': dict(camera),
+            'calibration': {key: float(calib_results[key]) for key in CALIBRATION_KEYS}
+        }
+        
+        path = self.path(user)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(profile, f, indent=2)
+        os.replace(temp_path, path)
+        return path
+    
+    def load(self, user):
+        try:
+            with open(self.path(user)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Profile Load Error: {e}")
+            return None
+    
+    def check(self, profile, camera):
+        if profile.get('version') != PROFILE_VERSION:
+            return f"unsupported profile version {profile.get('version')}"
+        
+        calibration = profile.get('calibration', {})
+        missing = [key for key in CALIBRATION_KEYS if key not in calibration]
+        if missing:
+            return f"missing calibration values: {', '.join(missing)}"
+        
+        try:
+            created = datetime.fromisoformat(profile['created'])
+        except (KeyError, TypeError, ValueError):
+            return "missing creation date"
+        age_days = (datetime.now(timezone.utc) - created).total_seconds() / 86400.0
+        if self.max_age_days is not None and age_days > self.max_age_days:
+            return f"profile is {age_days:.0f} days old"
+        
+        # heel heights depend on where the camera is and how it frames the user
+        stored = profile.get('camera', {})
+        for key in ('camera_id', 'width', 'height'):
+            if stored.get(key) != camera[key]:
+                return f"camera {key} changed ({stored.get(key)} -> {camera[key]})"
+        stored_fps = stored.get('fps') or 0.0
+        if abs(stored_fps - camera['fps']) > self.fps_tolerance * max(camera['fps'], 1.0):
+            return f"camera fps changed ({stored_fps:.1f} -> {camera['fps']:.1f})"
+        
+        return None
+    
+    def load_valid(self, user, camera):
+        profile = self.load(user)
+        if profile is None:
+            return None, "no stored profile"
+        
+        problem = self.check(profile, camera)
+        if problem is not None:
+            return None, problem
+        return profile['calibration'], None
\ No newline at end of file
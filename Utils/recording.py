@@ -0,0 +1,160 @@
+import os
+import struct
+
+import numpy as np
+
+
+NUM_LANDMARKS = 33
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('frame_index', '<i8'),
+    ('landmarks', '<f4', (NUM_LANDMARKS, 4)),
+    ('has_pose', 'u1'),
+    ('left_height', '<f4'),
+    ('right_height', '<f4'),
+    ('left_x', '<f4'),
+    ('right_x', '<f4'),
+    ('left_visibility', '<f4'),
+    ('right_visibility', '<f4')
+])
+
+RECORDING_MAGIC = b'EAWIPREC'
+RECORDING_VERSION = 1
+RECORDING_SUFFIX = '.ewrec'
+
+# magic, version, record size, record count, padded to a fixed 64 byte header
+HEADER_STRUCT = struct.Struct('<8sIIQ')
+HEADER_SIZE = 64
+
+HEEL_FIELDS = ('left_height', 'right_height', 'left_x', 'right_x', 'left_visibility', 'right_visibility')
+_MISSING_HEEL = (np.nan,) * len(HEEL_FIELDS)
+
+
+def _read_header(f):
+    header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError("Recording header is truncated")
+    
+    magic, version, record_size, count = HEADER_STRUCT.unpack_from(header)
+    if magic != RECORDING_MAGIC:
+        raise ValueError("Not an EA-WIP session recording")
+    if version != RECORDING_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported recording version {version} (record size {record_size})")
+    
+    return count
+
+
+class SessionRecorder:
+    def __init__(self, path, chunk_records=4096, flush_interval=300):
+        self.path = path
+        self.chunk_records = chunk_records
+        self.flush_interval = flush_interval
+        
+        self.count = 0
+        self.capacity = 0
+        self._since_flush = 0
+        self._records = None
+        
+        self._file = open(path, 'w+b')
+        self._write_header()
+        self._grow()
+    
+    def _write_header(self):
+        header = bytearray(HEADER_SIZE)
+        HEADER_STRUCT.pack_into(header, 0, RECORDING_MAGIC, RECORDING_VERSION,
+                                RECORD_DTYPE.itemsize, self.count)
+        self._file.seek(0)
+        self._file.write(header)
+        self._file.flush()
+    
+    def _grow(self):
+        if self._records is not None:
+            self._records.flush()
+            self._records = None
+        
+        self.capacity += self.chunk_records
+        self._file.truncate(HEADER_SIZE + self.capacity * RECORD_DTYPE.itemsize)
+        self._records = np.memmap(self._file, dtype=RECORD_DTYPE, mode='r+',
+                                  offset=HEADER_SIZE, shape=(self.capacity,))
+    
+    def append(self, timestamp, landmarks=None, heel_data=None, frame_index=None):
+        if self.count == self.capacity:
+            self._grow()
+        
+        if frame_index is None:
+            frame_index = self.count
+        
+        if heel_data:
+            heel_values = tuple(heel_data[field] for field in HEEL_FIELDS)
+        else:
+            heel_values = _MISSING_HEEL
+        
+        if landmarks is not None:
+            self._records[self.count] = (timestamp, frame_index, landmarks, 1) + heel_values
+        else:
+            self._records[self.count] = (timestamp, frame_index, 0.0, 0) + heel_values
+        
+        self.count += 1
+        self._since_flush += 1
+        if self._since_flush >= self.flush_interval:
+            self.flush()
+    
+    def flush(self):
+        if self._records is None:
+            return
+        self._records.flush()
+        self._write_header()
+        self._since_flush = 0
+    
+    def close(self):
+        if self._file.closed:
+            return
+        
+        self.flush()
+        self._records = None
+        self._file.truncate(HEADER_SIZE + self.count * RECORD_DTYPE.itemsize)
+        self._file.close()
+    
+    def __len__(self):
+        return self.count
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        if hasattr(self, '_file'):
+            self.close()
+
+
+def view_recording_path(path, view):
+    # further cameras of a multi-camera session are recorded next to the first one
+    if view == 0:
+        return path
+    base, suffix = os.path.splitext(path)
+    return f"{base}.view{view}{suffix or RECORDING_SUFFIX}"
+
+
+def open_session(path):
+    with open(path, 'rb') as f:
+        count = _read_header(f)
+    
+    available = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    count = min(count, available)
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+
+def session_to_trace(records):
+    return {
+        'timestamp': records['timestamp'].astype(np.float64),
+        'left_height': records['left_height'].astype(np.float64),
+        'right_height': records['right_height'].astype(np.float64),
+        'left_visibility': records['left_visibility'].astype(np.float64),
+        'right_visibility': records['right_visibility'].astype(np.float64)
+    }
\ No newline at end of file
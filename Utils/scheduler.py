@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+
+
+class _Entry:
+    def __init__(self, session, weight):
+        self.session = session
+        self.weight = weight
+        self.virtual_time = 0.0
+        self.ready = False
+        self.ready_since = 0.0
+        self.busy = False
+        self.processed = 0
+        self.busy_time = 0.0
+        self.wait_time = 0.0
+
+
+class FairScheduler:
+    # runs the sessions' frames on a fixed pool of worker threads; a session is eligible
+    # when its camera has published a frame it has not processed yet, and the eligible
+    # session with the least service relative to its weight (its target fps) goes next,
+    # so under overload every session keeps the same share of its frame rate
+    def __init__(self, workers=None):
+        self.num_workers = workers or os.cpu_count() or 1
+        self._condition = threading.Condition()
+        self._entries = {}
+        # virtual time of the last dispatch; sessions returning from idle start here
+        # instead of claiming the service they missed
+        self._virtual_time = 0.0
+        self.running = False
+        self.threads = []
+    
+    def add(self, session, weight=30.0):
+        with self._condition:
+            entry = _Entry(session, weight)
+            entry.virtual_time = self._virtual_time
+            self._entries[id(session)] = entry
+    
+    def remove(self, session):
+        with self._condition:
+            self._entries.pop(id(session), None)
+    
+    def notify(self, session):
+        # called from the session's camera thread for every new frame
+        with self._condition:
+            entry = self._entries.get(id(session))
+            if entry is None or entry.ready:
+                return
+            if not entry.busy:
+                entry.virtual_time = max(entry.virtual_time, self._virtual_time)
+            entry.ready = True
+            entry.ready_since = time.monotonic()
+            self._condition.notify()
+    
+    def start(self):
+        self.running = True
+        self.threads = [threading.Thread(target=self._run, daemon=True) for _ in range(self.num_workers)]
+        for thread in self.threads:
+            thread.start()
+        return self
+    
+    def _next(self):
+        chosen = None
+        for entry in self._entries.values():
+            if entry.ready and not entry.busy and (chosen is None or entry.virtual_time < chosen.virtual_time):
+                chosen = entry
+        return chosen
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                entry = self._next()
+                while self.running and entry is None:
+                    self._condition.wait()
+                    entry = self._next()
+                if not self.running:
+                    return
+                
+                start = time.monotonic()
+                entry.wait_time += start - entry.ready_since
+                entry.ready = False
+                entry.busy = True
+                self._virtual_time = entry.virtual_time
+                entry.virtual_time += 1.0 / entry.weight
+            
+            try:
+                entry.session.process_next()
+            except Exception as e:
+                print(f"Scheduler Error: {e}")
+            
+            with self._condition:
+                entry.busy = False
+                entry.processed += 1
+                entry.busy_time += time.monotonic() - start
+                if entry.ready:
+                    # a frame arrived while this one was processed
+                    self._condition.notify()
+    
+    def stats(self, session):
+        with self._condition:
+            entry = self._entries[id(session)]
+            return {
+                'processed': entry.processed,
+                'busy_time': entry.busy_time,
+                'wait_time': entry.wait_time
+            }
+    
+    def stop(self):
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        for thread in self.threads:
+            thread.join()
\ No newline at end of file
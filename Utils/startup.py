@@ -0,0 +1,123 @@
+import importlib
+import threading
+import time
+
+
+STARTUP_STAGES = (
+    ('imports', 'imports'),
+    ('camera_open', 'camera open'),
+    ('first_frame', 'first frame'),
+    ('pose_model', 'pose model'),
+    ('warmup', 'warm-up'),
+    ('ready', 'ready')
+)
+
+# time to first frame and to ready also go to the metrics export, as one-sample stages
+METRIC_STAGES = {'first_frame': 'first_frame', 'ready': 'startup'}
+
+
+class WarmStartup:
+    def __init__(self, camera_config, roi_mode=False, model_complexity=1, warmup_frames=2,
+                 preload_modules=(), metrics=None, started=None, first_frame_timeout=5.0):
+        self.camera_config = camera_config
+        self.roi_mode = roi_mode
+        self.model_complexity = model_complexity
+        self.warmup_frames = warmup_frames
+        self.preload_modules = preload_modules
+        self.metrics = metrics
+        self.started = started if started is not None else time.monotonic()
+        self.first_frame_timeout = first_frame_timeout
+        
+        self.camera_stream = None
+        self.pose_estimator = None
+        self.first_frame = None
+        self.error = None
+        # seconds since self.started at which each stage finished
+        self.timings = {}
+        
+        self._camera_error = None
+        self._done = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+    
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+    
+    def _mark(self, stage):
+        elapsed = time.monotonic() - self.started
+        self.timings[stage] = elapsed
+        if self.metrics is not None and stage in METRIC_STAGES:
+            self.metrics.record(METRIC_STAGES[stage], elapsed)
+    
+    def _run(self):
+        try:
+            self._initialize()
+        except Exception as e:
+            self.error = e
+            self.close()
+        finally:
+            self._done.set()
+    
+    def _initialize(self):
+        # cv2 and mediapipe are imported here so the caller's window comes up without waiting for them
+        from vision.pose_estimator import PoseEstimator
+        from vision.preprocessing import FramePreprocessor
+        for module in self.preload_modules:
+            importlib.import_module(module)
+        self._mark('imports')
+        
+        # opening the camera and building the pose graph are independent, and both take a while
+        camera_thread = threading.Thread(target=self._open_camera, daemon=True)
+        camera_thread.start()
+        
+        self.pose_estimator = PoseEstimator(roi_mode=self.roi_mode, model_complexity=self.model_complexity)
+        self._mark('pose_model')
+        
+        camera_thread.join()
+        if self._camera_error is not None:
+            raise self._camera_error
+        
+        # the first inferences pay for lazy allocations inside the graph
+        if self.first_frame is not None and self.warmup_frames > 0:
+            preprocessor = FramePreprocessor(pool_size=1)
+            image_rgb = preprocessor.to_rgb(self.first_frame.image)
+            for _ in range(self.warmup_frames):
+                self.pose_estimator.process_rgb(image_rgb)
+            self.pose_estimator.reset_roi()
+            self._mark('warmup')
+        
+        self._mark('ready')
+    
+    def _open_camera(self):
+        from vision.pose_estimator import CameraStream
+        
+        try:
+            self.camera_stream = CameraStream(
+                camera_id=self.camera_config['camera_id'],
+                width=self.camera_config['width'],
+                height=self.camera_config['height'],
+                fps=self.camera_config['fps'],
+                fourcc=self.camera_config['fourcc']
+            )
+            self._mark('camera_open')
+            
+            self.first_frame = self.camera_stream.read_frame(timeout=self.first_frame_timeout)
+            if self.first_frame is None:
+                raise ConnectionError(f"No frame from camera {self.camera_config['camera_id']} "
+                                      f"within {self.first_frame_timeout:.1f} s")
+            self._mark('first_frame')
+        except Exception as e:
+            self._camera_error = e
+    
+    def format_report(self):
+        parts = [f"{label} {self.timings[stage]:.2f} s" for stage, label in STARTUP_STAGES
+                 if stage in self.timings]
+        return "Startup (since launch): " + ", ".join(parts)
+    
+    def close(self):
+        if self.camera_stream is not None:
+            self.camera_stream.stop()
\ No newline at end of file
@@ -1,3 +1,10 @@
-from .pose_estimator import PoseEstimator, CameraStream, preprocess_image
+from .pose_estimator import PoseEstimator, CameraStream, Frame, preprocess_image
+from .preprocessing import FramePreprocessor
+from .latest_slot import LatestSlot
+from .pipeline import InferencePipeline
+from .fusion import MultiViewSource, PoseWorker
+from .quality import AdaptiveQualityController, QUALITY_LEVELS, build_quality_levels
 
-__all__ = ['PoseEstimator', 'CameraStream', 'preprocess_image']
\ No newline at end of file
+__all__ = ['PoseEstimator', 'CameraStream', 'Frame', 'preprocess_image', 'FramePreprocessor', 'LatestSlot',
+           'InferencePipeline', 'MultiViewSource', 'PoseWorker', 'AdaptiveQualityController', 'QUALITY_LEVELS',
+           'build_quality_levels']
\ No newline at end of file
@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import deque
+from time import perf_counter
+
+from core.fusion import HEEL_FIELDS, ViewAligner, fuse_views, sample_view
+
+from .latest_slot import LatestSlot
+from .preprocessing import FramePreprocessor
+
+
+class ViewBuffer:
+    # the last few pose results of one camera, looked up by capture time
+    def __init__(self, size=8):
+        self._condition = threading.Condition()
+        self._timestamps = deque(maxlen=size)
+        self._views = deque(maxlen=size)
+        self._closed = False
+    
+    def put(self, timestamp, heel_data):
+        with self._condition:
+            self._timestamps.append(timestamp)
+            self._views.append(heel_data)
+            self._condition.notify_all()
+    
+    def sample(self, t, max_skew, max_wait):
+        # a frame captured just after t may still be in pose inference; wait briefly for it
+        deadline = time.monotonic() + max_wait
+        with self._condition:
+            while not self._closed and (not self._timestamps or self._timestamps[-1] < t):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            timestamps = list(self._timestamps)
+            views = list(self._views)
+        return sample_view(timestamps, views, t, max_skew)
+    
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class PoseWorker:
+    # captures and runs pose inference for one camera on its own thread; MediaPipe releases
+    # the GIL while a graph runs, so the cameras' inferences overlap
+    def __init__(self, camera_stream, pose_estimator, target_size=(640, 480), recorder=None):
+        self.camera_stream = camera_stream
+        self.pose_estimator = pose_estimator
+        self.preprocessor = FramePreprocessor(target_size=target_size)
+        self.recorder = recorder
+        
+        self.results = LatestSlot()
+        self.buffer = ViewBuffer()
+        self.frame_count = 0
+        self.pose_count = 0
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def _run(self):
+        while self.running:
+            frame = self.camera_stream.read_frame(timeout=0.1)
+            if frame is None:
+                if self.camera_stream.closed:
+                    break
+                continue
+            
+            try:
+                self.results.put(self.process_frame(frame))
+            except Exception as e:
+                print(f"Pose Worker Error (camera {self.camera_stream.camera_id}): {e}")
+        
+        self.buffer.close()
+        self.results.close()
+    
+    def process_frame(self, frame):
+        start = perf_counter()
+        image_rgb = self.preprocessor.to_rgb(frame.image)
+        results = self.pose_estimator.process_rgb(image_rgb)
+        
+        heel_data = None
+        if results.pose_landmarks:
+            extracted = self.pose_estimator.extract_heel_data(results)
+            heel_data = {field: extracted[field] for field in HEEL_FIELDS}
+            self.pose_count += 1
+        
+        if self.recorder is not None:
+            self.recorder.append(
+                frame.timestamp,
+                landmarks=self.pose_estimator.extract_landmark_array(results),
+                heel_data=heel_data,
+                frame_index=frame.sequence
+            )
+        
+        self.buffer.put(frame.timestamp, heel_data)
+        self.frame_count += 1
+        
+        return {
+            'image_rgb': image_rgb,
+            'pose_results': results,
+            'heel_data': heel_data,
+            'timestamp': frame.timestamp,
+            'sequence': frame.sequence,
+            'pose_time': perf_counter() - start
+        }
+    
+    def stop(self):
+        self.running = False
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join()
+        self.buffer.close()
+        self.results.close()
+
+
+class MultiViewSource:
+    # several cameras watching one user; each frame of the first (primary) camera is fused
+    # with the other cameras' heel data at its capture time
+    def __init__(self, camera_streams, pose_estimators, target_size=(640, 480), max_skew=0.034,
+                 max_wait=0.015, recorders=None, metrics=None):
+        recorders = recorders or [None] * len(camera_streams)
+        self.workers = [PoseWorker(camera_stream, pose_estimator, target_size=target_size, recorder=recorder)
+                        for camera_stream, pose_estimator, recorder
+                        in zip(camera_streams, pose_estimators, recorders)]
+        self.max_skew = max_skew
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self.aligner = ViewAligner(len(self.workers))
+        
+        self.camera_stream = camera_streams[0]
+        self.pose_estimator = pose_estimators[0]
+        self.sample_count = 0
+        self.fused_count = 0
+        # frames each view contributed heel data to, after matching by capture time
+        self.view_counts = [0] * len(self.workers)
+    
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+        return self
+    
+    @property
+    def closed(self):
+        return self.workers[0].results.closed
+    
+    def read(self, timeout=None):
+        sample = self.workers[0].results.get(timeout)
+        if sample is None:
+            return None
+        
+        wait_start = perf_counter()
+        t = sample['timestamp']
+        views = [sample['heel_data']] + [worker.buffer.sample(t, self.max_skew, self.max_wait)
+                                         for worker in self.workers[1:]]
+        if self.metrics is not None:
+            self.metrics.record('fusion_wait', perf_counter() - wait_start)
+            self.metrics.record('pose', sample['pose_time'])
+        
+        sample['views'] = views
+        sample['heel_data'] = fuse_views(views, self.aligner)
+        self.sample_count += 1
+        if sample['heel_data'] is not None:
+            self.fused_count += 1
+        for k, view in enumerate(views):
+            if view is not None:
+                self.view_counts[k] += 1
+        return sample
+    
+    def format_report(self):
+        if self.sample_count == 0:
+            return "Fusion: no frames"
+        shares = ", ".join(f"camera {worker.camera_stream.camera_id} {count / self.sample_count:.0%}"
+                           for worker, count in zip(self.workers, self.view_counts))
+        return (f"Fusion: heel data in {self.fused_count / self.sample_count:.0%} of {self.sample_count} frames "
+                f"(per camera: {shares})")
+    
+    def stop(self):
+        for worker in self.workers:
+            worker.stop()
\ No newline at end of file
@@ -0,0 +1,41 @@
+import threading
+
+
+class LatestSlot:
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._value = None
+        self._closed = False
+        self.put_count = 0
+        self.dropped = 0
+    
+    def put(self, value):
+        with self._condition:
+            if self._value is not None:
+                self.dropped += 1
+            self._value = value
+            self.put_count += 1
+            self._condition.notify_all()
+    
+    def get(self, timeout=None):
+        with self._condition:
+            if self._value is None and not self._closed:
+                self._condition.wait(timeout)
+            value = self._value
+            self._value = None
+            return value
+    
+    def get_nowait(self):
+        with self._condition:
+            value = self._value
+            self._value = None
+            return value
+    
+    @property
+    def closed(self):
+        return self._closed
+    
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
\ No newline at end of file
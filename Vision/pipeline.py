@@ -0,0 +1,185 @@
+import threading
+import time
+from time import perf_counter
+
+from utils.metrics import Metrics
+
+from .latest_slot import LatestSlot
+from .preprocessing import FramePreprocessor
+
+
+class InferencePipeline:
+    def __init__(self, camera_stream, pose_estimator, inference_logic, udp_client,
+                 recorder=None, target_size=(640, 480), metrics=None, quality_controller=None,
+                 drift_check=None, view_source=None):
+        self.camera_stream = camera_stream
+        self.pose_estimator = pose_estimator
+        self.inference_logic = inference_logic
+        self.udp_client = udp_client
+        self.recorder = recorder
+        self.target_size = target_size
+        self.preprocessor = FramePreprocessor(target_size=target_size)
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.quality_controller = quality_controller
+        self.drift_check = drift_check
+        # a MultiViewSource runs capture and pose per camera and hands over fused heel data
+        self.view_source = view_source
+        
+        self.results = LatestSlot()
+        self.frame_count = 0
+        self.last_sequence = None
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def _run(self):
+        source = self.view_source if self.view_source is not None else self.camera_stream
+        process = self.process_view_sample if self.view_source is not None else self.process_frame
+        
+        while self.running:
+            wait_start = perf_counter()
+            if self.view_source is not None:
+                frame = self.view_source.read(timeout=0.1)
+            else:
+                frame = self.camera_stream.read_frame(timeout=0.1)
+            if frame is None:
+                if source.closed:
+                    break
+                continue
+            self.metrics.record('capture_wait', perf_counter() - wait_start)
+            
+            sequence = frame['sequence'] if self.view_source is not None else frame.sequence
+            if self.last_sequence is not None and sequence > self.last_sequence + 1:
+                self.metrics.increment('frames_dropped', sequence - self.last_sequence - 1)
+            self.last_sequence = sequence
+            
+            try:
+                self.results.put(process(frame))
+            except Exception as e:
+                print(f"Pipeline Error: {e}")
+    
+    def process_frame(self, frame):
+        metrics = self.metrics
+        # capture timestamps come from time.monotonic(), stage timings from perf_counter()
+        received = time.monotonic()
+        metrics.record('queue', received - frame.timestamp)
+        start = perf_counter()
+        
+        image_rgb = self.preprocessor.to_rgb(frame.image)
+        preprocessed = perf_counter()
+        metrics.record('preprocess', preprocessed - start)
+        
+        results = self.pose_estimator.process_rgb(image_rgb)
+        pose_done = perf_counter()
+        metrics.record('pose', pose_done - preprocessed)
+        
+        current_time = frame.timestamp
+        heel_data = None
+        
+        if results.pose_landmarks:
+            heel_data = self.pose_estimator.extract_heel_data(results)
+            metrics.record('heel_extract', perf_counter() - pose_done)
+        
+        if self.recorder is not None:
+            record_start = perf_counter()
+            self.recorder.append(
+                current_time,
+                landmarks=self.pose_estimator.extract_landmark_array(results),
+                heel_data=heel_data,
+                frame_index=frame.sequence
+            )
+            metrics.record('record', perf_counter() - record_start)
+        
+        return self.process_heel_data(heel_data, image_rgb, results, frame.timestamp, frame.sequence,
+                                      received, start)
+    
+    def process_view_sample(self, sample):
+        # pose inference and recording already ran on the cameras' worker threads,
+        # so queueing here includes the pose stage
+        received = time.monotonic()
+        self.metrics.record('queue', received - sample['timestamp'])
+        return self.process_heel_data(sample['heel_data'], sample['image_rgb'], sample['pose_results'],
+                                      sample['timestamp'], sample['sequence'], received, perf_counter())
+    
+    def process_heel_data(self, heel_data, image_rgb, results, current_time, sequence, received, start):
+        metrics = self.metrics
+        
+        if heel_data:
+            speed = self.inference_logic.process_frame(
+                heel_data['left_height'],
+                heel_data['right_height'],
+                heel_data['left_visibility'],
+                heel_data['right_visibility'],
+                current_time
+            )
+            
+            send_start = perf_counter()
+            self.udp_client.send_speed(
+                speed=speed,
+                frame_count=self.frame_count,
+                stride_frequency=self.inference_logic.stride_frequency,
+                left_height_movement=self.inference_logic.h_left,
+                right_height_movement=self.inference_logic.h_right,
+                warning=False,
+                capture_time=current_time
+            )
+            metrics.record('udp_send', perf_counter() - send_start)
+            
+            sent = time.monotonic()
+            metrics.record('processing', sent - received)
+            metrics.record('motion_to_packet', sent - current_time)
+            
+            if self.drift_check is not None:
+                self.drift_check.update(heel_data['left_height'], heel_data['right_height'])
+        else:
+            speed = self.inference_logic.process_missing()
+            metrics.increment('frames_without_pose')
+        
+        result = {
+            'frame_rgb': image_rgb,
+            'pose_results': results,
+            'heel_data': heel_data,
+            'speed': speed,
+            'frame_count': self.frame_count,
+            'sequence': sequence,
+            'timestamp': current_time
+        }
+        self.frame_count += 1
+        
+        frame_time = perf_counter() - start
+        metrics.record('frame_total', frame_time)
+        metrics.tick('pipeline')
+        
+        if self.quality_controller is not None:
+            self._adapt_quality(frame_time, current_time)
+        
+        return result
+    
+    def set_target_size(self, target_size):
+        # frames already handed out keep their buffers, new ones come from a fresh pool
+        self.target_size = target_size
+        self.preprocessor = FramePreprocessor(target_size=target_size)
+    
+    def _adapt_quality(self, frame_time, capture_time):
+        level = self.quality_controller.update(frame_time, capture_time)
+        if level is not None:
+            self.pose_estimator.set_model_complexity(level['model_complexity'])
+            self.set_target_size(level['target_size'])
+            self.metrics.increment('quality_changes')
+            print(f"Quality level {self.quality_controller.level}: model complexity {level['model_complexity']}, "
+                  f"{level['target_size'][0]}x{level['target_size'][1]}")
+        
+        fps = self.quality_controller.poll_fps()
+        if fps is not None:
+            self.inference_logic.set_fps(fps)
+            print(f"Effective frame rate {fps} fps, EA-WIP windows resized")
+    
+    def stop(self):
+        self.running = False
+        self.results.close()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join()
\ No newline at end of file
@@ -2,22 +2,148 @@ import cv2
 import numpy as np
 import mediapipe as mp
 import threading
+import time
+from collections import namedtuple
+
+
+Frame = namedtuple('Frame', ['image', 'timestamp', 'sequence'])
+
+# hips, knees, ankles, heels and foot indices
+LOWER_BODY_LANDMARKS = tuple(range(23, 33))
 
 
 class PoseEstimator:
-    def __init__(self, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    def __init__(self, min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 roi_mode=False, roi_landmarks=LOWER_BODY_LANDMARKS, roi_padding=0.3,
+                 roi_min_visibility=0.5, roi_min_size=96, model_complexity=1):
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.model_complexity = model_complexity
+        self.pose = self._create_pose()
+        
+        self.roi_mode = roi_mode
+        self.roi_landmarks = roi_landmarks
+        self.roi_padding = roi_padding
+        self.roi_min_visibility = roi_min_visibility
+        self.roi_min_size = roi_min_size
+        self.roi = None
+        self.roi_fallbacks = 0
+        
+    def _create_pose(self):
+        return self.mp_pose.Pose(
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
         )
+    
+    def set_model_complexity(self, model_complexity):
+        if model_complexity == self.model_complexity:
+            return
         
+        self.pose.close()
+        self.model_complexity = model_complexity
+        self.pose = self._create_pose()
+        self.reset_roi()
+    
     def process(self, image):
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return self.process_rgb(image_rgb)
+    
+    def process_rgb(self, image_rgb):
+        if self.roi_mode:
+            return self._process_roi(image_rgb)
+        
         results = self.pose.process(image_rgb)
         return results
     
+    def _process_roi(self, image_rgb):
+        frame_h, frame_w = image_rgb.shape[:2]
+        results = None
+        
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            crop_rgb = np.ascontiguousarray(image_rgb[y0:y1, x0:x1])
+            results = self.pose.process(crop_rgb)
+            
+            # a crop that lost the legs is re-run at full size rather than passed on
+            if results.pose_landmarks and len(self._visible_roi_points(results)) >= 2:
+                self._map_landmarks_to_frame(results, self.roi, frame_w, frame_h)
+            else:
+                self.roi_fallbacks += 1
+                results = None
+        
+        if results is None:
+            results = self.pose.process(image_rgb)
+            self.roi = None
+        
+        self.roi = self._next_roi(results, frame_w, frame_h)
+        return results
+    
+    def _map_landmarks_to_frame(self, results, roi, frame_w, frame_h):
+        x0, y0, x1, y1 = roi
+        scale_x = (x1 - x0) / frame_w
+        scale_y = (y1 - y0) / frame_h
+        offset_x = x0 / frame_w
+        offset_y = y0 / frame_h
+        
+        for landmark in results.pose_landmarks.landmark:
+            landmark.x = offset_x + landmark.x * scale_x
+            landmark.y = offset_y + landmark.y * scale_y
+            # z shares the scale of x in MediaPipe's normalized coordinates
+            landmark.z = landmark.z * scale_x
+    
+    def _visible_roi_points(self, results):
+        landmarks = results.pose_landmarks.landmark
+        return [landmarks[i] for i in self.roi_landmarks
+                if landmarks[i].visibility >= self.roi_min_visibility]
+    
+    def _next_roi(self, results, frame_w, frame_h):
+        if not results.pose_landmarks:
+            return None
+        
+        points = self._visible_roi_points(results)
+        if len(points) < 2:
+            return None
+        
+        xs = [min(max(p.x, 0.0), 1.0) * frame_w for p in points]
+        ys = [min(max(p.y, 0.0), 1.0) * frame_h for p in points]
+        left, right = min(xs), max(xs)
+        top, bottom = min(ys), max(ys)
+        
+        size = max(right - left, bottom - top, self.roi_min_size)
+        pad = size * self.roi_padding
+        center_x = (left + right) / 2.0
+        center_y = (top + bottom) / 2.0
+        half_w = max(right - left, size * 0.5) / 2.0 + pad
+        half_h = max(bottom - top, size * 0.5) / 2.0 + pad
+        
+        x0 = int(max(center_x - half_w, 0))
+        y0 = int(max(center_y - half_h, 0))
+        x1 = int(min(center_x + half_w, frame_w))
+        y1 = int(min(center_y + half_h, frame_h))
+        
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        
+        # keep the current crop while the legs stay inside its inner area and it
+        # is not much larger than needed, so MediaPipe's frame-to-frame tracking
+        # sees a stable input
+        if self.roi is not None:
+            cx0, cy0, cx1, cy1 = self.roi
+            margin = pad / 2.0
+            inside = (left >= cx0 + margin and right <= cx1 - margin and
+                      top >= cy0 + margin and bottom <= cy1 - margin)
+            still_tight = (x1 - x0) * (y1 - y0) >= 0.5 * (cx1 - cx0) * (cy1 - cy0)
+            if inside and still_tight:
+                return self.roi
+        
+        return (x0, y0, x1, y1)
+    
+    def reset_roi(self):
+        self.roi = None
+    
     def extract_heel_data(self, results, y_scale=1.0, x_scale=1.0):
         if not results.pose_landmarks:
             return None
@@ -46,6 +172,22 @@ class PoseEstimator:
             'right_heel_2d': right_heel
         }
     
+    def extract_landmark_array(self, results, out=None):
+        if not results.pose_landmarks:
+            return None
+        
+        landmarks = results.pose_landmarks.landmark
+        if out is None:
+            out = np.empty((len(landmarks), 4), dtype=np.float32)
+        
+        for i, landmark in enumerate(landmarks):
+            out[i, 0] = landmark.x
+            out[i, 1] = landmark.y
+            out[i, 2] = landmark.z
+            out[i, 3] = landmark.visibility
+        
+        return out
+    
     def draw_landmarks(self, image, results):
         if results.pose_landmarks:
             self.mp_drawing.draw_landmarks(
@@ -61,34 +203,102 @@ class PoseEstimator:
 
 
 class CameraStream:
-    def __init__(self, camera_id=0):
+    def __init__(self, camera_id=0, width=None, height=None, fps=None, fourcc=None):
         self.camera_id = camera_id
         self.cap = cv2.VideoCapture(camera_id)
         
         if not self.cap.isOpened():
             raise ConnectionError(f"Could not open camera {camera_id}")
         
-        self.image_from_thread = None
-        self.image_ready = False
+        self._configure(width, height, fps, fourcc)
+        
+        # triple buffering: one buffer being captured into, at most one published
+        # and not yet consumed, one owned by the consumer until its next read
+        self._condition = threading.Condition()
+        self._free_buffers = [None, None]
+        self._ready = None
+        self._consumer_buffer = None
+        
+        self.sequence = 0
+        self.dropped_frames = 0
+        self.closed = False
         self.running = True
+        # called on the capture thread after each new frame, e.g. to wake a scheduler
+        self.on_frame = None
         
         self.thread = threading.Thread(target=self._update, daemon=True)
         self.thread.start()
     
+    def _configure(self, width, height, fps, fourcc):
+        # pixel format first, many drivers only offer higher resolutions/rates with MJPG
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        
+        # the driver may pick the nearest supported mode, report what we got
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+    
     def _update(self):
+        buffer = None
+        
         while self.running:
-            ret, frame = self.cap.read()
-            if ret:
-                self.image_from_thread = frame
-                self.image_ready = True
-            else:
+            if not self.cap.grab():
+                print("ERROR: Camera capture failed!")
+                break
+            timestamp = time.monotonic()
+            
+            ret, buffer = self.cap.retrieve(buffer)
+            if not ret:
                 print("ERROR: Camera capture failed!")
                 break
+            
+            with self._condition:
+                self.sequence += 1
+                if self._ready is not None:
+                    self.dropped_frames += 1
+                    next_buffer = self._ready.image
+                else:
+                    next_buffer = self._free_buffers.pop()
+                self._ready = Frame(buffer, timestamp, self.sequence)
+                self._condition.notify_all()
+            
+            on_frame = self.on_frame
+            if on_frame is not None:
+                on_frame()
+            
+            buffer = next_buffer
+        
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+    
+    def read_frame(self, timeout=None):
+        with self._condition:
+            if self._ready is None and not self.closed:
+                self._condition.wait(timeout)
+            
+            frame = self._ready
+            if frame is None:
+                return None
+            
+            # the previously returned image goes back to the capture thread
+            if self._consumer_buffer is not None:
+                self._free_buffers.append(self._consumer_buffer)
+            self._consumer_buffer = frame.image
+            self._ready = None
+            return frame
     
     def read(self):
-        if self.image_ready:
-            self.image_ready = False
-            return self.image_from_thread.copy()
+        frame = self.read_frame(timeout=0)
+        if frame is not None:
+            return frame.image
         return None
     
     def stop(self):
@@ -103,5 +313,8 @@ class CameraStream:
 
 
 def preprocess_image(image, target_size=(640, 480)):
+    height, width = image.shape[:2]
+    if (width, height) == tuple(target_size):
+        return image
     image = cv2.resize(image, target_size)
     return image
\ No newline at end of file
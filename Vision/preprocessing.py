@@ -0,0 +1,29 @@
+import cv2
+import numpy as np
+
+
+class FramePreprocessor:
+    def __init__(self, target_size=(640, 480), pool_size=3):
+        self.target_size = tuple(target_size)
+        width, height = self.target_size
+        
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
+        # RGB frames are handed downstream (pose, recorder, preview) and stay valid
+        # until the pool wraps around, so size the pool for every frame in flight:
+        # one being filled, one waiting in a LatestSlot, one being displayed
+        self._pool = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(pool_size)]
+        self._index = 0
+        
+        self.resized_frames = 0
+    
+    def to_rgb(self, image):
+        rgb = self._pool[self._index]
+        self._index = (self._index + 1) % len(self._pool)
+        
+        height, width = image.shape[:2]
+        if (width, height) != self.target_size:
+            image = cv2.resize(image, self.target_size, dst=self._resized)
+            self.resized_frames += 1
+        
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
\ No newline at end of file
@@ -0,0 +1,104 @@
+def build_quality_levels(model_complexity=1, target_size=(640, 480)):
+    width, height = target_size
+    reduced = (width * 3 // 4, height * 3 // 4)
+    
+    # best first: shrink the input, then step the model down, then shrink again
+    levels = [
+        {'model_complexity': model_complexity, 'target_size': tuple(target_size)},
+        {'model_complexity': model_complexity, 'target_size': reduced}
+    ]
+    for complexity in range(model_complexity - 1, -1, -1):
+        levels.append({'model_complexity': complexity, 'target_size': reduced})
+    levels.append({'model_complexity': 0, 'target_size': (width // 2, height // 2)})
+    
+    return tuple(levels)
+
+
+QUALITY_LEVELS = build_quality_levels()
+
+
+class AdaptiveQualityController:
+    def __init__(self, target_fps=30.0, levels=QUALITY_LEVELS, level=0, degrade_ratio=1.0,
+                 upgrade_ratio=0.6, smoothing=0.1, degrade_hold=1.0, upgrade_hold=5.0,
+                 fps_tolerance=0.1):
+        self.target_fps = target_fps
+        self.budget = 1.0 / target_fps
+        self.levels = levels
+        self.level = level
+        self.degrade_ratio = degrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.smoothing = smoothing
+        self.degrade_hold = degrade_hold
+        self.upgrade_hold = upgrade_hold
+        self.fps_tolerance = fps_tolerance
+        
+        self.frame_time = None
+        self.effective_fps = None
+        # consumers start out configured for the target rate
+        self.reported_fps = target_fps
+        self.level_changes = 0
+        
+        self._last_capture = None
+        self._over_since = None
+        self._under_since = None
+    
+    @property
+    def current(self):
+        return self.levels[self.level]
+    
+    def update(self, frame_time, capture_time):
+        alpha = self.smoothing
+        if self.frame_time is None:
+            self.frame_time = frame_time
+        else:
+            self.frame_time += alpha * (frame_time - self.frame_time)
+        
+        if self._last_capture is not None and capture_time > self._last_capture:
+            fps = 1.0 / (capture_time - self._last_capture)
+            if self.effective_fps is None:
+                self.effective_fps = fps
+            else:
+                self.effective_fps += alpha * (fps - self.effective_fps)
+        self._last_capture = capture_time
+        
+        # hysteresis: degrade soon after the budget is exceeded, upgrade only after a
+        # long stretch with plenty of headroom, so levels do not oscillate
+        if self.frame_time > self.budget * self.degrade_ratio:
+            self._under_since = None
+            if self._over_since is None:
+                self._over_since = capture_time
+            if capture_time - self._over_since >= self.degrade_hold and self.level < len(self.levels) - 1:
+                return self._change_level(self.level + 1)
+        elif self.frame_time < self.budget * self.upgrade_ratio:
+            self._over_since = None
+            if self._under_since is None:
+                self._under_since = capture_time
+            if capture_time - self._under_since >= self.upgrade_hold and self.level > 0:
+                return self._change_level(self.level - 1)
+        else:
+            self._over_since = None
+            self._under_since = None
+        
+        return None
+    
+    def _change_level(self, level):
+        self.level = level
+        self.level_changes += 1
+        self._over_since = None
+        self._under_since = None
+        # the new level has a different cost, measure it afresh
+        self.frame_time = None
+        return self.current
+    
+    def poll_fps(self):
+        if self.effective_fps is None:
+            return None
+        
+        fps = round(self.effective_fps)
+        if fps <= 0:
+            return None
+        if self.reported_fps is not None and abs(fps - self.reported_fps) <= self.fps_tolerance * self.reported_fps:
+            return None
+        
+        self.reported_fps = fps
+        return fps
\ No newline at end of file
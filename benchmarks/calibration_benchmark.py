@@ -0,0 +1,87 @@
+import argparse
+import time
+
+import numpy as np
+
+from core.calibration import CalibrationLogic
+from core.calibration_batch import BatchCalibration
+
+
+def synthetic_sessions(count, frames, fps, rng, min_cadence=0.6, clock_jitter=0.0, clock_glitches=False):
+    # walking in place at varying cadence, stride height, camera framing and noise
+    t = np.arange(frames) / fps
+    cadence = rng.uniform(min_cadence, 2.5, (count, 1))
+    phase = rng.uniform(0, 2 * np.pi, (count, 1))
+    ground = rng.uniform(-0.5, -0.2, (count, 1))
+    stride = rng.uniform(0.02, 0.2, (count, 1))
+    noise = rng.choice([0.0, 0.003, 0.02], (count, 1))
+    
+    swing = 2 * np.pi * cadence * t + phase
+    left = ground + stride * np.maximum(0, np.sin(swing)) + rng.normal(0, 1, (count, frames)) * noise
+    right = ground + stride * np.maximum(0, -np.sin(swing)) + rng.normal(0, 1, (count, frames)) * noise
+    
+    timestamps = np.tile(t, (count, 1))
+    if clock_jitter:
+        timestamps += rng.normal(0, clock_jitter, (count, frames))
+    if clock_glitches:
+        # clock steps backwards for a stretch of frames, as after an NTP correction
+        for s in range(count):
+            start = rng.integers(0, frames)
+            timestamps[s, start:start + rng.integers(1, 3 * fps)] -= rng.uniform(0.1, 5.0)
+    return left, right, timestamps
+
+
+def streaming_calibration(left, right, timestamps, fps, calibration_duration):
+    calibration_logic = CalibrationLogic(fps=fps, calibration_duration=calibration_duration)
+    for left_height, right_height, current_time in zip(left.tolist(), right.tolist(), timestamps.tolist()):
+        calibration_logic.process_frame(left_height, right_height, current_time)
+    return calibration_logic.get_calibration_results()
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Compare frame-by-frame and vectorized calibration on synthetic sessions'
+    )
+    parser.add_argument('--sessions', type=int, default=2000, help='Calibration sessions to process')
+    parser.add_argument('--fps', type=int, default=30, help='Session frame rate')
+    parser.add_argument('--duration', type=float, default=8.0, help='Calibration length in seconds')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic sessions')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    batch = BatchCalibration(fps=args.fps, calibration_duration=args.duration)
+    rng = np.random.default_rng(args.seed)
+    left, right, timestamps = synthetic_sessions(args.sessions, batch.max_frames, args.fps, rng)
+    
+    start = time.perf_counter()
+    expected = [streaming_calibration(left[i], right[i], timestamps[i], args.fps, args.duration)
+                for i in range(args.sessions)]
+    streaming_elapsed = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    results = batch.calibrate_sessions(left, right, timestamps)
+    batch_elapsed = time.perf_counter() - start
+    
+    worst = max(abs(result[key] - reference[key])
+                for result, reference in zip(results, expected) for key in reference)
+    fallbacks = sum(1 for reference in expected
+                    if reference['f_c_left'] == 1.2 and reference['h_c_left'] == 0.12)
+    
+    print("=" * 60)
+    print("EA-WIP Calibration Benchmark")
+    print("=" * 60)
+    print(f"Sessions: {args.sessions} x {batch.max_frames} frames ({fallbacks} fall back to defaults)")
+    print(f"CalibrationLogic (per frame): {streaming_elapsed / args.sessions * 1000:.3f} ms/session")
+    print(f"BatchCalibration (vectorized): {batch_elapsed / args.sessions * 1000:.3f} ms/session")
+    print(f"Speedup: {streaming_elapsed / batch_elapsed:.1f}x")
+    print(f"Max abs difference: {worst:.2e}")
+    if worst > 1e-9:
+        print("WARNING: batch results differ from CalibrationLogic")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
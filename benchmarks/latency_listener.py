@@ -0,0 +1,81 @@
+import argparse
+import socket
+import time
+
+from communication.protocol import SpeedPacketDecoder, SEQUENCE_MODULO
+from utils.metrics import LatencyHistogram
+
+
+def listen(port, duration, host="127.0.0.1"):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    sock.settimeout(0.5)
+    
+    decoder = SpeedPacketDecoder()
+    ages = LatencyHistogram()
+    buffer = bytearray(65536)
+    packets = 0
+    samples = 0
+    lost = 0
+    
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline:
+            try:
+                size = sock.recv_into(buffer)
+            except socket.timeout:
+                continue
+            received = time.monotonic()
+            packets += 1
+            
+            previous = decoder.last_sequence
+            try:
+                fresh = decoder.decode(memoryview(buffer)[:size])
+            except ValueError as e:
+                print(f"Ignoring packet: {e}")
+                continue
+            
+            for sample in fresh:
+                if previous is not None:
+                    lost += (sample['sequence'] - previous - 1) % SEQUENCE_MODULO
+                previous = sample['sequence']
+                # only meaningful on the sending machine: capture_time is its time.monotonic()
+                ages.record(received - sample['capture_time'])
+            samples += len(fresh)
+    finally:
+        sock.close()
+    
+    return {
+        'packets': packets,
+        'samples': samples,
+        'lost': lost,
+        'stale': decoder.discarded,
+        'age': ages.summary()
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Receive binary EA-WIP speed packets on this machine and report their age since capture'
+    )
+    parser.add_argument('--port', type=int, default=5005, help='UDP port main.py sends to')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to listen')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    stats = listen(args.port, args.duration)
+    age = stats['age']
+    
+    print("=" * 60)
+    print("EA-WIP Packet Age (capture -> received)")
+    print("=" * 60)
+    print(f"Packets: {stats['packets']}, samples: {stats['samples']}")
+    print(f"Lost (sequence gaps): {stats['lost']}, stale/reordered: {stats['stale']}")
+    print(f"Age p50/p95/p99: {age['p50_ms']:.1f} / {age['p95_ms']:.1f} / {age['p99_ms']:.1f} ms")
+    print(f"Age mean/max: {age['mean_ms']:.1f} / {age['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
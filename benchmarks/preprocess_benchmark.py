@@ -0,0 +1,92 @@
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from vision.pose_estimator import preprocess_image
+from vision.preprocessing import FramePreprocessor
+
+
+def legacy_path(image, target_size):
+    frame = preprocess_image(image, target_size=target_size)
+    pose_input = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    preview = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return pose_input, preview
+
+
+def make_preprocessed_path(target_size):
+    preprocessor = FramePreprocessor(target_size=target_size)
+    width, height = target_size
+    preview = np.empty((height, width, 3), dtype=np.uint8)
+    
+    def run(image):
+        pose_input = preprocessor.to_rgb(image)
+        np.copyto(preview, pose_input)
+        return pose_input, preview
+    
+    return run
+
+
+def measure(path, frames, repeats):
+    # warm-up so one-time allocations are not counted
+    path(frames[0])
+    
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    allocated = 0
+    
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for frame in frames:
+            path(frame)
+            current, peak = tracemalloc.get_traced_memory()
+            allocated += peak - before
+            tracemalloc.reset_peak()
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    
+    count = repeats * len(frames)
+    return elapsed / count, allocated / count
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Compare per-frame cost and allocations of the preprocessing paths'
+    )
+    parser.add_argument('--camera-size', type=int, nargs=2, default=[640, 480], metavar=('W', 'H'),
+                        help='Resolution delivered by the camera')
+    parser.add_argument('--target-size', type=int, nargs=2, default=[640, 480], metavar=('W', 'H'),
+                        help='Pose inference resolution')
+    parser.add_argument('--frames', type=int, default=30, help='Distinct synthetic frames')
+    parser.add_argument('--repeats', type=int, default=20, help='Passes over the frames')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    camera_width, camera_height = args.camera_size
+    target_size = tuple(args.target_size)
+    
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (camera_height, camera_width, 3), dtype=np.uint8)
+              for _ in range(args.frames)]
+    
+    runs = (("Legacy (resize + 2x cvtColor)", lambda image: legacy_path(image, target_size)),
+            ("FramePreprocessor", make_preprocessed_path(target_size)))
+    
+    print("=" * 60)
+    print("EA-WIP Preprocessing Benchmark")
+    print("=" * 60)
+    print(f"Camera {camera_width}x{camera_height} -> pose input {target_size[0]}x{target_size[1]}")
+    for name, path in runs:
+        latency, allocated = measure(path, frames, args.repeats)
+        print(f"{name}:")
+        print(f"  Mean latency: {latency * 1000:.3f} ms")
+        print(f"  Allocated per frame: {allocated / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
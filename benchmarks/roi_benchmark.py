@@ -0,0 +1,85 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from vision.pose_estimator import PoseEstimator, preprocess_image
+
+
+def run_estimator(estimator, frames):
+    heights = np.full((len(frames), 2), np.nan)
+    latencies = np.zeros(len(frames))
+    
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        results = estimator.process(frame)
+        heel_data = estimator.extract_heel_data(results)
+        latencies[i] = time.perf_counter() - start
+        
+        if heel_data:
+            heights[i] = (heel_data['left_height'], heel_data['right_height'])
+    
+    return heights, latencies
+
+
+def load_frames(path, max_frames, target_size):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ConnectionError(f"Could not open video {path}")
+    
+    frames = []
+    while max_frames is None or len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(preprocess_image(frame, target_size=target_size))
+    cap.release()
+    
+    return frames
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Compare full-frame and lower-body ROI pose inference on a recorded video'
+    )
+    parser.add_argument('video', type=str, help='Recorded video file')
+    parser.add_argument('--max-frames', type=int, default=None, help='Limit the number of frames')
+    parser.add_argument('--padding', type=float, default=0.3, help='ROI padding relative to the leg box')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    frames = load_frames(args.video, args.max_frames, target_size=(640, 480))
+    
+    full_heights, full_latencies = run_estimator(PoseEstimator(), frames)
+    
+    roi_estimator = PoseEstimator(roi_mode=True, roi_padding=args.padding)
+    roi_heights, roi_latencies = run_estimator(roi_estimator, frames)
+    
+    both = ~np.isnan(full_heights).any(axis=1) & ~np.isnan(roi_heights).any(axis=1)
+    error = np.abs(roi_heights[both] - full_heights[both])
+    
+    print("=" * 60)
+    print("EA-WIP ROI Benchmark")
+    print("=" * 60)
+    print(f"Frames: {len(frames)}")
+    for name, latencies, heights in (("Full frame", full_latencies, full_heights),
+                                     ("Lower-body ROI", roi_latencies, roi_heights)):
+        detected = (~np.isnan(heights).any(axis=1)).mean() * 100
+        print(f"{name}:")
+        print(f"  Mean latency: {latencies.mean() * 1000:.2f} ms ({1.0 / latencies.mean():.1f} fps)")
+        print(f"  p95 latency: {np.percentile(latencies, 95) * 1000:.2f} ms")
+        print(f"  Pose detected: {detected:.1f}% of frames")
+    print(f"ROI fallbacks to full frame: {roi_estimator.roi_fallbacks}")
+    print(f"Speed-up: {full_latencies.mean() / roi_latencies.mean():.2f}x")
+    if error.size:
+        print("Heel height error vs full frame (left/right):")
+        print(f"  Mean: {error[:, 0].mean():.4f} / {error[:, 1].mean():.4f}")
+        print(f"  p95:  {np.percentile(error[:, 0], 95):.4f} / {np.percentile(error[:, 1], 95):.4f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,170 @@
+import argparse
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from utils.scheduler import FairScheduler
+
+
+class SimulatedStation:
+    # a camera publishing frames at a fixed rate and a CPU-bound stand-in for pose inference
+    # that, like MediaPipe, runs outside the GIL
+    def __init__(self, name, fps, pose_cost, on_frame=None):
+        self.name = name
+        self.fps = fps
+        self.pose_cost = pose_cost
+        self.on_frame = on_frame
+        self.image = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        self.output = np.empty_like(self.image)
+        self._condition = threading.Condition()
+        self.sequence = 0
+        self.last_processed = 0
+        self.published = 0
+        self.processed = 0
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._capture, daemon=True)
+        self.thread.start()
+    
+    def _capture(self):
+        next_time = time.monotonic()
+        while self.running:
+            next_time += 1.0 / self.fps
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with self._condition:
+                self.sequence += 1
+                self.published += 1
+                self._condition.notify_all()
+            on_frame = self.on_frame
+            if on_frame is not None:
+                on_frame()
+    
+    def wait_frame(self, timeout):
+        with self._condition:
+            if self.sequence == self.last_processed:
+                self._condition.wait(timeout)
+            return self.sequence != self.last_processed
+    
+    def process_next(self):
+        with self._condition:
+            if self.sequence == self.last_processed:
+                return
+            self.last_processed = self.sequence
+        for _ in range(self.pose_cost):
+            cv2.GaussianBlur(self.image, (9, 9), 0, dst=self.output)
+        self.processed += 1
+    
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+
+
+def calibrate_cost(pose_ms):
+    # blur passes that take pose_ms on one core
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    output = np.empty_like(image)
+    passes = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < 0.5:
+        cv2.GaussianBlur(image, (9, 9), 0, dst=output)
+        passes += 1
+    per_pass = (time.perf_counter() - start) / passes
+    return max(1, round(pose_ms / 1000.0 / per_pass))
+
+
+def run_thread_per_station(stations, seconds):
+    # today's setup: every station runs its own inference loop
+    running = [True]
+    
+    def loop(station):
+        while running[0]:
+            if station.wait_frame(0.1):
+                station.process_next()
+    
+    threads = [threading.Thread(target=loop, args=(station,), daemon=True) for station in stations]
+    for station in stations:
+        station.start()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    running[0] = False
+    for thread in threads:
+        thread.join()
+    for station in stations:
+        station.stop()
+
+
+def run_shared_pool(stations, seconds, workers):
+    scheduler = FairScheduler(workers=workers)
+    for station in stations:
+        scheduler.add(station, weight=station.fps)
+        station.on_frame = lambda station=station: scheduler.notify(station)
+    scheduler.start()
+    for station in stations:
+        station.start()
+    time.sleep(seconds)
+    for station in stations:
+        station.stop()
+    scheduler.stop()
+
+
+def fairness(shares):
+    # Jain's index of the stations' delivered share of their camera rate: 1.0 when all equal
+    shares = np.asarray(shares)
+    return shares.sum() ** 2 / (len(shares) * (shares ** 2).sum())
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Compare a shared, fairly scheduled pose worker pool with one inference thread per station'
+    )
+    parser.add_argument('--stations', type=int, default=4, help='Simulated stations')
+    parser.add_argument('--fps', type=float, default=30.0, help='Camera frame rate of every station')
+    parser.add_argument('--pose-ms', type=float, default=25.0, help='Simulated pose inference time per frame')
+    parser.add_argument('--heavy', type=float, default=3.0,
+                        help='Pose cost multiplier of the last station (e.g. a larger model or frame)')
+    parser.add_argument('--workers', type=int, default=None, help='Pool threads (default: CPU count)')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Run length per mode')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    cv2.setNumThreads(1)
+    workers = args.workers or os.cpu_count() or 1
+    cost = calibrate_cost(args.pose_ms)
+    
+    def make_stations():
+        costs = [cost] * args.stations
+        costs[-1] = max(1, round(cost * args.heavy))
+        return [SimulatedStation(f"station{k}", args.fps, costs[k]) for k in range(args.stations)]
+    
+    runs = (("Thread per station", lambda stations: run_thread_per_station(stations, args.seconds)),
+            (f"Shared pool ({workers} workers)", lambda stations: run_shared_pool(stations, args.seconds, workers)))
+    
+    print("=" * 60)
+    print("EA-WIP Multi-Station Scheduling Benchmark")
+    print("=" * 60)
+    print(f"{args.stations} stations @ {args.fps:.0f} fps, pose {args.pose_ms:.0f} ms "
+          f"(last station x{args.heavy:g}), {os.cpu_count()} cores")
+    print(f"{'':<28}{'total fps':>10}{'min fps':>9}{'max fps':>9}{'fairness':>10}")
+    for label, run in runs:
+        stations = make_stations()
+        run(stations)
+        fps = [station.processed / args.seconds for station in stations]
+        shares = [station.processed / max(station.published, 1) for station in stations]
+        print(f"{label:<28}{sum(fps):>10.1f}{min(fps):>9.1f}{max(fps):>9.1f}{fairness(shares):>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,91 @@
+import argparse
+import socket
+import time
+
+from communication.udp_client import UDPClient
+from communication.protocol import SpeedPacketDecoder, decode_text_message
+
+
+def run_protocol(protocol, batch_size, samples, port):
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    receiver.bind(("127.0.0.1", port))
+    receiver.settimeout(0.5)
+    
+    client = UDPClient(ip="127.0.0.1", port=port, protocol=protocol, batch_size=batch_size)
+    
+    start = time.perf_counter()
+    for i in range(samples):
+        client.send_speed(1.25, i, 1.8, 0.12, 0.115, False, capture_time=time.monotonic())
+    client.flush()
+    send_elapsed = time.perf_counter() - start
+    
+    decoder = SpeedPacketDecoder()
+    buffer = bytearray(65536)
+    received = 0
+    datagrams = 0
+    payload = 0
+    
+    decode_elapsed = 0.0
+    while received < samples:
+        try:
+            size = receiver.recv_into(buffer)
+        except socket.timeout:
+            break
+        datagrams += 1
+        payload += size
+        
+        start = time.perf_counter()
+        if protocol == 'binary':
+            received += len(decoder.decode(memoryview(buffer)[:size]))
+        else:
+            decode_text_message(buffer[:size].decode('utf-8'))
+            received += 1
+        decode_elapsed += time.perf_counter() - start
+    
+    client.close()
+    receiver.close()
+    
+    return {
+        'send_rate': samples / send_elapsed,
+        'decode_rate': received / decode_elapsed if decode_elapsed > 0 else 0.0,
+        'received': received,
+        'datagrams': datagrams,
+        'bytes_per_sample': payload / received if received else 0.0,
+        'discarded': decoder.discarded
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Compare text and binary UDP speed packets over loopback'
+    )
+    parser.add_argument('--samples', type=int, default=100000, help='Speed samples to send per run')
+    parser.add_argument('--batch-size', type=int, default=8, help='Samples per datagram for the batched run')
+    parser.add_argument('--port', type=int, default=5015, help='Loopback port to use')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    runs = (("Text", 'text', 1),
+            ("Binary", 'binary', 1),
+            (f"Binary x{args.batch_size}", 'binary', args.batch_size))
+    
+    print("=" * 60)
+    print("EA-WIP UDP Protocol Benchmark")
+    print("=" * 60)
+    print(f"Samples per run: {args.samples}")
+    for name, protocol, batch_size in runs:
+        stats = run_protocol(protocol, batch_size, args.samples, args.port)
+        print(f"{name}:")
+        print(f"  Send: {stats['send_rate']:.0f} samples/s")
+        print(f"  Decode: {stats['decode_rate']:.0f} samples/s")
+        print(f"  Received: {stats['received']}/{args.samples} samples in {stats['datagrams']} datagrams")
+        print(f"  Payload: {stats['bytes_per_sample']:.1f} bytes/sample")
+        if protocol == 'binary':
+            print(f"  Discarded (stale/reordered): {stats['discarded']}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,3 +1,9 @@
 from .udp_client import UDPClient, UDPReceiver
+from .async_transport import AsyncUDPTransport, create_speed_sender
+from .output_scheduler import SpeedOutputScheduler
+from .protocol import (PROTOCOL_TEXT, PROTOCOL_BINARY, BinarySpeedEncoder, SpeedPacketDecoder,
+                       decode_packet, decode_text_message, encode_text_message)
 
-__all__ = ['UDPClient', 'UDPReceiver']
\ No newline at end of file
+__all__ = ['UDPClient', 'UDPReceiver', 'AsyncUDPTransport', 'create_speed_sender', 'SpeedOutputScheduler',
+           'PROTOCOL_TEXT', 'PROTOCOL_BINARY', 'BinarySpeedEncoder', 'SpeedPacketDecoder', 'decode_packet',
+           'decode_text_message', 'encode_text_message']
\ No newline at end of file
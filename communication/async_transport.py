@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import socket
+import threading
+import time
+from collections import deque
+
+from .output_scheduler import SpeedOutputScheduler
+from .protocol import (PROTOCOL_TEXT, PROTOCOL_BINARY, PACKET_VERSION, PACKET_VERSION_PREDICTED,
+                       BinarySpeedEncoder, encode_text_message)
+from .udp_client import UDPClient
+
+
+logger = logging.getLogger("ea_wip.transport")
+
+SUBSCRIBE_COMMANDS = ('subscribe', 'heartbeat')
+UNSUBSCRIBE_COMMAND = 'unsubscribe'
+
+
+class _FanOutProtocol(asyncio.DatagramProtocol):
+    def __init__(self, owner):
+        self.owner = owner
+    
+    def datagram_received(self, data, addr):
+        self.owner._handle_control(data, addr)
+    
+    def error_received(self, exc):
+        self.owner.send_errors += 1
+        self.owner._log_error("UDP send error: %s", exc)
+
+
+class AsyncUDPTransport:
+    def __init__(self, targets=(), control_ip="0.0.0.0", control_port=None, protocol=PROTOCOL_TEXT,
+                 batch_size=1, heartbeat_timeout=3.0, max_pending=64, error_log_interval=5.0,
+                 packet_version=PACKET_VERSION):
+        if protocol not in (PROTOCOL_TEXT, PROTOCOL_BINARY):
+            raise ValueError(f"Unknown UDP protocol: {protocol}")
+        
+        self.static_targets = [tuple(target) for target in targets]
+        self.control_ip = control_ip
+        self.control_port = control_port
+        self.protocol = protocol
+        self.encoder = BinarySpeedEncoder(batch_size, packet_version) if protocol == PROTOCOL_BINARY else None
+        self.heartbeat_timeout = heartbeat_timeout
+        self.error_log_interval = error_log_interval
+        
+        # subscriber address -> loop time of its last heartbeat, only touched on the loop thread
+        self.subscribers = {}
+        
+        self._pending = deque(maxlen=max_pending)
+        self._pending_lock = threading.Lock()
+        self._drain_scheduled = False
+        
+        self.sent_packets = 0
+        self.dropped_packets = 0
+        self.send_errors = 0
+        self._last_error_log = None
+        self._suppressed_errors = 0
+        
+        self._transport = None
+        self._expiry_task = None
+        self._start_error = None
+        self._ready = threading.Event()
+        
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        
+        if self._start_error is not None:
+            raise ConnectionError(f"Could not open UDP transport: {self._start_error}")
+    
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._open())
+        except Exception as e:
+            self._start_error = e
+            self._ready.set()
+            self.loop.close()
+            return
+        
+        self._ready.set()
+        self.loop.run_forever()
+        
+        self._expiry_task.cancel()
+        self._transport.close()
+        self.loop.run_until_complete(asyncio.gather(self._expiry_task, return_exceptions=True))
+        self.loop.close()
+    
+    async def _open(self):
+        if self.control_port is not None:
+            local_addr = (self.control_ip, self.control_port)
+        else:
+            local_addr = ("0.0.0.0", 0)
+        
+        # one socket both receives heartbeats and sends, so subscribers behind
+        # a NAT get packets from the address they registered with
+        self._transport, _ = await self.loop.create_datagram_endpoint(
+            lambda: _FanOutProtocol(self),
+            local_addr=local_addr,
+            family=socket.AF_INET
+        )
+        if self.control_port is not None:
+            self.control_port = self._transport.get_extra_info('sockname')[1]
+        
+        self._expiry_task = self.loop.create_task(self._expire_subscribers())
+    
+    async def _expire_subscribers(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_timeout / 2.0)
+            now = self.loop.time()
+            for addr, last_seen in list(self.subscribers.items()):
+                if now - last_seen > self.heartbeat_timeout:
+                    del self.subscribers[addr]
+                    logger.info("Subscriber %s:%d expired", addr[0], addr[1])
+    
+    def _handle_control(self, data, addr):
+        try:
+            parts = data.decode('utf-8').strip().lower().split()
+        except UnicodeDecodeError:
+            return
+        if not parts:
+            return
+        
+        # "subscribe <port>" lets a client receive on a different port than it sends from
+        target = addr[:2]
+        if len(parts) > 1:
+            try:
+                target = (addr[0], int(parts[1]))
+            except ValueError:
+                return
+        
+        if parts[0] in SUBSCRIBE_COMMANDS:
+            if target not in self.subscribers:
+                logger.info("Subscriber %s:%d registered", target[0], target[1])
+            self.subscribers[target] = self.loop.time()
+        elif parts[0] == UNSUBSCRIBE_COMMAND:
+            if self.subscribers.pop(target, None) is not None:
+                logger.info("Subscriber %s:%d unsubscribed", target[0], target[1])
+    
+    def _log_error(self, message, *args):
+        now = time.monotonic()
+        if self._last_error_log is not None and now - self._last_error_log < self.error_log_interval:
+            self._suppressed_errors += 1
+            return
+        
+        if self._suppressed_errors:
+            message += " (%d similar errors suppressed)"
+            args += (self._suppressed_errors,)
+        logger.warning(message, *args)
+        self._last_error_log = now
+        self._suppressed_errors = 0
+    
+    def publish(self, payload):
+        with self._pending_lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped_packets += 1
+            self._pending.append(payload)
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        
+        try:
+            self.loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # loop already closed
+            pass
+    
+    def _drain(self):
+        with self._pending_lock:
+            payloads = list(self._pending)
+            self._pending.clear()
+            self._drain_scheduled = False
+        
+        targets = self.static_targets + list(self.subscribers)
+        for payload in payloads:
+            for addr in targets:
+                try:
+                    self._transport.sendto(payload, addr)
+                    self.sent_packets += 1
+                except Exception as e:
+                    self.send_errors += 1
+                    self._log_error("UDP send error to %s:%d: %s", addr[0], addr[1], e)
+    
+    def send_speed(self, speed, frame_count=0, stride_frequency=0.0,
+                   left_height_movement=0.0, right_height_movement=0.0, warning=False,
+                   capture_time=None, horizon=None):
+        if self.encoder is not None:
+            if capture_time is None:
+                capture_time = time.monotonic()
+            if self.encoder.add(speed, frame_count, stride_frequency, left_height_movement,
+                                right_height_movement, warning, capture_time, horizon):
+                self.flush()
+            return
+        
+        message = encode_text_message(speed, frame_count, stride_frequency, left_height_movement,
+                                      right_height_movement, warning, horizon)
+        self.publish(message.encode('utf-8'))
+    
+    def send_message(self, message):
+        self.publish(message.encode('utf-8'))
+    
+    def flush(self):
+        if self.encoder is None or self.encoder.pending == 0:
+            return
+        # the encoder reuses its buffer, so hand the loop thread a copy
+        self.publish(bytes(self.encoder.packet()))
+    
+    @property
+    def subscriber_count(self):
+        return len(self.subscribers)
+    
+    def close(self):
+        if self.loop.is_closed() or not self.thread.is_alive():
+            return
+        self.flush()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+    
+    def __del__(self):
+        if hasattr(self, 'thread'):
+            self.close()
+
+
+def create_speed_sender(udp_config):
+    protocol = udp_config.get('protocol', PROTOCOL_TEXT)
+    batch_size = udp_config.get('batch_size', 1)
+    output_rate = udp_config.get('output_rate')
+    # predicted samples carry their horizon, which needs the version 2 packet layout
+    packet_version = PACKET_VERSION_PREDICTED if output_rate else PACKET_VERSION
+    
+    if udp_config.get('fanout_port') is None:
+        sender = UDPClient(ip=udp_config['ip'], port=udp_config['port'], protocol=protocol,
+                           batch_size=batch_size, packet_version=packet_version)
+    else:
+        sender = AsyncUDPTransport(
+            targets=[(udp_config['ip'], udp_config['port'])],
+            control_port=udp_config['fanout_port'],
+            protocol=protocol,
+            batch_size=batch_size,
+            packet_version=packet_version
+        )
+    
+    if not output_rate:
+        return sender
+    return SpeedOutputScheduler(sender, rate_hz=output_rate,
+                                max_horizon=udp_config.get('max_prediction', 0.1))
\ No newline at end of file
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from core.speed_predictor import SpeedPredictor
+
+
+class SpeedOutputScheduler:
+    def __init__(self, sender, rate_hz=90.0, max_horizon=0.1, predictor=None, stale_timeout=None):
+        if rate_hz <= 0:
+            raise ValueError(f"rate_hz must be positive, got {rate_hz}")
+        
+        self.sender = sender
+        self.rate_hz = rate_hz
+        self.interval = 1.0 / rate_hz
+        self.max_horizon = max_horizon
+        self.predictor = predictor if predictor is not None else SpeedPredictor()
+        # without a new frame for this long the user is treated as lost and nothing is sent,
+        # as on frames without a pose; by then the predictor restarts on the next sample anyway
+        self.stale_timeout = stale_timeout if stale_timeout is not None else self.predictor.reset_gap
+        
+        self.sent = 0
+        self.late_ticks = 0
+        self.stale_ticks = 0
+        
+        self._sample = None
+        self._send_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def send_speed(self, speed, frame_count=0, stride_frequency=0.0,
+                   left_height_movement=0.0, right_height_movement=0.0, warning=False,
+                   capture_time=None):
+        # called once per camera frame: only feeds the filter, the output thread sends
+        if capture_time is None:
+            capture_time = time.monotonic()
+        self.predictor.update(speed, capture_time)
+        self._sample = (frame_count, stride_frequency, left_height_movement,
+                        right_height_movement, warning, capture_time)
+    
+    def send_message(self, message):
+        self.sender.send_message(message)
+    
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            self._tick()
+            
+            # fixed schedule rather than sleep(interval), so send time does not accumulate as drift
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                self.late_ticks += 1
+                next_tick = time.monotonic()
+                continue
+            self._stop_event.wait(delay)
+    
+    def _tick(self):
+        sample = self._sample
+        if sample is None:
+            return
+        
+        frame_count, stride_frequency, left_height_movement, right_height_movement, warning, capture_time = sample
+        now = time.monotonic()
+        if now - capture_time > self.stale_timeout:
+            self.stale_ticks += 1
+            return
+        
+        speed, horizon = self.predictor.predict(now, self.max_horizon)
+        if speed is None:
+            return
+        
+        with self._send_lock:
+            self.sender.send_speed(
+                speed=speed,
+                frame_count=frame_count,
+                stride_frequency=stride_frequency,
+                left_height_movement=left_height_movement,
+                right_height_movement=right_height_movement,
+                warning=warning,
+                capture_time=capture_time,
+                horizon=horizon
+            )
+        self.sent += 1
+    
+    def flush(self):
+        with self._send_lock:
+            self.sender.flush()
+    
+    def close(self):
+        if self.thread.is_alive():
+            self._stop_event.set()
+            self.thread.join()
+        self.sender.close()
\ No newline at end of file
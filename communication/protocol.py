@@ -0,0 +1,142 @@
+import struct
+
+
+PROTOCOL_TEXT = 'text'
+PROTOCOL_BINARY = 'binary'
+
+PACKET_MAGIC = b'EW'
+PACKET_VERSION = 1
+PACKET_VERSION_PREDICTED = 2
+
+# magic, version, number of samples in the datagram
+HEADER_STRUCT = struct.Struct('<2sBB')
+# sequence, capture timestamp (s, sender monotonic clock), speed, frame,
+# stride frequency, left/right height movement, warning
+SAMPLE_STRUCT = struct.Struct('<IdfIfffB')
+# version 2 appends the prediction horizon: seconds the speed was extrapolated past capture_time
+SAMPLE_STRUCT_V2 = struct.Struct('<IdfIfffBf')
+
+SAMPLE_STRUCTS = {PACKET_VERSION: SAMPLE_STRUCT, PACKET_VERSION_PREDICTED: SAMPLE_STRUCT_V2}
+
+MAX_BATCH_SIZE = 32
+MAX_PACKET_SIZE = HEADER_STRUCT.size + MAX_BATCH_SIZE * SAMPLE_STRUCT_V2.size
+
+SEQUENCE_MODULO = 1 << 32
+
+SAMPLE_FIELDS = ('sequence', 'capture_time', 'speed', 'frame_count', 'stride_frequency',
+                 'left_height_movement', 'right_height_movement', 'warning')
+SAMPLE_FIELDS_V2 = SAMPLE_FIELDS + ('horizon',)
+
+
+class BinarySpeedEncoder:
+    def __init__(self, batch_size=1, version=PACKET_VERSION):
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}, got {batch_size}")
+        if version not in SAMPLE_STRUCTS:
+            raise ValueError(f"Unsupported packet version {version}")
+        
+        self.batch_size = batch_size
+        self.version = version
+        self._sample_struct = SAMPLE_STRUCTS[version]
+        self.sequence = 0
+        self.pending = 0
+        self._buffer = bytearray(MAX_PACKET_SIZE)
+        self._view = memoryview(self._buffer)
+    
+    def add(self, speed, frame_count, stride_frequency, left_height_movement,
+            right_height_movement, warning, capture_time, horizon=0.0):
+        offset = HEADER_STRUCT.size + self.pending * self._sample_struct.size
+        if self.version == PACKET_VERSION:
+            SAMPLE_STRUCT.pack_into(
+                self._buffer, offset,
+                self.sequence, capture_time, speed, frame_count & 0xFFFFFFFF, stride_frequency,
+                left_height_movement, right_height_movement, int(warning)
+            )
+        else:
+            SAMPLE_STRUCT_V2.pack_into(
+                self._buffer, offset,
+                self.sequence, capture_time, speed, frame_count & 0xFFFFFFFF, stride_frequency,
+                left_height_movement, right_height_movement, int(warning), horizon or 0.0
+            )
+        self.sequence = (self.sequence + 1) % SEQUENCE_MODULO
+        self.pending += 1
+        
+        return self.pending >= self.batch_size
+    
+    def packet(self):
+        HEADER_STRUCT.pack_into(self._buffer, 0, PACKET_MAGIC, self.version, self.pending)
+        size = HEADER_STRUCT.size + self.pending * self._sample_struct.size
+        self.pending = 0
+        return self._view[:size]
+
+
+def decode_packet(data):
+    if len(data) < HEADER_STRUCT.size:
+        raise ValueError("Packet shorter than header")
+    
+    magic, version, count = HEADER_STRUCT.unpack_from(data, 0)
+    if magic != PACKET_MAGIC:
+        raise ValueError("Not an EA-WIP speed packet")
+    if version not in SAMPLE_STRUCTS:
+        raise ValueError(f"Unsupported packet version {version}")
+    
+    sample_struct = SAMPLE_STRUCTS[version]
+    fields = SAMPLE_FIELDS_V2 if version == PACKET_VERSION_PREDICTED else SAMPLE_FIELDS
+    if len(data) < HEADER_STRUCT.size + count * sample_struct.size:
+        raise ValueError("Packet truncated")
+    
+    samples = []
+    for i in range(count):
+        values = sample_struct.unpack_from(data, HEADER_STRUCT.size + i * sample_struct.size)
+        sample = dict(zip(fields, values))
+        sample['warning'] = bool(sample['warning'])
+        sample.setdefault('horizon', 0.0)
+        samples.append(sample)
+    
+    return samples
+
+
+def encode_text_message(speed, frame_count, stride_frequency, left_height_movement,
+                        right_height_movement, warning, horizon=None):
+    message = (f"{speed:.4f},{frame_count},{stride_frequency:.2f},"
+               f"{left_height_movement:.4f},{right_height_movement:.4f},{int(warning)}")
+    # an optional trailing field keeps the first six compatible with existing parsers
+    if horizon is not None:
+        message += f",{horizon:.4f}"
+    return message
+
+
+def decode_text_message(message):
+    values = message.split(',')
+    return {
+        'speed': float(values[0]),
+        'frame_count': int(values[1]),
+        'stride_frequency': float(values[2]),
+        'left_height_movement': float(values[3]),
+        'right_height_movement': float(values[4]),
+        'warning': values[5].strip() == '1',
+        'horizon': float(values[6]) if len(values) > 6 else 0.0
+    }
+
+
+class SpeedPacketDecoder:
+    def __init__(self):
+        self.last_sequence = None
+        self.discarded = 0
+    
+    def is_newer(self, sequence):
+        if self.last_sequence is None:
+            return True
+        # serial number arithmetic so the 32-bit counter may wrap
+        delta = (sequence - self.last_sequence) % SEQUENCE_MODULO
+        return 0 < delta < SEQUENCE_MODULO // 2
+    
+    def decode(self, data):
+        fresh = []
+        for sample in decode_packet(data):
+            if self.is_newer(sample['sequence']):
+                self.last_sequence = sample['sequence']
+                fresh.append(sample)
+            else:
+                self.discarded += 1
+        return fresh
\ No newline at end of file
@@ -1,16 +1,34 @@
 import socket
+import time
+
+from .protocol import PROTOCOL_TEXT, PROTOCOL_BINARY, PACKET_VERSION, BinarySpeedEncoder, encode_text_message
 
 
 class UDPClient:
-    def __init__(self, ip=None, port=None):
+    def __init__(self, ip=None, port=None, protocol=PROTOCOL_TEXT, batch_size=1,
+                 packet_version=PACKET_VERSION):
+        if protocol not in (PROTOCOL_TEXT, PROTOCOL_BINARY):
+            raise ValueError(f"Unknown UDP protocol: {protocol}")
+        
         self.ip = ip if ip is not None else "127.0.0.1"
         self.port = port if port is not None else 5005
+        self.protocol = protocol
+        self.encoder = BinarySpeedEncoder(batch_size, packet_version) if protocol == PROTOCOL_BINARY else None
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         
     def send_speed(self, speed, frame_count=0, stride_frequency=0.0, 
-                   left_height_movement=0.0, right_height_movement=0.0, warning=False):
-        message = (f"{speed:.4f},{frame_count},{stride_frequency:.2f},"
-                  f"{left_height_movement:.4f},{right_height_movement:.4f},{int(warning)}")
+                   left_height_movement=0.0, right_height_movement=0.0, warning=False,
+                   capture_time=None, horizon=None):
+        if self.encoder is not None:
+            if capture_time is None:
+                capture_time = time.monotonic()
+            if self.encoder.add(speed, frame_count, stride_frequency, left_height_movement,
+                                right_height_movement, warning, capture_time, horizon):
+                self.flush()
+            return
+        
+        message = encode_text_message(speed, frame_count, stride_frequency, left_height_movement,
+                                      right_height_movement, warning, horizon)
         try:
             self.sock.sendto(message.encode('utf-8'), (self.ip, self.port))
         except Exception as e:
@@ -22,8 +40,18 @@ class UDPClient:
         except Exception as e:
             print(f"UDP Send Error: {e}")
     
+    def flush(self):
+        if self.encoder is None or self.encoder.pending == 0:
+            return
+        try:
+            self.sock.sendto(self.encoder.packet(), (self.ip, self.port))
+        except Exception as e:
+            print(f"UDP Send Error: {e}")
+    
     def close(self):
         if hasattr(self, 'sock'):
+            if self.sock.fileno() != -1:
+                self.flush()
             self.sock.close()
     
     def __del__(self):
@@ -31,14 +59,24 @@ class UDPClient:
 
 
 class UDPReceiver:
-    def __init__(self, ip=None, port=None, timeout=0.5):
+    def __init__(self, ip=None, port=None, timeout=0.5, buffer_size=65536, max_backoff=5.0):
         self.ip = ip if ip is not None else "0.0.0.0"
         self.port = port if port is not None else 6000
         self.timeout = timeout
+        self.max_backoff = max_backoff
         self.sock = None
+        
+        self._buffer = bytearray(buffer_size)
+        self._retry_delay = 0.0
+        self._next_retry = 0.0
+        
         self._initialize_socket()
     
     def _initialize_socket(self):
+        now = time.monotonic()
+        if now < self._next_retry:
+            return
+        
         try:
             if self.sock:
                 self.sock.close()
@@ -49,23 +87,84 @@ class UDPReceiver:
             self.sock.settimeout(self.timeout)
         except Exception as e:
             print(f"UDP Receiver initialization failed: {e}")
+            if self.sock:
+                self.sock.close()
+            self.sock = None
+            self._back_off(now)
+    
+    def _back_off(self, now):
+        # the delay only resets once a datagram is actually received
+        self._retry_delay = min(max(self._retry_delay * 2.0, 0.1), self.max_backoff)
+        self._next_retry = now + self._retry_delay
+    
+    def _receive_failed(self, error):
+        # queued datagrams stay in the socket, so only a socket that was closed under us is rebound
+        print(f"UDP Receive Error: {error}")
+        self._back_off(time.monotonic())
+        if self.sock is not None and self.sock.fileno() == -1:
             self.sock = None
     
+    def _wait_for_retry(self):
+        # callers loop on receive(), so wait here instead of returning straight away
+        delay = self._next_retry - time.monotonic()
+        if self.timeout is not None:
+            delay = min(delay, self.timeout)
+        if delay > 0:
+            time.sleep(delay)
+    
     def receive(self):
         if self.sock is None:
             self._initialize_socket()
-            return None
+            if self.sock is None:
+                self._wait_for_retry()
+                return None
         
         try:
-            data, addr = self.sock.recvfrom(1024)
-            message = data.decode('utf-8')
-            return message
+            size = self.sock.recv_into(self._buffer)
         except socket.timeout:
             return None
+        except ConnectionResetError:
+            # ICMP port unreachable from an earlier send (Windows), the socket is still usable
+            return None
         except Exception as e:
-            print(f"UDP Receive Error: {e}")
-            self._initialize_socket()
+            self._receive_failed(e)
+            self._wait_for_retry()
             return None
+        
+        self._retry_delay = 0.0
+        return self._buffer[:size].decode('utf-8', errors='replace')
+    
+    def receive_all(self, max_messages=64):
+        if self.sock is None:
+            self._initialize_socket()
+            if self.sock is None:
+                return []
+        
+        messages = []
+        sock = self.sock
+        sock.settimeout(0.0)
+        try:
+            while len(messages) < max_messages:
+                try:
+                    size = sock.recv_into(self._buffer)
+                except ConnectionResetError:
+                    continue
+                messages.append(self._buffer[:size].decode('utf-8', errors='replace'))
+        except BlockingIOError:
+            pass
+        except Exception as e:
+            self._receive_failed(e)
+        
+        if messages:
+            self._retry_delay = 0.0
+        if self.sock is sock:
+            sock.settimeout(self.timeout)
+        return messages
+    
+    def fileno(self):
+        if self.sock is None:
+            return -1
+        return self.sock.fileno()
     
     def close(self):
         if hasattr(self, 'sock') and self.sock:
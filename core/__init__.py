@@ -1,4 +1,12 @@
-from .calibration import CalibrationLogic
+from .calibration import CalibrationLogic, CalibrationDriftCheck
+from .calibration_batch import BatchCalibration
 from .ea_wip import EAWIP
+from .ea_wip_batch import BatchEAWIP
+from .fusion import ViewAligner
+from .inference import InferenceLogic
+from .rolling_stats import RollingStats, BlockMinima
+from .speed_predictor import SpeedPredictor
+from .step_detector import StepDetector
 
-__all__ = ['CalibrationLogic', 'EAWIP']
\ No newline at end of file
+__all__ = ['CalibrationLogic', 'CalibrationDriftCheck', 'BatchCalibration', 'EAWIP', 'BatchEAWIP', 'ViewAligner',
+           'InferenceLogic', 'RollingStats', 'BlockMinima', 'SpeedPredictor', 'StepDetector']
\ No newline at end of file
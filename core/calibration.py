@@ -2,11 +2,16 @@ import numpy as np
 from collections import deque
 import time
 
+from .rolling_stats import RollingStats, BlockMinima
+from .step_detector import StepDetector
+
 
 class CalibrationLogic:
-    def __init__(self, fps=30, calibration_duration=8.0):
+    def __init__(self, fps=30, calibration_duration=8.0, threshold_factor=0.5):
         self.fps = fps
         self.calibration_duration = calibration_duration
+        # step thresholds sit threshold_factor standard deviations above the ground
+        self.threshold_factor = threshold_factor
         self.max_frames = int(fps * calibration_duration)
         
         self.frame_count = 0
@@ -14,17 +19,14 @@ class CalibrationLogic:
         self.right_heel_heights = deque(maxlen=self.max_frames)
         self.time_stamps = deque(maxlen=self.max_frames)
         
-        self.crossings_left = deque(maxlen=10)
-        self.crossings_right = deque(maxlen=10)
-        self.left_intervals = []
-        self.right_intervals = []
-        self.left_height_movements = []
-        self.right_height_movements = []
+        ground_window = int(2.0 * fps)
+        self.left_ground = BlockMinima(ground_window)
+        self.right_ground = BlockMinima(ground_window)
+        self.left_height_stats = RollingStats(self.max_frames)
+        self.right_height_stats = RollingStats(self.max_frames)
         
-        self.prev_left_heel_height = None
-        self.prev_right_heel_height = None
-        self.last_crossing_time_left = None
-        self.last_crossing_time_right = None
+        self.left_steps = StepDetector(min_gap_samples=10, history=self.max_frames, include_start=False)
+        self.right_steps = StepDetector(min_gap_samples=10, history=self.max_frames, include_start=False)
         
         self.left_mu_h = 0.0
         self.right_mu_h = 0.0
@@ -51,109 +53,66 @@ class CalibrationLogic:
         return np.mean(window_minima) if window_minima else 0.0
     
     def process_frame(self, left_heel_height, right_heel_height, current_time):
+        # the ground reference averages every 2 s block since the start, so calibration
+        # covers exactly the first max_frames samples and later ones are ignored
+        if self.is_calibration_complete():
+            return
+        
         self.left_heel_heights.append(left_heel_height)
         self.right_heel_heights.append(right_heel_height)
         self.time_stamps.append(current_time)
         self.frame_count += 1
         
+        self.left_ground.append(left_heel_height)
+        self.right_ground.append(right_heel_height)
+        self.left_height_stats.append(left_heel_height)
+        self.right_height_stats.append(right_heel_height)
+        
         if self.frame_count <= 90:
-            self.prev_left_heel_height = left_heel_height
-            self.prev_right_heel_height = right_heel_height
+            self.left_steps.prime(left_heel_height)
+            self.right_steps.prime(right_heel_height)
             return
         
-        left_y = np.array(list(self.left_heel_heights))
-        right_y = np.array(list(self.right_heel_heights))
-        
-        self.left_mu_h = self.compute_ground_reference(self.left_heel_heights)
-        self.right_mu_h = self.compute_ground_reference(self.right_heel_heights)
-        self.left_sigma_h = np.std(left_y) if len(left_y) > 0 else 0.0
-        self.right_sigma_h = np.std(right_y) if len(right_y) > 0 else 0.0
-        
-        self.left_threshold = self.left_mu_h + 0.5 * self.left_sigma_h
-        self.right_threshold = self.right_mu_h + 0.5 * self.right_sigma_h
-        
-        self._detect_crossing_left(left_heel_height, current_time)
-        self._detect_crossing_right(right_heel_height, current_time)
-        
-        self.prev_left_heel_height = left_heel_height
-        self.prev_right_heel_height = right_heel_height
-    
-    def _detect_crossing_left(self, left_heel_height, current_time):
-        if self.prev_left_heel_height is None:
-            return
+        self.left_mu_h = self.left_ground.mean()
+        self.right_mu_h = self.right_ground.mean()
+        self.left_sigma_h = self.left_height_stats.std()
+        self.right_sigma_h = self.right_height_stats.std()
         
-        left_cross = (self.prev_left_heel_height < self.left_threshold <= left_heel_height)
-        
-        if left_cross:
-            if self.last_crossing_time_left is not None:
-                interval = current_time - self.last_crossing_time_left
-                last_frame_left = self.crossings_left[-1][1] if self.crossings_left else 0
-                frame_interval = self.frame_count - last_frame_left
-                
-                if frame_interval >= 10:
-                    self.crossings_left.append((current_time, self.frame_count))
-                    self.left_intervals.append(interval)
-                    
-                    start_idx = max(0, len(self.left_heel_heights) - frame_interval)
-                    between = list(self.left_heel_heights)[start_idx:]
-                    if between:
-                        height_diff = max(between) - min(between)
-                        self.left_height_movements.append(height_diff)
-                    
-                    self.last_crossing_time_left = current_time
-            else:
-                self.last_crossing_time_left = current_time
-                self.crossings_left.append((current_time, self.frame_count))
-    
-    def _detect_crossing_right(self, right_heel_height, current_time):
-        if self.prev_right_heel_height is None:
-            return
+        self.left_threshold = self.left_mu_h + self.threshold_factor * self.left_sigma_h
+        self.right_threshold = self.right_mu_h + self.threshold_factor * self.right_sigma_h
         
-        right_cross = (self.prev_right_heel_height < self.right_threshold <= right_heel_height)
-        
-        if right_cross:
-            if self.last_crossing_time_right is not None:
-                interval = current_time - self.last_crossing_time_right
-                last_frame_right = self.crossings_right[-1][1] if self.crossings_right else 0
-                frame_interval = self.frame_count - last_frame_right
-                
-                if frame_interval >= 10:
-                    self.crossings_right.append((current_time, self.frame_count))
-                    self.right_intervals.append(interval)
-                    
-                    start_idx = max(0, len(self.right_heel_heights) - frame_interval)
-                    between = list(self.right_heel_heights)[start_idx:]
-                    if between:
-                        height_diff = max(between) - min(between)
-                        self.right_height_movements.append(height_diff)
-                    
-                    self.last_crossing_time_right = current_time
-            else:
-                self.last_crossing_time_right = current_time
-                self.crossings_right.append((current_time, self.frame_count))
+        self.left_steps.threshold = self.left_threshold
+        self.right_steps.threshold = self.right_threshold
+        self.left_steps.update(left_heel_height, current_time)
+        self.right_steps.update(right_heel_height, current_time)
     
     def is_calibration_complete(self):
         return self.frame_count >= self.max_frames
     
+    def has_measured_results(self):
+        # otherwise get_calibration_results falls back to population defaults
+        return (len(self.left_heel_heights) >= 90 and self.left_steps.crossing_count >= 2
+                and self.right_steps.crossing_count >= 2)
+    
     def get_calibration_results(self):
-        if len(self.left_heel_heights) < 90 or len(self.crossings_left) < 2 or len(self.crossings_right) < 2:
+        if not self.has_measured_results():
             left_mu_h = -0.3
             right_mu_h = -0.3
             left_sigma_h = 0.1
             right_sigma_h = 0.1
-            left_threshold = left_mu_h + 0.5 * left_sigma_h
-            right_threshold = right_mu_h + 0.5 * right_sigma_h
+            left_threshold = left_mu_h + self.threshold_factor * left_sigma_h
+            right_threshold = right_mu_h + self.threshold_factor * right_sigma_h
             left_fc = 1.2
             right_fc = 1.2
             left_hc = 0.12
             right_hc = 0.12
         else:
-            avg_crossing_left = np.mean(self.left_intervals) if self.left_intervals else 1.0
-            avg_crossing_right = np.mean(self.right_intervals) if self.right_intervals else 1.0
+            avg_crossing_left = self.left_steps.mean_interval if self.left_steps.stride_count else 1.0
+            avg_crossing_right = self.right_steps.mean_interval if self.right_steps.stride_count else 1.0
             left_fc = min(1.0 / avg_crossing_left if avg_crossing_left > 0 else 1.2, 4.5)
             right_fc = min(1.0 / avg_crossing_right if avg_crossing_right > 0 else 1.2, 4.5)
-            left_hc = np.mean(self.left_height_movements) if self.left_height_movements else 0.12
-            right_hc = np.mean(self.right_height_movements) if self.right_height_movements else 0.12
+            left_hc = self.left_steps.mean_amplitude if self.left_steps.stride_count else 0.12
+            right_hc = self.right_steps.mean_amplitude if self.right_steps.stride_count else 0.12
             
             left_mu_h = self.left_mu_h
             right_mu_h = self.right_mu_h
@@ -173,4 +132,41 @@ class CalibrationLogic:
             'h_c_right': right_hc,
             'f_c_left': left_fc,
             'f_c_right': right_fc
-        }
\ No newline at end of file
+        }
+
+
+class CalibrationDriftCheck:
+    def __init__(self, calib_results, fps=30, duration=3.0, tolerance=1.0, min_sigma=0.01):
+        self.mu_h = (calib_results['mu_h_left'], calib_results['mu_h_right'])
+        self.sigma_h = (max(calib_results['sigma_h_left'], min_sigma),
+                        max(calib_results['sigma_h_right'], min_sigma))
+        self.tolerance = tolerance
+        self.max_frames = int(fps * duration)
+        
+        # same estimate as calibration, over 1 s blocks so a few seconds are enough
+        block = max(int(fps), 1)
+        self.left_ground = BlockMinima(block)
+        self.right_ground = BlockMinima(block)
+        self.frame_count = 0
+        
+        self.drift = None
+        self.drifted = None
+    
+    def update(self, left_heel_height, right_heel_height):
+        if self.drifted is not None:
+            return self.drifted
+        
+        self.left_ground.append(left_heel_height)
+        self.right_ground.append(right_heel_height)
+        self.frame_count += 1
+        if self.frame_count < self.max_frames:
+            return None
+        
+        # ground reference shift in units of the calibrated variability; once it exceeds
+        # the tolerance the stored thresholds (mu_h + threshold_factor * sigma_h) no longer fit
+        self.drift = max(
+            abs(self.left_ground.mean() - self.mu_h[0]) / self.sigma_h[0],
+            abs(self.right_ground.mean() - self.mu_h[1]) / self.sigma_h[1]
+        )
+        self.drifted = self.drift > self.tolerance
+        return self.drifted
\ No newline at end of file
@@ -0,0 +1,237 @@
+import numpy as np
+
+
+FALLBACK_RESULTS = {
+    'mu_h_left': -0.3,
+    'mu_h_right': -0.3,
+    'sigma_h_left': 0.1,
+    'sigma_h_right': 0.1,
+    'threshold_left': -0.3 + 0.5 * 0.1,
+    'threshold_right': -0.3 + 0.5 * 0.1,
+    'h_c_left': 0.12,
+    'h_c_right': 0.12,
+    'f_c_left': 1.2,
+    'f_c_right': 1.2
+}
+
+
+class BatchCalibration:
+    # whole-array counterpart of CalibrationLogic: feeding the same samples frame by frame
+    # through CalibrationLogic.process_frame gives the same get_calibration_results().
+    # Arrays are (sessions, frames), so many equally long calibrations run together; as in
+    # CalibrationLogic, only the first max_frames samples of a session are used.
+    def __init__(self, fps=30, calibration_duration=8.0, threshold_factor=0.5):
+        self.fps = fps
+        self.calibration_duration = calibration_duration
+        self.threshold_factor = threshold_factor
+        self.max_frames = int(fps * calibration_duration)
+        self.ground_window = int(2.0 * fps)
+        
+        # hard-coded in CalibrationLogic as well
+        self.prime_frames = 90
+        self.min_gap_samples = 10
+        self.max_cadence = 4.5
+    
+    def ground_reference(self, heights):
+        # BlockMinima.mean() after each sample: mean of the completed block minima,
+        # or the minimum so far until the first block completes
+        S, n = heights.shape
+        W = self.ground_window
+        NW = n // W
+        
+        running_min = np.minimum.accumulate(heights, axis=1)
+        if NW == 0:
+            return running_min
+        
+        minima = heights[:, :NW * W].reshape(S, NW, W).min(axis=2)
+        minima_mean = np.cumsum(minima, axis=1) / np.arange(1, NW + 1)
+        
+        completed = (np.arange(n) + 1) // W
+        return np.where(completed > 0, minima_mean[:, np.maximum(completed - 1, 0)], running_min)
+    
+    def rolling_std(self, heights):
+        # population std over the last max_frames samples, as RollingStats(max_frames)
+        S, n = heights.shape
+        M = self.max_frames
+        
+        # shift before the running sums so the variance does not cancel out
+        shifted = heights - heights.mean(axis=1, keepdims=True)
+        zeros = np.zeros((S, 1))
+        sums = np.concatenate((zeros, np.cumsum(shifted, axis=1)), axis=1)
+        squares = np.concatenate((zeros, np.cumsum(shifted * shifted, axis=1)), axis=1)
+        
+        end = np.arange(1, n + 1)
+        start = np.maximum(end - M, 0)
+        count = end - start
+        mean = (sums[:, end] - sums[:, start]) / count
+        variance = (squares[:, end] - squares[:, start]) / count - mean * mean
+        return np.sqrt(np.maximum(variance, 0.0))
+    
+    def detect_crossings(self, heights, thresholds, timestamps):
+        # upward threshold crossings after the priming frames; returns (sessions, rounds)
+        # accepted crossing indices, padded with n once a session has no more
+        S, n = heights.shape
+        rows = np.arange(S)
+        start = max(self.prime_frames, 1)
+        
+        candidates = np.zeros((S, n), dtype=bool)
+        candidates[:, start:] = ((heights[:, start - 1:-1] < thresholds[:, start:])
+                                 & (thresholds[:, start:] <= heights[:, start:]))
+        
+        # next[s, i]: first candidate at or after i
+        positions = np.where(candidates, np.arange(n), n)
+        next_candidate = np.full((S, n + 1), n, dtype=np.int64)
+        next_candidate[:, :n] = np.minimum.accumulate(positions[:, ::-1], axis=1)[:, ::-1]
+        
+        # StepDetector accepts greedily: the first crossing, then the next one at least
+        # min_gap_samples later; each round advances every session by one stride
+        current = next_candidate[:, 0]
+        accepted = [current]
+        while True:
+            active = current < n
+            if not active.any():
+                break
+            
+            candidate = next_candidate[rows, np.minimum(current + self.min_gap_samples, n)]
+            candidate[~active] = n
+            
+            # min_interval is 0 during calibration, so only a clock going backwards is rejected
+            last_time = timestamps[rows, np.minimum(current, n - 1)]
+            behind = (candidate < n) & (timestamps[rows, np.minimum(candidate, n - 1)] < last_time)
+            while behind.any():
+                candidate[behind] = next_candidate[rows[behind], candidate[behind] + 1]
+                behind = (candidate < n) & (timestamps[rows, np.minimum(candidate, n - 1)] < last_time)
+            
+            accepted.append(candidate)
+            current = candidate
+        
+        return np.stack(accepted, axis=1)
+    
+    def stride_amplitudes(self, heights, crossings):
+        # each stride runs from the sample after one accepted crossing up to and including
+        # the next; strides of a session are contiguous, so one reduceat over the flattened
+        # array yields every stride's max and min
+        S, n = heights.shape
+        stride_start = crossings[:, :-1] + 1
+        stride_end = crossings[:, 1:]
+        valid = stride_end < n
+        amplitudes = np.zeros(stride_end.shape)
+        if not valid.any():
+            return amplitudes, valid
+        
+        offsets = (np.arange(S) * n)[:, None]
+        starts = (stride_start + offsets)[valid]
+        ends = (stride_end + offsets)[valid] + 1
+        
+        flat = heights.ravel()
+        boundaries = np.union1d(starts, ends)
+        boundaries = boundaries[boundaries < flat.size]
+        segment = np.searchsorted(boundaries, starts)
+        amplitudes[valid] = (np.maximum.reduceat(flat, boundaries)[segment]
+                             - np.minimum.reduceat(flat, boundaries)[segment])
+        
+        return amplitudes, valid
+    
+    def calibrate_side(self, heights, timestamps):
+        S, n = heights.shape
+        rows = np.arange(S)[:, None]
+        
+        mu_h = self.ground_reference(heights)
+        sigma_h = self.rolling_std(heights)
+        thresholds = mu_h + self.threshold_factor * sigma_h
+        
+        crossings = self.detect_crossings(heights, thresholds, timestamps)
+        amplitudes, valid = self.stride_amplitudes(heights, crossings)
+        
+        crossing_times = timestamps[rows, np.minimum(crossings, n - 1)]
+        intervals = np.where(valid, crossing_times[:, 1:] - crossing_times[:, :-1], 0.0)
+        stride_count = valid.sum(axis=1)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_interval = intervals.sum(axis=1) / stride_count
+            mean_amplitude = np.where(valid, amplitudes, 0.0).sum(axis=1) / stride_count
+        
+        return {
+            'mu_h': mu_h[:, -1],
+            'sigma_h': sigma_h[:, -1],
+            'threshold': thresholds[:, -1],
+            'crossing_count': (crossings < n).sum(axis=1),
+            'mean_interval': mean_interval,
+            'mean_amplitude': mean_amplitude
+        }
+    
+    def calibrate_sessions(self, left_heights, right_heights, timestamps):
+        left_heights = np.atleast_2d(np.asarray(left_heights, dtype=np.float64))
+        right_heights = np.atleast_2d(np.asarray(right_heights, dtype=np.float64))
+        timestamps = np.atleast_2d(np.asarray(timestamps, dtype=np.float64))
+        
+        left_heights = left_heights[:, :self.max_frames]
+        right_heights = right_heights[:, :self.max_frames]
+        timestamps = timestamps[:, :self.max_frames]
+        S, n = left_heights.shape
+        
+        if n < self.prime_frames:
+            return [self.fallback_results() for _ in range(S)]
+        
+        left = self.calibrate_side(left_heights, timestamps)
+        right = self.calibrate_side(right_heights, timestamps)
+        
+        results = []
+        for s in range(S):
+            if left['crossing_count'][s] < 2 or right['crossing_count'][s] < 2:
+                results.append(self.fallback_results())
+                continue
+            
+            results.append({
+                'mu_h_left': float(left['mu_h'][s]),
+                'mu_h_right': float(right['mu_h'][s]),
+                'sigma_h_left': float(left['sigma_h'][s]),
+                'sigma_h_right': float(right['sigma_h'][s]),
+                'threshold_left': float(left['threshold'][s]),
+                'threshold_right': float(right['threshold'][s]),
+                'h_c_left': float(left['mean_amplitude'][s]),
+                'h_c_right': float(right['mean_amplitude'][s]),
+                'f_c_left': self._cadence(left['mean_interval'][s]),
+                'f_c_right': self._cadence(right['mean_interval'][s])
+            })
+        
+        return results
+    
+    def fallback_results(self):
+        results = dict(FALLBACK_RESULTS)
+        results['threshold_left'] = results['mu_h_left'] + self.threshold_factor * results['sigma_h_left']
+        results['threshold_right'] = results['mu_h_right'] + self.threshold_factor * results['sigma_h_right']
+        return results
+    
+    def _cadence(self, mean_interval):
+        return float(min(1.0 / mean_interval if mean_interval > 0 else 1.2, self.max_cadence))
+    
+    def calibrate(self, left_heights, right_heights, timestamps):
+        return self.calibrate_sessions(left_heights, right_heights, timestamps)[0]
+    
+    def _calibration_frames(self, trace):
+        # the live and replay paths feed frames with a pose until max_frames have been seen
+        left_heights = np.asarray(trace['left_height'], dtype=np.float64)
+        has_pose = ~np.isnan(left_heights)
+        return (left_heights[has_pose][:self.max_frames],
+                np.asarray(trace['right_height'], dtype=np.float64)[has_pose][:self.max_frames],
+                np.asarray(trace['timestamp'], dtype=np.float64)[has_pose][:self.max_frames])
+    
+    def calibrate_trace(self, trace):
+        return self.calibrate(*self._calibration_frames(trace))
+    
+    def calibrate_traces(self, traces):
+        # complete calibrations are all max_frames long and go through in one batch;
+        # shorter ones are grouped by length
+        groups = {}
+        for index, trace in enumerate(traces):
+            frames = self._calibration_frames(trace)
+            groups.setdefault(len(frames[0]), []).append((index, frames))
+        
+        results = [None] * len(traces)
+        for members in groups.values():
+            indices = [index for index, _ in members]
+            left, right, timestamps = (np.stack(arrays) for arrays in zip(*(frames for _, frames in members)))
+            for index, result in zip(indices, self.calibrate_sessions(left, right, timestamps)):
+                results[index] = result
+        return results
\ No newline at end of file
@@ -1,9 +1,10 @@
 import numpy as np
-from collections import deque
+
+from .rolling_stats import RollingStats
 
 
 class EAWIP:
-    def __init__(self, fps=30):
+    def __init__(self, fps=30, lambda_weight=0.5, theta_o=0.25, window=2.0):
         self.fps = fps
         
         self.h_c_left = None
@@ -12,17 +13,20 @@ class EAWIP:
         self.f_c_right = None
         self.v0 = None
         
-        self.lambda_weight = 0.5 #supplemental material table S1
-        self.theta_o = 0.25 #supplemental material table S1
+        self.lambda_weight = lambda_weight #supplemental material table S1
+        self.theta_o = theta_o #supplemental material table S1
         
-        self.T_window = int(2.0 * fps)
-        self.vis_history_left = deque(maxlen=self.T_window)
-        self.vis_history_right = deque(maxlen=self.T_window)
+        self.window = window
+        self.T_window = int(window * fps)
+        self.vis_history_left = RollingStats(self.T_window)
+        self.vis_history_right = RollingStats(self.T_window)
         
-        self.speed_history = deque(maxlen=self.T_window)
+        self.speed_history = RollingStats(self.T_window)
         self.current_speed = 0.0
         
         self.frame_count = 0
+        self.is_occluded = False
+        self.suppressed_frames = 0
         
     def set_calibration_results(self, calib_results):
         self.h_c_left = calib_results['h_c_left']
@@ -33,6 +37,14 @@ class EAWIP:
     def set_base_speed(self, v0):
         self.v0 = v0
     
+    def set_fps(self, fps):
+        # windows are defined in seconds, so follow the effective frame rate
+        self.fps = fps
+        self.T_window = max(int(self.window * fps), 1)
+        self.vis_history_left.resize(self.T_window)
+        self.vis_history_right.resize(self.T_window)
+        self.speed_history.resize(self.T_window)
+    
     def calculate_stride_cadence_index(self, h, f, h_c, f_c):
         if h_c is None or f_c is None or h_c <= 0 or f_c <= 0:
             return 1.0
@@ -47,12 +59,8 @@ class EAWIP:
         if len(vis_history) < self.T_window:
             return 0.0
         
-        vis_array = np.array(list(vis_history))
-        vis_mean = np.mean(vis_array)
-        vis_std = np.std(vis_array)
-        
-        delta_V = vis_mean - vis_current
-        sigma_V = vis_std
+        delta_V = vis_history.mean() - vis_current
+        sigma_V = vis_history.std()
         
         OCI = delta_V + self.lambda_weight * sigma_V
         
@@ -70,6 +78,8 @@ class EAWIP:
         return OCI_mean > self.theta_o
     
     def calculate_speed(self, h_left, h_right, f_left, f_right, vis_left, vis_right):
+        self.is_occluded = False
+        
         if self.v0 is None:
             return 0.0
         
@@ -82,15 +92,17 @@ class EAWIP:
         v_star = self.v0 / (vis_left + vis_right) * (vis_left * z_left + vis_right * z_right)
         
         is_occluded = self.detect_occlusion(vis_left, vis_right)
+        self.is_occluded = is_occluded
         
         if is_occluded:
+            self.suppressed_frames += 1
             if len(self.speed_history) > 0:
                 return self.speed_history[-1]
             else:
                 return 0.0
         
         self.speed_history.append(v_star)
-        smoothed_speed = np.mean(list(self.speed_history))
+        smoothed_speed = self.speed_history.mean()
         
         return smoothed_speed
     
@@ -107,4 +119,6 @@ class EAWIP:
         self.vis_history_right.clear()
         self.speed_history.clear()
         self.current_speed = 0.0
-        self.frame_count = 0
\ No newline at end of file
+        self.frame_count = 0
+        self.is_occluded = False
+        self.suppressed_frames = 0
\ No newline at end of file
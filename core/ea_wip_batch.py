@@ -0,0 +1,180 @@
+import numpy as np
+
+
+class BatchEAWIP:
+    def __init__(self, num_users, fps=30, lambda_weight=0.5, theta_o=0.25, window=2.0):
+        self.num_users = num_users
+        self.fps = fps
+        
+        self.h_c_left = np.full(num_users, np.nan)
+        self.h_c_right = np.full(num_users, np.nan)
+        self.f_c_left = np.full(num_users, np.nan)
+        self.f_c_right = np.full(num_users, np.nan)
+        self.v0 = None
+        
+        self.lambda_weight = lambda_weight #supplemental material table S1
+        self.theta_o = theta_o #supplemental material table S1
+        
+        self.window = window
+        self.T_window = int(window * fps)
+        
+        # struct-of-arrays counterpart of EAWIP's RollingStats histories;
+        # left/right visibility are always appended together so they share head/count
+        self.vis_buffer_left = np.zeros((num_users, self.T_window))
+        self.vis_buffer_right = np.zeros((num_users, self.T_window))
+        self.vis_mean_left = np.zeros(num_users)
+        self.vis_mean_right = np.zeros(num_users)
+        self.vis_m2_left = np.zeros(num_users)
+        self.vis_m2_right = np.zeros(num_users)
+        self.vis_head = np.zeros(num_users, dtype=np.int64)
+        self.vis_count = np.zeros(num_users, dtype=np.int64)
+        
+        self.speed_buffer = np.zeros((num_users, self.T_window))
+        self.speed_mean = np.zeros(num_users)
+        self.speed_head = np.zeros(num_users, dtype=np.int64)
+        self.speed_count = np.zeros(num_users, dtype=np.int64)
+        
+        self.current_speed = np.zeros(num_users)
+        self.is_occluded = np.zeros(num_users, dtype=bool)
+        
+        self.frame_count = 0
+    
+    def set_calibration_results(self, calib_results):
+        for user, results in enumerate(calib_results):
+            self.set_user_calibration(user, results)
+    
+    def set_user_calibration(self, user, calib_results):
+        for key in ('h_c_left', 'h_c_right', 'f_c_left', 'f_c_right'):
+            value = calib_results[key]
+            getattr(self, key)[user] = np.nan if value is None else value
+    
+    def set_base_speed(self, v0):
+        self.v0 = np.broadcast_to(np.asarray(v0, dtype=np.float64), (self.num_users,)).copy()
+    
+    def calculate_stride_cadence_index(self, h, f, h_c, f_c):
+        z = np.ones(self.num_users)
+        valid = (h_c > 0) & (f_c > 0)
+        
+        r_h = h[valid] / h_c[valid]
+        r_f = f[valid] / f_c[valid]
+        with np.errstate(invalid='ignore'):
+            z[valid] = np.sqrt(r_h * r_f)
+        
+        return z
+    
+    def _push_rolling(self, rows, values, buffer, mean, m2, head, count):
+        current_count = count[rows]
+        current_head = head[rows]
+        old_mean = mean[rows]
+        
+        growing = current_count < self.T_window
+        new_count = np.where(growing, current_count + 1, current_count)
+        old_values = buffer[rows, current_head]
+        
+        delta = np.where(growing, values - old_mean, values - old_values)
+        new_mean = old_mean + delta / new_count
+        
+        if m2 is not None:
+            correction = np.where(
+                growing,
+                values - new_mean,
+                values - new_mean + old_values - old_mean
+            )
+            m2[rows] = m2[rows] + delta * correction
+        
+        mean[rows] = new_mean
+        buffer[rows, current_head] = values
+        return new_count
+    
+    def _advance(self, rows, new_count, head, count):
+        count[rows] = new_count
+        next_head = head[rows] + 1
+        next_head[next_head == self.T_window] = 0
+        head[rows] = next_head
+    
+    def calculate_oci(self, vis_current, vis_mean, vis_m2):
+        full = self.vis_count == self.T_window
+        oci = np.zeros(self.num_users)
+        
+        variance = np.maximum(vis_m2[full] / self.vis_count[full], 0.0)
+        oci[full] = (vis_mean[full] - vis_current[full]) + self.lambda_weight * np.sqrt(variance)
+        
+        return oci
+    
+    def detect_occlusion(self, rows, vis_left, vis_right):
+        count = self._push_rolling(
+            rows, vis_left[rows], self.vis_buffer_left,
+            self.vis_mean_left, self.vis_m2_left, self.vis_head, self.vis_count
+        )
+        self._push_rolling(
+            rows, vis_right[rows], self.vis_buffer_right,
+            self.vis_mean_right, self.vis_m2_right, self.vis_head, self.vis_count
+        )
+        self._advance(rows, count, self.vis_head, self.vis_count)
+        
+        oci_left = self.calculate_oci(vis_left, self.vis_mean_left, self.vis_m2_left)
+        oci_right = self.calculate_oci(vis_right, self.vis_mean_right, self.vis_m2_right)
+        
+        oci_mean = (oci_left + oci_right) / 2.0
+        
+        occluded = np.zeros(self.num_users, dtype=bool)
+        occluded[rows] = oci_mean[rows] > self.theta_o
+        return occluded
+    
+    def calculate_speed(self, h_left, h_right, f_left, f_right, vis_left, vis_right):
+        speed = np.zeros(self.num_users)
+        self.is_occluded[:] = False
+        
+        if self.v0 is None:
+            return speed
+        
+        z_left = self.calculate_stride_cadence_index(h_left, f_left, self.h_c_left, self.f_c_left)
+        z_right = self.calculate_stride_cadence_index(h_right, f_right, self.h_c_right, self.f_c_right)
+        
+        vis_sum = vis_left + vis_right
+        active = vis_sum != 0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v_star = self.v0 / vis_sum * (vis_left * z_left + vis_right * z_right)
+        
+        occluded = self.detect_occlusion(np.flatnonzero(active), vis_left, vis_right)
+        self.is_occluded[:] = occluded
+        
+        held = np.flatnonzero(occluded & (self.speed_count > 0))
+        last_index = (self.speed_head[held] - 1) % self.T_window
+        speed[held] = self.speed_buffer[held, last_index]
+        
+        updating = np.flatnonzero(active & ~occluded)
+        count = self._push_rolling(
+            updating, v_star[updating], self.speed_buffer,
+            self.speed_mean, None, self.speed_head, self.speed_count
+        )
+        self._advance(updating, count, self.speed_head, self.speed_count)
+        speed[updating] = self.speed_mean[updating]
+        
+        return speed
+    
+    def update(self, h_left, h_right, f_left, f_right, vis_left, vis_right):
+        self.frame_count += 1
+        
+        inputs = [np.asarray(values, dtype=np.float64) for values in
+                  (h_left, h_right, f_left, f_right, vis_left, vis_right)]
+        speed = self.calculate_speed(*inputs)
+        self.current_speed = np.where(speed > 0.0, speed, 0.0)
+        
+        return self.current_speed
+    
+    def reset(self, users=None):
+        rows = slice(None) if users is None else users
+        
+        for array in (self.vis_buffer_left, self.vis_buffer_right, self.speed_buffer):
+            array[rows] = 0.0
+        for array in (self.vis_mean_left, self.vis_mean_right, self.vis_m2_left,
+                      self.vis_m2_right, self.speed_mean, self.current_speed):
+            array[rows] = 0.0
+        for array in (self.vis_head, self.vis_count, self.speed_head, self.speed_count):
+            array[rows] = 0
+        self.is_occluded[rows] = False
+        
+        if users is None:
+            self.frame_count = 0
\ No newline at end of file
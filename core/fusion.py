@@ -0,0 +1,129 @@
+import bisect
+import math
+
+import numpy as np
+
+from .replay import TRACE_FIELDS
+from .rolling_stats import RollingStats
+
+
+SIDES = ('left', 'right')
+HEEL_FIELDS = ('left_height', 'right_height', 'left_x', 'right_x', 'left_visibility', 'right_visibility')
+
+
+def sample_view(timestamps, views, t, max_skew):
+    # one camera's heel data at capture time t of the primary camera: interpolated between
+    # its frames either side of t, or the nearer one when only one of them has a pose;
+    # views[i] is the heel data of the frame captured at timestamps[i], None without a pose
+    i = bisect.bisect_left(timestamps, t)
+    before = views[i - 1] if i > 0 and t - timestamps[i - 1] <= max_skew else None
+    after = views[i] if i < len(timestamps) and timestamps[i] - t <= max_skew else None
+    
+    if before is not None and after is not None:
+        span = timestamps[i] - timestamps[i - 1]
+        weight = (t - timestamps[i - 1]) / span if span > 0 else 1.0
+        return {field: before[field] + (after[field] - before[field]) * weight for field in before}
+    if before is not None:
+        return before
+    return after
+
+
+class ViewAligner:
+    # heel heights are projections and differ between camera angles, so every further view
+    # is mapped onto the primary view's scale by matching mean and spread over recent
+    # frames in which both views see the heel
+    def __init__(self, num_views, window=300, min_samples=30, min_visibility=0.5):
+        self.num_views = num_views
+        self.min_samples = min_samples
+        self.min_visibility = min_visibility
+        self.stats = [{side: (RollingStats(window), RollingStats(window)) for side in SIDES}
+                      for _ in range(num_views)]
+    
+    def observe(self, views):
+        primary = views[0]
+        if primary is None:
+            return
+        
+        for k in range(1, self.num_views):
+            view = views[k]
+            if view is None:
+                continue
+            for side in SIDES:
+                if (primary[f'{side}_visibility'] >= self.min_visibility
+                        and view[f'{side}_visibility'] >= self.min_visibility):
+                    own, reference = self.stats[k][side]
+                    own.append(view[f'{side}_height'])
+                    reference.append(primary[f'{side}_height'])
+    
+    def is_aligned(self, k, side):
+        return k == 0 or len(self.stats[k][side][0]) >= self.min_samples
+    
+    def align(self, k, side, height):
+        if k == 0:
+            return height
+        
+        own, reference = self.stats[k][side]
+        sigma = own.std()
+        scale = reference.std() / sigma if sigma > 1e-6 else 1.0
+        return reference.mean() + (height - own.mean()) * scale
+
+
+def fuse_views(views, aligner):
+    # visibility-weighted mean of the aligned heel heights; a heel counts as visible as it
+    # is in its best view, so occluding it in one camera no longer triggers suppression
+    aligner.observe(views)
+    
+    fused = {}
+    for side in SIDES:
+        total = 0.0
+        weighted = 0.0
+        best = None
+        for k, view in enumerate(views):
+            if view is None or not aligner.is_aligned(k, side):
+                continue
+            visibility = view[f'{side}_visibility']
+            total += visibility
+            weighted += visibility * aligner.align(k, side, view[f'{side}_height'])
+            if best is None or visibility > best[f'{side}_visibility']:
+                best = view
+        
+        if best is None or total <= 0:
+            return None
+        fused[f'{side}_height'] = weighted / total
+        fused[f'{side}_visibility'] = best[f'{side}_visibility']
+        if f'{side}_x' in best:
+            # horizontal positions are not aligned between views, take the best one
+            fused[f'{side}_x'] = best[f'{side}_x']
+    
+    return fused
+
+
+def trace_views(trace):
+    # per-frame heel data of a heel trace, None for frames without a pose
+    fields = [field for field in TRACE_FIELDS if field != 'timestamp']
+    columns = [np.asarray(trace[field], dtype=np.float64).tolist() for field in fields]
+    return [None if math.isnan(values[0]) else dict(zip(fields, values)) for values in zip(*columns)]
+
+
+def fuse_traces(traces, max_skew=0.034, **aligner_options):
+    # offline counterpart of vision.fusion.MultiViewSource: every frame of the first trace is
+    # fused with the other traces sampled at its timestamp
+    aligner = ViewAligner(len(traces), **aligner_options)
+    timestamps = [np.asarray(trace['timestamp'], dtype=np.float64).tolist() for trace in traces]
+    views = [trace_views(trace) for trace in traces]
+    
+    num_frames = len(timestamps[0])
+    fused = {field: np.full(num_frames, np.nan) for field in TRACE_FIELDS}
+    fused['timestamp'][:] = timestamps[0]
+    if 'reference_speed' in traces[0]:
+        fused['reference_speed'] = np.asarray(traces[0]['reference_speed'], dtype=np.float64)
+    
+    for i, t in enumerate(timestamps[0]):
+        frame_views = [views[0][i]] + [sample_view(timestamps[k], views[k], t, max_skew)
+                                       for k in range(1, len(traces))]
+        heel_data = fuse_views(frame_views, aligner)
+        if heel_data is not None:
+            for field in TRACE_FIELDS[1:]:
+                fused[field][i] = heel_data[field]
+    
+    return fused
\ No newline at end of file
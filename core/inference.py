@@ -0,0 +1,77 @@
+from time import perf_counter
+
+from .ea_wip import EAWIP
+from .step_detector import StepDetector
+
+
+class InferenceLogic:
+    def __init__(self, calib_results, v0, fps=30, refractory_period=0.3, history=60, metrics=None,
+                 lambda_weight=0.5, theta_o=0.25, window=2.0):
+        self.calib_results = calib_results
+        self.fps = fps
+        self.refractory_period = refractory_period
+        self.metrics = metrics
+        
+        self.ea_wip = EAWIP(fps=fps, lambda_weight=lambda_weight, theta_o=theta_o, window=window)
+        self.ea_wip.set_calibration_results(calib_results)
+        self.ea_wip.set_base_speed(v0)
+        
+        self.left_steps = StepDetector(
+            threshold=calib_results['threshold_left'],
+            min_interval=refractory_period,
+            history=history,
+            fps=fps
+        )
+        self.right_steps = StepDetector(
+            threshold=calib_results['threshold_right'],
+            min_interval=refractory_period,
+            history=history,
+            fps=fps
+        )
+        
+        self.current_speed = 0.0
+        self.h_left = 0.0
+        self.h_right = 0.0
+        self.f_left = 0.0
+        self.f_right = 0.0
+    
+    def set_fps(self, fps):
+        self.fps = fps
+        self.ea_wip.set_fps(fps)
+        self.left_steps.set_fps(fps)
+        self.right_steps.set_fps(fps)
+    
+    def detect_step_events(self, left_heel_height, right_heel_height, current_time):
+        self.left_steps.update(left_heel_height, current_time)
+        self.right_steps.update(right_heel_height, current_time)
+    
+    def compute_stride_amplitude(self):
+        return self.left_steps.amplitude, self.right_steps.amplitude
+    
+    def compute_cadence(self):
+        return self.left_steps.cadence, self.right_steps.cadence
+    
+    def process_frame(self, left_heel_height, right_heel_height, vis_left, vis_right, current_time):
+        start = perf_counter()
+        self.detect_step_events(left_heel_height, right_heel_height, current_time)
+        
+        self.h_left, self.h_right = self.compute_stride_amplitude()
+        self.f_left, self.f_right = self.compute_cadence()
+        steps_done = perf_counter()
+        
+        speed = self.ea_wip.update(self.h_left, self.h_right, self.f_left, self.f_right, vis_left, vis_right)
+        self.current_speed = speed
+        
+        if self.metrics is not None:
+            self.metrics.record('step_detection', steps_done - start)
+            self.metrics.record('ea_wip', perf_counter() - steps_done)
+        
+        return speed
+    
+    def process_missing(self):
+        self.current_speed = 0.0
+        return self.current_speed
+    
+    @property
+    def stride_frequency(self):
+        return max(self.f_left, self.f_right)
\ No newline at end of file
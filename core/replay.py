@@ -0,0 +1,160 @@
+import math
+import time
+
+import numpy as np
+
+from .calibration import CalibrationLogic
+from .inference import InferenceLogic
+
+
+TRACE_FIELDS = ('timestamp', 'left_height', 'right_height', 'left_visibility', 'right_visibility')
+# ground-truth speed from a treadmill or motion capture, when the trace has one
+OPTIONAL_FIELDS = ('reference_speed',)
+
+# tunable parameters of the replayed pipeline and their live defaults
+DEFAULT_PARAMS = {
+    'lambda_weight': 0.5,
+    'theta_o': 0.25,
+    'window': 2.0,
+    'refractory_period': 0.3,
+    'threshold_factor': 0.5
+}
+
+
+def load_heel_trace(path):
+    path = str(path)
+    
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            fields = TRACE_FIELDS + tuple(field for field in OPTIONAL_FIELDS if field in data.files)
+            return {field: np.asarray(data[field], dtype=np.float64) for field in fields}
+    
+    # empty cells (frames without a detected pose) are read back as NaN
+    data = np.genfromtxt(path, delimiter=',', names=True, dtype=np.float64)
+    missing = [field for field in TRACE_FIELDS if field not in data.dtype.names]
+    if missing:
+        raise ValueError(f"Heel trace {path} is missing columns: {', '.join(missing)}")
+    
+    fields = TRACE_FIELDS + tuple(field for field in OPTIONAL_FIELDS if field in data.dtype.names)
+    return {field: np.atleast_1d(data[field]) for field in fields}
+
+
+def save_heel_trace(path, trace):
+    path = str(path)
+    fields = TRACE_FIELDS + tuple(field for field in OPTIONAL_FIELDS if field in trace)
+    columns = [np.asarray(trace[field], dtype=np.float64) for field in fields]
+    
+    if path.endswith('.npz'):
+        np.savez(path, **dict(zip(fields, columns)))
+        return
+    
+    np.savetxt(path, np.column_stack(columns), delimiter=',',
+               header=','.join(fields), comments='', fmt='%.9g')
+
+
+def summarize_latencies(latencies_ns, elapsed):
+    if len(latencies_ns) == 0:
+        return {'frames': 0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0,
+                'max_ms': 0.0, 'fps': 0.0}
+    
+    latencies_ms = np.asarray(latencies_ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    
+    return {
+        'frames': len(latencies_ms),
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'p99_ms': p99,
+        'max_ms': latencies_ms.max(),
+        'fps': len(latencies_ms) / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def replay_trace(trace, v0, fps=30, calibration_duration=8.0, calib_results=None, params=None):
+    params = dict(DEFAULT_PARAMS, **(params or {}))
+    
+    def create_inference(calib_results):
+        return InferenceLogic(calib_results, v0, fps=fps, refractory_period=params['refractory_period'],
+                              lambda_weight=params['lambda_weight'], theta_o=params['theta_o'],
+                              window=params['window'])
+    
+    # plain Python floats, as delivered by MediaPipe in the live loop
+    timestamps = np.asarray(trace['timestamp'], dtype=np.float64).tolist()
+    left_heights = np.asarray(trace['left_height'], dtype=np.float64).tolist()
+    right_heights = np.asarray(trace['right_height'], dtype=np.float64).tolist()
+    left_vis = np.asarray(trace['left_visibility'], dtype=np.float64).tolist()
+    right_vis = np.asarray(trace['right_visibility'], dtype=np.float64).tolist()
+    num_frames = len(timestamps)
+    
+    calibration_logic = None
+    if calib_results is None:
+        calibration_logic = CalibrationLogic(fps=fps, calibration_duration=calibration_duration,
+                                             threshold_factor=params['threshold_factor'])
+    
+    inference_logic = None
+    if calib_results is not None:
+        inference_logic = create_inference(calib_results)
+    
+    calibration_latencies = np.zeros(num_frames, dtype=np.int64)
+    inference_latencies = np.zeros(num_frames, dtype=np.int64)
+    speeds = np.zeros(num_frames)
+    speed_times = np.zeros(num_frames)
+    # frames with a pose, and those where the occlusion check held the previous speed
+    tracked = np.zeros(num_frames, dtype=bool)
+    suppressed = np.zeros(num_frames, dtype=bool)
+    num_calibration = 0
+    num_inference = 0
+    
+    perf_counter_ns = time.perf_counter_ns
+    start = time.perf_counter()
+    
+    for i in range(num_frames):
+        has_pose = not math.isnan(left_heights[i])
+        frame_start = perf_counter_ns()
+        
+        if inference_logic is None:
+            if has_pose:
+                calibration_logic.process_frame(left_heights[i], right_heights[i], timestamps[i])
+                
+                if calibration_logic.is_calibration_complete():
+                    calib_results = calibration_logic.get_calibration_results()
+                    inference_logic = create_inference(calib_results)
+            
+            calibration_latencies[num_calibration] = perf_counter_ns() - frame_start
+            num_calibration += 1
+            continue
+        
+        if has_pose:
+            speed = inference_logic.process_frame(
+                left_heights[i], right_heights[i], left_vis[i], right_vis[i], timestamps[i]
+            )
+            tracked[num_inference] = True
+            suppressed[num_inference] = inference_logic.ea_wip.is_occluded
+        else:
+            speed = inference_logic.process_missing()
+        
+        inference_latencies[num_inference] = perf_counter_ns() - frame_start
+        speeds[num_inference] = speed
+        speed_times[num_inference] = timestamps[i]
+        num_inference += 1
+    
+    elapsed = time.perf_counter() - start
+    
+    if calib_results is None:
+        calib_results = calibration_logic.get_calibration_results()
+    
+    calibration_time = calibration_latencies[:num_calibration].sum() / 1e9
+    inference_time = inference_latencies[:num_inference].sum() / 1e9
+    
+    return {
+        'calib_results': calib_results,
+        'timestamps': speed_times[:num_inference],
+        'speeds': speeds[:num_inference],
+        'tracked': tracked[:num_inference],
+        'suppressed': suppressed[:num_inference],
+        'calibration': summarize_latencies(calibration_latencies[:num_calibration], calibration_time),
+        'inference': summarize_latencies(inference_latencies[:num_inference], inference_time),
+        'total_frames': num_frames,
+        'elapsed': elapsed,
+        'throughput_fps': num_frames / elapsed if elapsed > 0 else 0.0
+    }
\ No newline at end of file
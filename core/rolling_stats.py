@@ -0,0 +1,134 @@
+import math
+
+import numpy as np
+
+
+class RollingStats:
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError(f"RollingStats capacity must be positive, got {capacity}")
+        
+        self.capacity = capacity
+        self._buffer = [0.0] * capacity
+        self._head = 0
+        self._count = 0
+        
+        # Welford running mean / sum of squared deviations over the window
+        self._mean = 0.0
+        self._m2 = 0.0
+    
+    def append(self, value):
+        if self._count < self.capacity:
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+        else:
+            old_value = self._buffer[self._head]
+            old_mean = self._mean
+            delta = value - old_value
+            self._mean += delta / self.capacity
+            self._m2 += delta * (value - self._mean + old_value - old_mean)
+        
+        self._buffer[self._head] = value
+        self._head += 1
+        if self._head == self.capacity:
+            self._head = 0
+    
+    def mean(self):
+        if self._count == 0:
+            return 0.0
+        return self._mean
+    
+    def variance(self):
+        if self._count == 0:
+            return 0.0
+        return max(self._m2 / self._count, 0.0)
+    
+    def std(self):
+        return math.sqrt(self.variance())
+    
+    def is_full(self):
+        return self._count == self.capacity
+    
+    def values(self):
+        start = (self._head - self._count) % self.capacity
+        ordered = [self._buffer[(start + i) % self.capacity] for i in range(self._count)]
+        return np.array(ordered)
+    
+    def clear(self):
+        self._head = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+    
+    def resize(self, capacity):
+        if capacity <= 0:
+            raise ValueError(f"RollingStats capacity must be positive, got {capacity}")
+        if capacity == self.capacity:
+            return
+        
+        # keep the most recent samples that still fit
+        recent = [self[i] for i in range(max(self._count - capacity, 0), self._count)]
+        self.capacity = capacity
+        self._buffer = [0.0] * capacity
+        self.clear()
+        for value in recent:
+            self.append(value)
+    
+    def __len__(self):
+        return self._count
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError("RollingStats index out of range")
+        return self._buffer[(self._head - self._count + index) % self.capacity]
+
+
+class BlockMinima:
+    def __init__(self, block_size):
+        if block_size <= 0:
+            raise ValueError(f"BlockMinima block_size must be positive, got {block_size}")
+        
+        self.block_size = block_size
+        self.minima = []
+        self._minima_sum = 0.0
+        self._block_min = math.inf
+        self._block_count = 0
+        self._overall_min = math.inf
+        self._count = 0
+    
+    def append(self, value):
+        if value < self._block_min:
+            self._block_min = value
+        if value < self._overall_min:
+            self._overall_min = value
+        self._block_count += 1
+        self._count += 1
+        
+        # only a completed block changes the mean
+        if self._block_count == self.block_size:
+            self.minima.append(self._block_min)
+            self._minima_sum += self._block_min
+            self._block_min = math.inf
+            self._block_count = 0
+    
+    def mean(self):
+        if self.minima:
+            return self._minima_sum / len(self.minima)
+        if self._count > 0:
+            return self._overall_min
+        return 0.0
+    
+    def clear(self):
+        self.minima = []
+        self._minima_sum = 0.0
+        self._block_min = math.inf
+        self._block_count = 0
+        self._overall_min = math.inf
+        self._count = 0
+    
+    def __len__(self):
+        return self._count
\ No newline at end of file
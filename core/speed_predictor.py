@@ -0,0 +1,67 @@
+import threading
+
+
+class SpeedPredictor:
+    def __init__(self, process_noise=4.0, measurement_noise=0.0025, initial_accel_variance=1.0,
+                 reset_gap=1.0):
+        # constant-acceleration Kalman filter over [speed, acceleration]; process noise
+        # is the jerk spectral density, measurement noise the variance of an EA-WIP sample
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.initial_accel_variance = initial_accel_variance
+        self.reset_gap = reset_gap
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.speed = 0.0
+            self.accel = 0.0
+            self.time = None
+            self._p00 = self.measurement_noise
+            self._p01 = 0.0
+            self._p11 = self.initial_accel_variance
+    
+    def update(self, speed, t):
+        with self._lock:
+            if self.time is None or t - self.time > self.reset_gap:
+                # first sample or tracking was lost for a while: restart from the measurement
+                self.speed = speed
+                self.accel = 0.0
+                self._p00 = self.measurement_noise
+                self._p01 = 0.0
+                self._p11 = self.initial_accel_variance
+                self.time = t
+                return self.speed
+            
+            dt = max(t - self.time, 0.0)
+            q = self.process_noise
+            
+            # predict: x = F x, P = F P F' + Q
+            predicted = self.speed + self.accel * dt
+            p00 = self._p00 + 2.0 * dt * self._p01 + dt * dt * self._p11 + q * dt ** 3 / 3.0
+            p01 = self._p01 + dt * self._p11 + q * dt * dt / 2.0
+            p11 = self._p11 + q * dt
+            
+            # correct with the measured speed
+            s = p00 + self.measurement_noise
+            k0 = p00 / s
+            k1 = p01 / s
+            innovation = speed - predicted
+            self.speed = predicted + k0 * innovation
+            self.accel += k1 * innovation
+            self._p00 = (1.0 - k0) * p00
+            self._p01 = (1.0 - k0) * p01
+            self._p11 = p11 - k1 * p01
+            
+            self.time = max(t, self.time)
+            return self.speed
+    
+    def predict(self, t, max_horizon=0.1):
+        with self._lock:
+            if self.time is None:
+                return None, 0.0
+            
+            # past max_horizon the value is held rather than extrapolated further
+            horizon = min(max(t - self.time, 0.0), max_horizon)
+            return max(self.speed + self.accel * horizon, 0.0), horizon
\ No newline at end of file
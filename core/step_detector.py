@@ -0,0 +1,168 @@
+from collections import deque
+
+
+class StepDetector:
+    def __init__(self, threshold=0.0, min_interval=0.0, min_gap_samples=0,
+                 history=None, include_start=True, max_cadence=4.5, fps=None):
+        self.threshold = threshold
+        self.min_interval = min_interval
+        self.min_gap_samples = min_gap_samples
+        self.history = history
+        self.include_start = include_start
+        self.max_cadence = max_cadence
+        self.fps = fps
+        
+        self._segment_max = deque()
+        self._segment_min = deque()
+        self._stride_max = deque()
+        self._stride_min = deque()
+        
+        self.reset()
+    
+    def reset(self):
+        self.sample_index = -1
+        self.prev_height = None
+        
+        self.crossing_count = 0
+        self.last_crossing_time = None
+        self.last_crossing_index = None
+        
+        self.last_interval = None
+        self.interval_sum = 0.0
+        self.amplitude_sum = 0.0
+        self.stride_count = 0
+        
+        # monotonic (index, height) deques: the open segment since the last
+        # accepted crossing, and the last completed stride
+        self._segment_max.clear()
+        self._segment_min.clear()
+        self._stride_max.clear()
+        self._stride_min.clear()
+        self._stride_start = None
+        self._stride_end = None
+    
+    def set_fps(self, fps):
+        # history and min_gap_samples count samples, rescale them to keep their duration
+        if self.fps is not None and self.fps > 0 and fps != self.fps:
+            scale = fps / self.fps
+            if self.history is not None:
+                self.history = max(int(round(self.history * scale)), 1)
+            self.min_gap_samples = int(round(self.min_gap_samples * scale))
+        self.fps = fps
+    
+    def prime(self, height):
+        self._push(height)
+        self.prev_height = height
+    
+    def update(self, height, current_time):
+        self._push(height)
+        
+        stepped = False
+        if self.prev_height is not None and self.prev_height < self.threshold <= height:
+            stepped = self._register_crossing(height, current_time)
+        
+        self.prev_height = height
+        return stepped
+    
+    def _push(self, height):
+        self.sample_index += 1
+        
+        if self.last_crossing_index is None:
+            return
+        
+        index = self.sample_index
+        segment_max = self._segment_max
+        segment_min = self._segment_min
+        
+        while segment_max and segment_max[-1][1] <= height:
+            segment_max.pop()
+        segment_max.append((index, height))
+        
+        while segment_min and segment_min[-1][1] >= height:
+            segment_min.pop()
+        segment_min.append((index, height))
+        
+        if self.history is not None:
+            oldest = index - self.history + 1
+            while segment_max[0][0] < oldest:
+                segment_max.popleft()
+            while segment_min[0][0] < oldest:
+                segment_min.popleft()
+    
+    def _start_segment(self, height):
+        self._segment_max.clear()
+        self._segment_min.clear()
+        if self.include_start:
+            self._segment_max.append((self.sample_index, height))
+            self._segment_min.append((self.sample_index, height))
+    
+    def _register_crossing(self, height, current_time):
+        index = self.sample_index
+        
+        if self.last_crossing_time is None:
+            self.last_crossing_time = current_time
+            self.last_crossing_index = index
+            self.crossing_count += 1
+            self._start_segment(height)
+            return True
+        
+        interval = current_time - self.last_crossing_time
+        if interval < self.min_interval or index - self.last_crossing_index < self.min_gap_samples:
+            return False
+        
+        # the open segment becomes the completed stride; reuse the old stride deques
+        self._stride_max, self._segment_max = self._segment_max, self._stride_max
+        self._stride_min, self._segment_min = self._segment_min, self._stride_min
+        self._stride_start = self.last_crossing_index if self.include_start else self.last_crossing_index + 1
+        self._stride_end = index
+        self._start_segment(height)
+        
+        self.last_interval = interval
+        self.interval_sum += interval
+        self.amplitude_sum += self.amplitude
+        self.stride_count += 1
+        
+        self.last_crossing_time = current_time
+        self.last_crossing_index = index
+        self.crossing_count += 1
+        return True
+    
+    @property
+    def amplitude(self):
+        if self._stride_end is None:
+            return 0.0
+        
+        lower = self._stride_start
+        if self.history is not None:
+            lower = max(lower, self.sample_index - self.history + 1)
+        if self._stride_end <= lower:
+            return 0.0
+        
+        stride_max = self._stride_max
+        stride_min = self._stride_min
+        while stride_max[0][0] < lower:
+            stride_max.popleft()
+        while stride_min[0][0] < lower:
+            stride_min.popleft()
+        
+        return stride_max[0][1] - stride_min[0][1]
+    
+    @property
+    def cadence(self):
+        if self.last_interval is None:
+            return 0.0
+        if self.last_interval <= 0:
+            return 0.0
+        return min(1.0 / self.last_interval, self.max_cadence)
+    
+    @property
+    def mean_interval(self):
+        if self.stride_count == 0:
+            return None
+        return self.interval_sum / self.stride_count
+    
+    @property
+    def mean_amplitude(self):
+        if self.stride_count == 0:
+            return None
+        return self.amplitude_sum / self.stride_count
\ No newline at end of file
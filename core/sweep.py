@@ -0,0 +1,66 @@
+import itertools
+import math
+
+import numpy as np
+
+from .replay import DEFAULT_PARAMS, replay_trace
+
+
+PARAM_NAMES = tuple(DEFAULT_PARAMS)
+SWEEP_METRICS = ('inference_frames', 'mean_speed', 'speed_mae', 'speed_rmse', 'speed_bias',
+                 'suppression_rate', 'jitter')
+
+
+def expand_grid(grid):
+    # {'theta_o': [0.2, 0.3], 'window': [1.5, 2.0]} -> one full parameter set per combination,
+    # with the live defaults for everything the grid leaves out
+    unknown = [name for name in grid if name not in DEFAULT_PARAMS]
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(unknown)} "
+                         f"(expected {', '.join(PARAM_NAMES)})")
+    
+    names = [name for name in PARAM_NAMES if name in grid]
+    combinations = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(DEFAULT_PARAMS)
+        params.update((name, float(value)) for name, value in zip(names, values))
+        combinations.append(params)
+    return combinations
+
+
+def reference_speeds(trace, timestamps, reference_speed=None):
+    if reference_speed is not None:
+        return np.full(len(timestamps), float(reference_speed))
+    if 'reference_speed' not in trace:
+        return None
+    
+    reference = np.asarray(trace['reference_speed'], dtype=np.float64)
+    known = ~np.isnan(reference)
+    if not known.any():
+        return None
+    trace_times = np.asarray(trace['timestamp'], dtype=np.float64)
+    return np.interp(timestamps, trace_times[known], reference[known])
+
+
+def evaluate_trace(trace, params, v0, fps=30, calibration_duration=8.0, reference_speed=None):
+    result = replay_trace(trace, v0, fps=fps, calibration_duration=calibration_duration, params=params)
+    speeds = result['speeds']
+    
+    metrics = dict.fromkeys(SWEEP_METRICS, math.nan)
+    metrics['inference_frames'] = len(speeds)
+    if len(speeds) == 0:
+        return metrics
+    
+    metrics['mean_speed'] = float(speeds.mean())
+    metrics['suppression_rate'] = float(result['suppressed'].mean())
+    # frame-to-frame change of the speed that is sent out
+    metrics['jitter'] = float(np.sqrt(np.mean(np.diff(speeds) ** 2))) if len(speeds) > 1 else 0.0
+    
+    reference = reference_speeds(trace, result['timestamps'], reference_speed)
+    if reference is not None:
+        error = speeds - reference
+        metrics['speed_mae'] = float(np.abs(error).mean())
+        metrics['speed_rmse'] = float(np.sqrt(np.mean(error ** 2)))
+        metrics['speed_bias'] = float(error.mean())
+    
+    return metrics
\ No newline at end of file
@@ -0,0 +1,375 @@
+import logging
+import time
+
+from core.calibration import CalibrationLogic, CalibrationDriftCheck
+from core.inference import InferenceLogic
+from vision.preprocessing import FramePreprocessor
+from vision.pipeline import InferencePipeline
+from vision.fusion import MultiViewSource
+from vision.quality import AdaptiveQualityController, build_quality_levels
+from communication.udp_client import UDPReceiver
+from communication.async_transport import create_speed_sender
+from utils.config import Config
+from utils.recording import SessionRecorder, view_recording_path
+from utils.metrics import Metrics, MetricsExporter, format_latency_report
+from utils.profiles import ProfileStore, camera_metadata
+from utils.startup import WarmStartup
+
+
+logger = logging.getLogger("ea_wip.headless")
+
+CALIBRATE_COMMANDS = ('calibrate', 'start_calibration')
+
+
+class HeadlessService:
+    def __init__(self, args):
+        self.args = args
+        self.udp_config = Config.get_udp_config(
+            ip=args.udp_ip,
+            port=args.udp_port,
+            protocol=args.udp_protocol,
+            batch_size=args.udp_batch_size,
+            fanout_port=args.fanout_port,
+            output_rate=args.output_rate,
+            max_prediction=args.max_prediction
+        )
+        self.camera_config = Config.get_camera_config(
+            camera_id=args.camera_id,
+            width=args.camera_width,
+            height=args.camera_height,
+            fourcc=args.camera_fourcc
+        )
+        self.v0 = args.base_speed
+        self.fps = Config.DEFAULT_FPS
+        self.status_interval = 5.0
+        
+        self.camera_stream = None
+        self.pose_estimator = None
+        self.recorder = None
+        self.receiver = None
+        self.udp_client = None
+        self.pipeline = None
+        self.calib_results = None
+        self.extra_startups = []
+        self.extra_recorders = []
+        self.view_source = None
+        
+        self.metrics = Metrics()
+        self.metrics_exporter = None
+        
+        self.profile_store = None
+        if args.profile:
+            self.profile_store = ProfileStore(args.profile_dir, max_age_days=args.profile_max_age)
+        self.started = time.monotonic()
+        self.first_speed_time = None
+    
+    def start(self):
+        startup = WarmStartup(
+            self.camera_config,
+            roi_mode=self.args.roi,
+            model_complexity=self.args.model_complexity,
+            metrics=self.metrics,
+            started=self.started
+        ).start()
+        # further cameras for multi-camera fusion come up at the same time, each with its own pose model
+        self.extra_startups = [
+            WarmStartup(
+                dict(self.camera_config, camera_id=camera_id),
+                roi_mode=self.args.roi,
+                model_complexity=self.args.model_complexity,
+                started=self.started
+            ).start()
+            for camera_id in self.args.extra_cameras or ()
+        ]
+        startups = [startup] + self.extra_startups
+        for pending in startups:
+            pending.wait()
+        failed = [pending for pending in startups if pending.error is not None]
+        if failed:
+            logger.error("Camera initialization failed: %s", failed[0].error)
+            for pending in startups:
+                pending.close()
+            return 1
+        
+        self.camera_stream = startup.camera_stream
+        self.pose_estimator = startup.pose_estimator
+        for pending in startups:
+            logger.info("Camera %d: %dx%d @ %.1f fps", pending.camera_config['camera_id'],
+                        pending.camera_stream.width, pending.camera_stream.height, pending.camera_stream.fps)
+        logger.info("%s", startup.format_report())
+        
+        try:
+            self.udp_client = create_speed_sender(self.udp_config)
+        except Exception as e:
+            logger.error("UDP initialization failed: %s", e)
+            for pending in startups:
+                pending.close()
+            return 1
+        
+        if self.args.record:
+            self.recorder = SessionRecorder(self.args.record)
+            self.extra_recorders = [SessionRecorder(view_recording_path(self.args.record, view))
+                                    for view in range(1, len(startups))]
+        
+        if self.extra_startups:
+            # every camera records its own view; fusion happens when the frames are consumed
+            self.view_source = MultiViewSource(
+                [pending.camera_stream for pending in startups],
+                [pending.pose_estimator for pending in startups],
+                max_skew=self.args.fusion_max_skew,
+                max_wait=Config.DEFAULT_FUSION_MAX_WAIT,
+                recorders=[self.recorder] + self.extra_recorders if self.recorder is not None else None,
+                metrics=self.metrics
+            )
+            if self.args.adaptive_quality:
+                logger.warning("Adaptive quality is not supported with extra cameras, ignoring it")
+        
+        self.metrics_exporter = MetricsExporter(
+            self.metrics,
+            path=self.args.metrics_file,
+            udp_address=self.args.metrics_udp,
+            http_port=self.args.metrics_http_port
+        ).start()
+        if self.metrics_exporter.http_port is not None:
+            logger.info("Serving metrics on http://127.0.0.1:%d/metrics", self.metrics_exporter.http_port)
+        
+        if self.args.calibration_trigger == 'remote':
+            self.receiver = UDPReceiver(port=self.args.control_port)
+        
+        try:
+            self.calib_results = self.load_profile()
+            from_profile = self.calib_results is not None
+            if not from_profile:
+                self.wait_for_calibration_trigger()
+            if self.view_source is not None:
+                self.view_source.start()
+            
+            recalibrate = True
+            while recalibrate:
+                if not from_profile:
+                    self.calib_results = self.run_calibration()
+                recalibrate = self.run_inference(from_profile)
+                from_profile = False
+        except KeyboardInterrupt:
+            logger.info("Interrupted, shutting down")
+        except ConnectionError as e:
+            logger.error("%s", e)
+            return 1
+        finally:
+            self.stop()
+        
+        return 0
+    
+    def load_profile(self):
+        if self.profile_store is None:
+            return None
+        if self.args.recalibrate:
+            logger.info("Recalibrating profile '%s'", self.args.profile)
+            return None
+        
+        camera = camera_metadata(self.camera_config['camera_id'], self.camera_stream)
+        calib_results, problem = self.profile_store.load_valid(self.args.profile, camera)
+        if calib_results is None:
+            logger.info("Profile '%s' not used: %s", self.args.profile, problem)
+            return None
+        
+        logger.info("Loaded calibration profile '%s', skipping calibration", self.args.profile)
+        return calib_results
+    
+    def save_profile(self, calibration_logic, calib_results):
+        if self.profile_store is None:
+            return
+        if not calibration_logic.has_measured_results():
+            logger.warning("Calibration fell back to default values, profile not saved")
+            return
+        
+        camera = camera_metadata(self.camera_config['camera_id'], self.camera_stream)
+        try:
+            path = self.profile_store.save(self.args.profile, calib_results, camera)
+            logger.info("Saved calibration profile to %s", path)
+        except OSError as e:
+            logger.error("Could not save calibration profile: %s", e)
+    
+    def wait_for_calibration_trigger(self):
+        if self.receiver is None:
+            delay = self.args.calibration_delay
+            logger.info("Calibration starts in %.1f s, walk in place in front of the camera", delay)
+            time.sleep(delay)
+            return
+        
+        logger.info("Waiting for a calibration command on UDP port %d", self.args.control_port)
+        while True:
+            message = self.receiver.receive()
+            if message is not None and message.strip().lower() in CALIBRATE_COMMANDS:
+                logger.info("Calibration triggered remotely")
+                return
+    
+    def read_pose(self, preprocessor):
+        if self.view_source is not None:
+            sample = self.view_source.read(timeout=1.0)
+            if sample is None:
+                if self.view_source.closed:
+                    raise ConnectionError("Camera stream closed during calibration")
+                return None
+            return sample['timestamp'], sample['heel_data']
+        
+        frame = self.camera_stream.read_frame(timeout=1.0)
+        if frame is None:
+            if self.camera_stream.closed:
+                raise ConnectionError("Camera stream closed during calibration")
+            return None
+        
+        image_rgb = preprocessor.to_rgb(frame.image)
+        results = self.pose_estimator.process_rgb(image_rgb)
+        heel_data = self.pose_estimator.extract_heel_data(results)
+        
+        if self.recorder is not None:
+            self.recorder.append(
+                frame.timestamp,
+                landmarks=self.pose_estimator.extract_landmark_array(results),
+                heel_data=heel_data,
+                frame_index=frame.sequence
+            )
+        return frame.timestamp, heel_data
+    
+    def run_calibration(self):
+        # adaptive quality may have left the model degraded in a previous inference run
+        if self.view_source is None:
+            self.pose_estimator.set_model_complexity(self.args.model_complexity)
+        
+        calibration_logic = CalibrationLogic(
+            fps=self.fps,
+            calibration_duration=Config.DEFAULT_CALIBRATION_DURATION
+        )
+        preprocessor = FramePreprocessor(target_size=(640, 480), pool_size=1)
+        logger.info("Calibrating (%d frames)", calibration_logic.max_frames)
+        last_status = time.monotonic()
+        
+        while not calibration_logic.is_calibration_complete():
+            pose = self.read_pose(preprocessor)
+            if pose is None:
+                continue
+            
+            timestamp, heel_data = pose
+            if heel_data:
+                calibration_logic.process_frame(
+                    heel_data['left_height'],
+                    heel_data['right_height'],
+                    timestamp
+                )
+            
+            now = time.monotonic()
+            if now - last_status >= 1.0:
+                logger.info("Calibrating... %d/%d frames",
+                            calibration_logic.frame_count, calibration_logic.max_frames)
+                last_status = now
+        
+        results = calibration_logic.get_calibration_results()
+        logger.info(
+            "Calibration complete: mu_h %.4f/%.4f, T %.4f/%.4f, h_c %.4f/%.4f, f_c %.2f/%.2f Hz",
+            results['mu_h_left'], results['mu_h_right'],
+            results['threshold_left'], results['threshold_right'],
+            results['h_c_left'], results['h_c_right'],
+            results['f_c_left'], results['f_c_right']
+        )
+        self.save_profile(calibration_logic, results)
+        return results
+    
+    def run_inference(self, from_profile=False):
+        # a stored profile gets a short check against the user in front of the camera now
+        drift_check = CalibrationDriftCheck(self.calib_results, fps=self.fps) if from_profile else None
+        quality_controller = None
+        if self.args.adaptive_quality and self.view_source is None:
+            quality_controller = AdaptiveQualityController(
+                target_fps=self.fps,
+                levels=build_quality_levels(model_complexity=self.args.model_complexity)
+            )
+        
+        inference_logic = InferenceLogic(self.calib_results, self.v0, fps=self.fps, refractory_period=0.3,
+                                         metrics=self.metrics)
+        self.pipeline = InferencePipeline(
+            camera_stream=self.camera_stream,
+            pose_estimator=self.pose_estimator,
+            inference_logic=inference_logic,
+            udp_client=self.udp_client,
+            recorder=self.recorder if self.view_source is None else None,
+            metrics=self.metrics,
+            quality_controller=quality_controller,
+            drift_check=drift_check,
+            view_source=self.view_source
+        )
+        self.pipeline.start()
+        logger.info("Tracking, sending speed to %s:%d", self.udp_config['ip'], self.udp_config['port'])
+        if self.udp_config['fanout_port'] is not None:
+            logger.info("Accepting subscribers on UDP port %d", self.udp_config['fanout_port'])
+        
+        last_frames = 0
+        last_status = time.monotonic()
+        
+        while self.pipeline.thread.is_alive():
+            result = self.pipeline.results.get(timeout=self.status_interval)
+            
+            if self.first_speed_time is None and result is not None and result['heel_data'] is not None:
+                self.first_speed_time = time.monotonic() - self.started
+                logger.info("First speed sent %.2f s after startup", self.first_speed_time)
+            
+            if drift_check is not None and drift_check.drifted:
+                logger.info("Calibration profile drifted (%.1f sigma), recalibrating", drift_check.drift)
+                self.pipeline.stop()
+                return True
+            
+            if self.receiver is not None:
+                messages = self.receiver.receive_all()
+                if any(message.strip().lower() in CALIBRATE_COMMANDS for message in messages):
+                    logger.info("Recalibration requested")
+                    self.pipeline.stop()
+                    return True
+            
+            now = time.monotonic()
+            if now - last_status >= self.status_interval:
+                frames = self.pipeline.frame_count
+                speed = result['speed'] if result is not None else inference_logic.current_speed
+                frame_total = self.metrics.histogram('frame_total')
+                logger.info("%.1f fps, speed %.2f m/s, %d camera frames dropped, frame p50/p95 %.1f/%.1f ms",
+                            (frames - last_frames) / (now - last_status), speed,
+                            self.camera_stream.dropped_frames,
+                            frame_total.percentile(50) * 1000, frame_total.percentile(95) * 1000)
+                if self.args.latency_mode:
+                    logger.info("Latency:\n%s", format_latency_report(
+                        self.metrics, camera_dropped=self.camera_stream.dropped_frames))
+                last_frames = frames
+                last_status = now
+        
+        logger.warning("Inference pipeline stopped (camera closed)")
+        return False
+    
+    def stop(self):
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            ea_wip = self.pipeline.inference_logic.ea_wip
+            if ea_wip.frame_count:
+                logger.info("Occlusion suppression held the speed on %d of %d tracked frames (%.1f%%)",
+                            ea_wip.suppressed_frames, ea_wip.frame_count,
+                            100.0 * ea_wip.suppressed_frames / ea_wip.frame_count)
+        if self.view_source is not None:
+            self.view_source.stop()
+            logger.info("%s", self.view_source.format_report())
+        if self.camera_stream is not None:
+            self.camera_stream.stop()
+        for extra in self.extra_startups:
+            extra.close()
+        for recorder in self.extra_recorders:
+            recorder.close()
+        if self.udp_client is not None:
+            self.udp_client.close()
+        if self.receiver is not None:
+            self.receiver.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        if self.metrics.stages:
+            logger.info("Stage latencies:\n%s", self.metrics.format_report())
+        if self.args.latency_mode:
+            camera_dropped = self.camera_stream.dropped_frames if self.camera_stream is not None else 0
+            logger.info("Latency:\n%s", format_latency_report(self.metrics, camera_dropped=camera_dropped))
\ No newline at end of file
@@ -1,42 +1,150 @@
-import tkinter as tk
-from tkinter import messagebox
 import argparse
+import logging
+import time
 
-from vision.pose_estimator import CameraStream
-from ui.calibration_window import CalibrationWindow
-from ui.inference_window import InferenceWindow
 from utils.config import Config
 
 
 class Application:
     def __init__(self, args):
         self.args = args
+        self.started = time.monotonic()
+        self.startup = None
         self.camera_stream = None
+        self.pose_estimator = None
         self.calib_results = None
+        self.recorder = None
+        self.metrics = None
+        self.metrics_exporter = None
+        self.calibration_window = None
+        self.profile_store = None
+        
+        if args.profile:
+            from utils.profiles import ProfileStore
+            self.profile_store = ProfileStore(args.profile_dir, max_age_days=args.profile_max_age)
         
         self.udp_config = Config.get_udp_config(
             ip=args.udp_ip,
-            port=args.udp_port
+            port=args.udp_port,
+            protocol=args.udp_protocol,
+            batch_size=args.udp_batch_size,
+            fanout_port=args.fanout_port,
+            output_rate=args.output_rate,
+            max_prediction=args.max_prediction
         )
         
         self.camera_config = Config.get_camera_config(
-            camera_id=args.camera_id
+            camera_id=args.camera_id,
+            width=args.camera_width,
+            height=args.camera_height,
+            fourcc=args.camera_fourcc
         )
         
         self.v0 = args.base_speed
     
     def start(self):
+        from utils.recording import SessionRecorder
+        from utils.metrics import Metrics, MetricsExporter, format_latency_report
+        from utils.startup import WarmStartup
+        
+        self.metrics = Metrics()
+        
+        # camera, pose model and the heavy imports come up in the background while the start window shows
+        self.startup = WarmStartup(
+            self.camera_config,
+            roi_mode=self.args.roi,
+            model_complexity=self.args.model_complexity,
+            preload_modules=('ui.calibration_window', 'ui.inference_window'),
+            metrics=self.metrics,
+            started=self.started
+        ).start()
+        
+        if self.args.record:
+            self.recorder = SessionRecorder(self.args.record)
+        
+        self.metrics_exporter = MetricsExporter(
+            self.metrics,
+            path=self.args.metrics_file,
+            udp_address=self.args.metrics_udp,
+            http_port=self.args.metrics_http_port
+        ).start()
+        
         try:
-            self.camera_stream = CameraStream(
-                camera_id=self.camera_config['camera_id']
-            )
-        except Exception as e:
-            messagebox.showerror("Error", f"Camera initialization failed: {e}")
+            self.show_start_window()
+        finally:
+            self.startup.wait()
+            self.startup.close()
+            self.metrics_exporter.stop()
+            if self.metrics.stages:
+                print(self.metrics.format_report())
+            if self.args.latency_mode:
+                camera_dropped = self.camera_stream.dropped_frames if self.camera_stream is not None else 0
+                print(format_latency_report(self.metrics, camera_dropped=camera_dropped))
+    
+    def on_startup_ready(self, root, start_button, status_label):
+        from tkinter import messagebox
+        
+        if not self.startup.wait(0):
+            root.after(50, self.on_startup_ready, root, start_button, status_label)
+            return
+        
+        if self.startup.error is not None:
+            messagebox.showerror("Error", f"Camera initialization failed: {self.startup.error}")
+            root.destroy()
+            return
+        
+        self.camera_stream = self.startup.camera_stream
+        self.pose_estimator = self.startup.pose_estimator
+        print(f"Camera {self.camera_config['camera_id']}: {self.camera_stream.width}x{self.camera_stream.height} "
+              f"@ {self.camera_stream.fps:.1f} fps")
+        print(self.startup.format_report())
+        
+        if self.load_profile():
+            root.destroy()
+            self.start_inference(from_profile=True)
+            return
+        
+        status_label.config(text="Camera ready")
+        start_button.config(state='normal')
+    
+    def load_profile(self):
+        from utils.profiles import camera_metadata
+        
+        if self.profile_store is None:
+            return False
+        if self.args.recalibrate:
+            print(f"Recalibrating profile '{self.args.profile}'")
+            return False
+        
+        camera = camera_metadata(self.camera_config['camera_id'], self.camera_stream)
+        calib_results, problem = self.profile_store.load_valid(self.args.profile, camera)
+        if calib_results is None:
+            print(f"Profile '{self.args.profile}' not used: {problem}")
+            return False
+        
+        print(f"Loaded calibration profile '{self.args.profile}', skipping calibration")
+        self.calib_results = calib_results
+        return True
+    
+    def save_profile(self, calib_results):
+        from utils.profiles import camera_metadata
+        
+        if self.profile_store is None:
+            return
+        if not self.calibration_window.calibration_logic.has_measured_results():
+            print("Calibration fell back to default values, profile not saved")
             return
         
-        self.show_start_window()
+        camera = camera_metadata(self.camera_config['camera_id'], self.camera_stream)
+        try:
+            path = self.profile_store.save(self.args.profile, calib_results, camera)
+            print(f"Saved calibration profile to {path}")
+        except OSError as e:
+            print(f"Profile Save Error: {e}")
     
     def show_start_window(self):
+        import tkinter as tk
+        
         root = tk.Tk()
         root.title("EA-WIP")
         root.geometry("400x300")
@@ -55,15 +163,23 @@ class Application:
         )
         info_label.pack(pady=10)
         
+        status_label = tk.Label(
+            root,
+            text="Starting camera...",
+            font=('Arial', 9)
+        )
+        status_label.pack()
+        
         start_button = tk.Button(
             root,
             text="Start Calibration",
             command=lambda: self.start_calibration(root),
             font=('Arial', 12),
             width=20,
-            height=2
+            height=2,
+            state='disabled'
         )
-        start_button.pack(pady=20)
+        start_button.pack(pady=10)
         
         exit_button = tk.Button(
             root,
@@ -75,27 +191,54 @@ class Application:
         )
         exit_button.pack(pady=10)
         
+        root.after(50, self.on_startup_ready, root, start_button, status_label)
         root.mainloop()
     
-    def start_calibration(self, parent_window):
-        parent_window.destroy()
+    def start_calibration(self, parent_window=None):
+        from ui.calibration_window import CalibrationWindow
+        
+        if parent_window is not None:
+            parent_window.destroy()
         
-        calib_window = CalibrationWindow(
+        self.calibration_window = CalibrationWindow(
             camera_stream=self.camera_stream,
-            on_complete_callback=self.on_calibration_complete
+            on_complete_callback=self.on_calibration_complete,
+            recorder=self.recorder,
+            pose_estimator=self.pose_estimator,
+            roi_mode=self.args.roi,
+            preview_fps=self.args.preview_fps,
+            preview_scale=self.args.preview_scale,
+            model_complexity=self.args.model_complexity
         )
-        calib_window.mainloop()
+        self.calibration_window.mainloop()
     
     def on_calibration_complete(self, calib_results):
         self.calib_results = calib_results
+        self.save_profile(calib_results)
         self.start_inference()
     
-    def start_inference(self):
+    def start_inference(self, from_profile=False):
+        from core.calibration import CalibrationDriftCheck
+        from ui.inference_window import InferenceWindow
+        
+        # a stored profile gets a short check against the user in front of the camera now
+        drift_check = CalibrationDriftCheck(self.calib_results) if from_profile else None
+        
         inference_window = InferenceWindow(
             camera_stream=self.camera_stream,
             calib_results=self.calib_results,
             v0=self.v0,
-            udp_config=self.udp_config
+            udp_config=self.udp_config,
+            recorder=self.recorder,
+            pose_estimator=self.pose_estimator,
+            roi_mode=self.args.roi,
+            preview_fps=self.args.preview_fps,
+            preview_scale=self.args.preview_scale,
+            metrics=self.metrics,
+            model_complexity=self.args.model_complexity,
+            adaptive_quality=self.args.adaptive_quality,
+            drift_check=drift_check,
+            on_recalibrate=self.start_calibration
         )
         inference_window.mainloop()
 
@@ -119,6 +262,68 @@ def parse_arguments():
         help=f'UDP target port (default: {Config.DEFAULT_UDP_PORT})'
     )
     
+    parser.add_argument(
+        '--udp-protocol',
+        choices=['text', 'binary'],
+        default=None,
+        help=f'Speed packet format (default: {Config.DEFAULT_UDP_PROTOCOL})'
+    )
+    
+    parser.add_argument(
+        '--udp-batch-size',
+        type=int,
+        default=None,
+        help=f'Binary protocol: samples coalesced per datagram (default: {Config.DEFAULT_UDP_BATCH_SIZE})'
+    )
+    
+    parser.add_argument(
+        '--fanout-port',
+        type=int,
+        default=None,
+        help='Also send speed to every client that subscribes with UDP heartbeats on this port'
+    )
+    
+    parser.add_argument(
+        '--output-rate',
+        type=float,
+        default=None,
+        help='Send a predicted speed at this rate (Hz) independent of the camera, e.g. 90 for the headset refresh rate'
+    )
+    
+    parser.add_argument(
+        '--max-prediction',
+        type=float,
+        default=None,
+        help=f'Output rate: furthest the speed is extrapolated past the last frame, in seconds (default: {Config.DEFAULT_MAX_PREDICTION})'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        type=str,
+        default=None,
+        help='Calibration profile name: reuse its stored calibration if still valid, otherwise calibrate and save it'
+    )
+    
+    parser.add_argument(
+        '--profile-dir',
+        type=str,
+        default=Config.DEFAULT_PROFILE_DIR,
+        help=f'Directory for calibration profiles (default: {Config.DEFAULT_PROFILE_DIR})'
+    )
+    
+    parser.add_argument(
+        '--profile-max-age',
+        type=float,
+        default=Config.DEFAULT_PROFILE_MAX_AGE_DAYS,
+        help=f'Recalibrate when the profile is older than this many days (default: {Config.DEFAULT_PROFILE_MAX_AGE_DAYS:g})'
+    )
+    
+    parser.add_argument(
+        '--recalibrate',
+        action='store_true',
+        help='Ignore the stored profile, calibrate and overwrite it'
+    )
+    
     parser.add_argument(
         '--camera-id',
         type=int,
@@ -126,6 +331,44 @@ def parse_arguments():
         help=f'Camera device ID (default: {Config.DEFAULT_CAMERA_ID})'
     )
     
+    parser.add_argument(
+        '--camera-width',
+        type=int,
+        default=None,
+        help=f'Requested camera frame width (default: {Config.DEFAULT_CAMERA_WIDTH})'
+    )
+    
+    parser.add_argument(
+        '--camera-height',
+        type=int,
+        default=None,
+        help=f'Requested camera frame height (default: {Config.DEFAULT_CAMERA_HEIGHT})'
+    )
+    
+    parser.add_argument(
+        '--camera-fourcc',
+        type=str,
+        default=None,
+        help='Requested camera pixel format, e.g. MJPG (default: driver default)'
+    )
+    
+    parser.add_argument(
+        '--extra-cameras',
+        type=int,
+        nargs='+',
+        default=None,
+        help='Headless mode: IDs of further cameras watching the same user from other angles; '
+             'heel data of all cameras is fused per frame'
+    )
+    
+    parser.add_argument(
+        '--fusion-max-skew',
+        type=float,
+        default=Config.DEFAULT_FUSION_MAX_SKEW,
+        help=f'Extra cameras: largest capture time difference to the first camera\'s frame, in seconds '
+             f'(default: {Config.DEFAULT_FUSION_MAX_SKEW})'
+    )
+    
     parser.add_argument(
         '--base-speed',
         type=float,
@@ -133,15 +376,152 @@ def parse_arguments():
         help=f'Base walking speed v0 in m/s (default: {Config.DEFAULT_BASE_SPEED})'
     )
     
+    parser.add_argument(
+        '--record',
+        type=str,
+        default=None,
+        help='Record timestamps, pose landmarks and heel data to this session file (.ewrec)'
+    )
+    
+    parser.add_argument(
+        '--roi',
+        action='store_true',
+        help='Run pose inference on a tracked lower-body crop instead of the full frame'
+    )
+    
+    parser.add_argument(
+        '--model-complexity',
+        type=int,
+        choices=[0, 1, 2],
+        default=Config.MEDIAPIPE_MODEL_COMPLEXITY,
+        help=f'MediaPipe pose model complexity (default: {Config.MEDIAPIPE_MODEL_COMPLEXITY})'
+    )
+    
+    parser.add_argument(
+        '--adaptive-quality',
+        action='store_true',
+        help='Lower model complexity/input resolution when frames exceed the budget, and keep EA-WIP windows at the measured frame rate'
+    )
+    
+    parser.add_argument(
+        '--preview-fps',
+        type=float,
+        default=Config.DEFAULT_PREVIEW_FPS,
+        help=f'Maximum camera preview refresh rate, independent of tracking (default: {Config.DEFAULT_PREVIEW_FPS})'
+    )
+    
+    parser.add_argument(
+        '--preview-scale',
+        type=float,
+        default=Config.DEFAULT_PREVIEW_SCALE,
+        help=f'Camera preview size relative to 640x480 (default: {Config.DEFAULT_PREVIEW_SCALE})'
+    )
+    
+    parser.add_argument(
+        '--metrics-file',
+        type=str,
+        default=None,
+        help='Write per-stage latency metrics (JSON) to this file every 5 s and on exit'
+    )
+    
+    parser.add_argument(
+        '--metrics-udp',
+        type=str,
+        default=None,
+        help='Send per-stage latency metrics (JSON) to this HOST:PORT every 5 s'
+    )
+    
+    parser.add_argument(
+        '--metrics-http-port',
+        type=int,
+        default=None,
+        help='Serve per-stage latency metrics as JSON on http://127.0.0.1:PORT/metrics'
+    )
+    
+    parser.add_argument(
+        '--latency-mode',
+        action='store_true',
+        help='Report capture-to-packet latency (queueing vs processing, dropped frames); implies --udp-protocol binary'
+    )
+    
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help='Run calibration and inference without any GUI, logging status instead'
+    )
+    
+    parser.add_argument(
+        '--calibration-trigger',
+        choices=['timed', 'remote'],
+        default='timed',
+        help='Headless mode: start calibration after a delay or on a UDP "calibrate" command (default: timed)'
+    )
+    
+    parser.add_argument(
+        '--calibration-delay',
+        type=float,
+        default=5.0,
+        help='Headless mode: seconds to wait before a timed calibration (default: 5.0)'
+    )
+    
+    parser.add_argument(
+        '--control-port',
+        type=int,
+        default=Config.DEFAULT_UDP_RECV_PORT,
+        help=f'Headless mode: UDP port for remote commands (default: {Config.DEFAULT_UDP_RECV_PORT})'
+    )
+    
+    parser.add_argument(
+        '--stations',
+        type=str,
+        default=None,
+        help='Serve several WIP stations from one process: JSON file listing each station\'s camera, '
+             'UDP target and options; other arguments are the stations\' defaults'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Stations mode: pose inference threads shared by all stations (default: CPU count)'
+    )
+    
     return parser.parse_args()
 
 
 def main():
     args = parse_arguments()
     
+    if args.latency_mode and args.udp_protocol != 'binary':
+        # only binary packets carry the capture timestamp a receiver needs to check packet age
+        print("Latency mode: switching to --udp-protocol binary")
+        args.udp_protocol = 'binary'
+    
+    if args.extra_cameras and (not args.headless or args.stations):
+        print("Multi-camera fusion is only available with --headless, without --stations")
+        return 1
+    
+    if args.stations:
+        from server import SessionServer
+        
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+        )
+        return SessionServer(args).start()
+    
+    if args.headless:
+        from headless import HeadlessService
+        
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+        )
+        return HeadlessService(args).start()
+    
     app = Application(args)
     app.start()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,103 @@
+import argparse
+
+import numpy as np
+
+from core.replay import load_heel_trace, replay_trace
+from utils.config import Config
+from utils.recording import RECORDING_SUFFIX, open_session, session_to_trace
+
+
+def print_latency_report(name, stats):
+    print(f"{name}:")
+    print(f"  Frames: {stats['frames']}")
+    print(f"  Latency p50/p95/p99: {stats['p50_ms']:.4f} / {stats['p95_ms']:.4f} / {stats['p99_ms']:.4f} ms")
+    print(f"  Latency max: {stats['max_ms']:.4f} ms")
+    print(f"  Throughput: {stats['fps']:.0f} frames/s")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='EA-WIP headless replay of recorded heel traces'
+    )
+    
+    parser.add_argument(
+        'trace',
+        type=str,
+        help='Session recording (.ewrec) or heel trace (.csv or .npz with columns '
+             'timestamp, left_height, right_height, left_visibility, right_visibility)'
+    )
+    
+    parser.add_argument(
+        '--base-speed',
+        type=float,
+        default=Config.DEFAULT_BASE_SPEED,
+        help=f'Base walking speed v0 in m/s (default: {Config.DEFAULT_BASE_SPEED})'
+    )
+    
+    parser.add_argument(
+        '--fps',
+        type=int,
+        default=Config.DEFAULT_FPS,
+        help=f'Nominal frame rate of the recording (default: {Config.DEFAULT_FPS})'
+    )
+    
+    parser.add_argument(
+        '--calibration-duration',
+        type=float,
+        default=Config.DEFAULT_CALIBRATION_DURATION,
+        help=f'Calibration length in seconds (default: {Config.DEFAULT_CALIBRATION_DURATION})'
+    )
+    
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Write the speed stream (timestamp,speed) to this CSV file'
+    )
+    
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    
+    if args.trace.endswith(RECORDING_SUFFIX):
+        trace = session_to_trace(open_session(args.trace))
+    else:
+        trace = load_heel_trace(args.trace)
+    result = replay_trace(
+        trace,
+        v0=args.base_speed,
+        fps=args.fps,
+        calibration_duration=args.calibration_duration
+    )
+    
+    if args.output:
+        np.savetxt(
+            args.output,
+            np.column_stack([result['timestamps'], result['speeds']]),
+            delimiter=',',
+            header='timestamp,speed',
+            comments='',
+            fmt='%.6f'
+        )
+    
+    calib = result['calib_results']
+    
+    print("=" * 60)
+    print("EA-WIP Replay")
+    print("=" * 60)
+    print(f"Trace: {args.trace} ({result['total_frames']} frames)")
+    print(f"Stride Amplitude Baseline (h_c): L {calib['h_c_left']:.4f}  R {calib['h_c_right']:.4f}")
+    print(f"Cadence Baseline (f_c): L {calib['f_c_left']:.2f} Hz  R {calib['f_c_right']:.2f} Hz")
+    if len(result['speeds']) > 0:
+        print(f"Mean speed: {np.mean(result['speeds']):.4f} m/s")
+    print_latency_report("Calibration", result['calibration'])
+    print_latency_report("Inference", result['inference'])
+    print(f"Total: {result['total_frames']} frames in {result['elapsed']:.3f} s "
+          f"({result['throughput_fps']:.0f} frames/s)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
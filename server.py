@@ -0,0 +1,333 @@
+import json
+import logging
+import time
+
+from core.calibration import CalibrationLogic, CalibrationDriftCheck
+from core.inference import InferenceLogic
+from vision.preprocessing import FramePreprocessor
+from vision.pipeline import InferencePipeline
+from communication.udp_client import UDPReceiver
+from communication.async_transport import create_speed_sender
+from utils.config import Config
+from utils.metrics import Metrics
+from utils.profiles import ProfileStore, camera_metadata
+from utils.recording import SessionRecorder
+from utils.scheduler import FairScheduler
+from utils.startup import WarmStartup
+
+
+logger = logging.getLogger("ea_wip.server")
+
+CALIBRATE_COMMANDS = ('calibrate', 'start_calibration')
+
+STATION_KEYS = ('name', 'camera_id', 'camera_width', 'camera_height', 'camera_fourcc', 'udp_ip', 'udp_port',
+                'udp_protocol', 'base_speed', 'profile', 'control_port', 'record')
+
+
+def load_stations(path):
+    with open(path) as f:
+        data = json.load(f)
+    stations = data['stations'] if isinstance(data, dict) else data
+    
+    names = set()
+    for index, station in enumerate(stations):
+        unknown = sorted(set(station) - set(STATION_KEYS))
+        if unknown:
+            raise ValueError(f"Station {index}: unknown keys {', '.join(unknown)}")
+        if 'camera_id' not in station:
+            raise ValueError(f"Station {index}: missing camera_id")
+        station.setdefault('name', f"station{index}")
+        if station['name'] in names:
+            raise ValueError(f"Duplicate station name '{station['name']}'")
+        names.add(station['name'])
+    return stations
+
+
+class StationSession:
+    # one WIP station: camera, pose model, calibration state, EA-WIP and UDP target. Frames are
+    # processed by the server's shared workers, at most one at a time per station, so all
+    # state changes happen inside process_next
+    def __init__(self, station, args, camera_stream, pose_estimator):
+        self.name = station['name']
+        self.station = station
+        self.args = args
+        self.camera_stream = camera_stream
+        self.pose_estimator = pose_estimator
+        self.v0 = station.get('base_speed', args.base_speed)
+        self.fps = Config.DEFAULT_FPS
+        self.metrics = Metrics()
+        
+        self.udp_config = Config.get_udp_config(
+            ip=station.get('udp_ip', args.udp_ip),
+            port=station.get('udp_port', args.udp_port),
+            protocol=station.get('udp_protocol', args.udp_protocol),
+            batch_size=args.udp_batch_size
+        )
+        self.udp_client = create_speed_sender(self.udp_config)
+        
+        self.receiver = None
+        if station.get('control_port') is not None:
+            self.receiver = UDPReceiver(port=station['control_port'])
+        self.recorder = SessionRecorder(station['record']) if station.get('record') else None
+        self.profile_store = None
+        if station.get('profile'):
+            self.profile_store = ProfileStore(args.profile_dir, max_age_days=args.profile_max_age)
+        
+        self.preprocessor = FramePreprocessor(target_size=(640, 480), pool_size=1)
+        self.state = 'waiting'
+        self.calibration_logic = None
+        self.calib_results = None
+        self.pipeline = None
+        self.drift_check = None
+        self.speed = 0.0
+        self.frame_count = 0
+        self.calibration_requested = False
+        self.calibrate_at = None
+    
+    def start(self):
+        self.calib_results = self.load_profile()
+        if self.calib_results is not None:
+            self.start_tracking(from_profile=True)
+        elif self.receiver is not None:
+            logger.info("[%s] Waiting for a calibration command on UDP port %d", self.name,
+                        self.station['control_port'])
+        else:
+            self.calibrate_at = time.monotonic() + self.args.calibration_delay
+            logger.info("[%s] Calibration starts in %.1f s", self.name, self.args.calibration_delay)
+    
+    def load_profile(self):
+        if self.profile_store is None:
+            return None
+        if self.args.recalibrate:
+            return None
+        
+        camera = camera_metadata(self.station['camera_id'], self.camera_stream)
+        calib_results, problem = self.profile_store.load_valid(self.station['profile'], camera)
+        if calib_results is None:
+            logger.info("[%s] Profile '%s' not used: %s", self.name, self.station['profile'], problem)
+            return None
+        
+        logger.info("[%s] Loaded calibration profile '%s', skipping calibration", self.name,
+                    self.station['profile'])
+        return calib_results
+    
+    def save_profile(self):
+        if self.profile_store is None:
+            return
+        if not self.calibration_logic.has_measured_results():
+            logger.warning("[%s] Calibration fell back to default values, profile not saved", self.name)
+            return
+        
+        camera = camera_metadata(self.station['camera_id'], self.camera_stream)
+        try:
+            path = self.profile_store.save(self.station['profile'], self.calib_results, camera)
+            logger.info("[%s] Saved calibration profile to %s", self.name, path)
+        except OSError as e:
+            logger.error("[%s] Could not save calibration profile: %s", self.name, e)
+    
+    def poll_commands(self):
+        if self.receiver is None:
+            return
+        messages = self.receiver.receive_all()
+        if any(message.strip().lower() in CALIBRATE_COMMANDS for message in messages):
+            logger.info("[%s] Calibration requested", self.name)
+            self.calibration_requested = True
+    
+    def start_calibration(self):
+        self.pipeline = None
+        self.drift_check = None
+        self.pose_estimator.reset_roi()
+        self.calibration_logic = CalibrationLogic(
+            fps=self.fps,
+            calibration_duration=Config.DEFAULT_CALIBRATION_DURATION
+        )
+        self.state = 'calibrating'
+        logger.info("[%s] Calibrating (%d frames)", self.name, self.calibration_logic.max_frames)
+    
+    def start_tracking(self, from_profile=False):
+        # a stored profile gets a short check against the user in front of the camera now
+        self.drift_check = CalibrationDriftCheck(self.calib_results, fps=self.fps) if from_profile else None
+        inference_logic = InferenceLogic(self.calib_results, self.v0, fps=self.fps, refractory_period=0.3,
+                                         metrics=self.metrics)
+        # never started: the server's workers call process_frame
+        self.pipeline = InferencePipeline(
+            camera_stream=self.camera_stream,
+            pose_estimator=self.pose_estimator,
+            inference_logic=inference_logic,
+            udp_client=self.udp_client,
+            recorder=self.recorder,
+            metrics=self.metrics,
+            drift_check=self.drift_check
+        )
+        self.state = 'tracking'
+        logger.info("[%s] Tracking, sending speed to %s:%d", self.name, self.udp_config['ip'],
+                    self.udp_config['port'])
+    
+    def process_next(self):
+        frame = self.camera_stream.read_frame(timeout=0)
+        if frame is None:
+            return
+        
+        if self.calibration_requested or (self.calibrate_at is not None and frame.timestamp >= self.calibrate_at):
+            self.calibration_requested = False
+            self.calibrate_at = None
+            self.start_calibration()
+        
+        if self.pipeline is not None:
+            result = self.pipeline.process_frame(frame)
+            self.speed = result['speed']
+            self.frame_count += 1
+            if self.drift_check is not None and self.drift_check.drifted:
+                logger.info("[%s] Calibration profile drifted (%.1f sigma), recalibrating", self.name,
+                            self.drift_check.drift)
+                self.start_calibration()
+        elif self.calibration_logic is not None:
+            self.process_calibration_frame(frame)
+            self.frame_count += 1
+        # still waiting for calibration: the frame is dropped without pose inference
+    
+    def process_calibration_frame(self, frame):
+        image_rgb = self.preprocessor.to_rgb(frame.image)
+        results = self.pose_estimator.process_rgb(image_rgb)
+        heel_data = self.pose_estimator.extract_heel_data(results)
+        self.metrics.tick('pipeline')
+        
+        if self.recorder is not None:
+            self.recorder.append(
+                frame.timestamp,
+                landmarks=self.pose_estimator.extract_landmark_array(results),
+                heel_data=heel_data,
+                frame_index=frame.sequence
+            )
+        
+        if heel_data:
+            self.calibration_logic.process_frame(heel_data['left_height'], heel_data['right_height'],
+                                                 frame.timestamp)
+        
+        if self.calibration_logic.is_calibration_complete():
+            self.calib_results = self.calibration_logic.get_calibration_results()
+            results = self.calib_results
+            logger.info("[%s] Calibration complete: h_c %.4f/%.4f, f_c %.2f/%.2f Hz", self.name,
+                        results['h_c_left'], results['h_c_right'], results['f_c_left'], results['f_c_right'])
+            self.save_profile()
+            self.calibration_logic = None
+            self.start_tracking()
+    
+    def close(self):
+        self.camera_stream.on_frame = None
+        self.camera_stream.stop()
+        self.udp_client.close()
+        if self.receiver is not None:
+            self.receiver.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+class SessionServer:
+    def __init__(self, args):
+        self.args = args
+        self.status_interval = 5.0
+        self.sessions = []
+        self.scheduler = None
+    
+    def start(self):
+        try:
+            stations = load_stations(self.args.stations)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error("Could not load stations from %s: %s", self.args.stations, e)
+            return 1
+        
+        # all cameras and pose models come up at the same time
+        startups = []
+        for station in stations:
+            camera_config = Config.get_camera_config(
+                camera_id=station['camera_id'],
+                width=station.get('camera_width', self.args.camera_width),
+                height=station.get('camera_height', self.args.camera_height),
+                fourcc=station.get('camera_fourcc', self.args.camera_fourcc)
+            )
+            startups.append(WarmStartup(camera_config, roi_mode=self.args.roi,
+                                        model_complexity=self.args.model_complexity).start())
+        
+        self.scheduler = FairScheduler(workers=self.args.workers)
+        for station, startup in zip(stations, startups):
+            startup.wait()
+            if startup.error is not None:
+                logger.error("[%s] Camera initialization failed: %s", station['name'], startup.error)
+                continue
+            
+            try:
+                session = StationSession(station, self.args, startup.camera_stream, startup.pose_estimator)
+            except Exception as e:
+                logger.error("[%s] Initialization failed: %s", station['name'], e)
+                startup.close()
+                continue
+            
+            camera_stream = startup.camera_stream
+            logger.info("[%s] Camera %d: %dx%d @ %.1f fps", session.name, station['camera_id'],
+                        camera_stream.width, camera_stream.height, camera_stream.fps)
+            # a station's share of the workers follows its camera's frame rate
+            self.scheduler.add(session, weight=camera_stream.fps or Config.DEFAULT_FPS)
+            session.start()
+            camera_stream.on_frame = lambda session=session: self.scheduler.notify(session)
+            self.sessions.append(session)
+        
+        if not self.sessions:
+            logger.error("No station could be started")
+            return 1
+        
+        self.scheduler.start()
+        logger.info("Serving %d stations with %d pose workers", len(self.sessions), self.scheduler.num_workers)
+        
+        try:
+            self.run()
+        except KeyboardInterrupt:
+            logger.info("Interrupted, shutting down")
+        finally:
+            self.stop()
+        return 0
+    
+    def run(self):
+        active = list(self.sessions)
+        last_counts = {session.name: 0 for session in self.sessions}
+        last_status = time.monotonic()
+        
+        while active:
+            time.sleep(0.1)
+            for session in list(active):
+                if session.camera_stream.closed:
+                    # no more frames, so the scheduler no longer picks this station
+                    logger.warning("[%s] Camera closed, station stopped", session.name)
+                    active.remove(session)
+                    continue
+                session.poll_commands()
+            
+            now = time.monotonic()
+            if now - last_status >= self.status_interval:
+                elapsed = now - last_status
+                total = 0.0
+                for session in self.sessions:
+                    fps = (session.frame_count - last_counts[session.name]) / elapsed
+                    last_counts[session.name] = session.frame_count
+                    total += fps
+                    logger.info("[%s] %s, %.1f/%.1f fps, speed %.2f m/s, %d camera frames dropped", session.name,
+                                session.state, fps, session.camera_stream.fps, session.speed,
+                                session.camera_stream.dropped_frames)
+                logger.info("Aggregate %.1f fps over %d stations", total, len(self.sessions))
+                last_status = now
+    
+    def stop(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        for session in self.sessions:
+            stats = self.scheduler.stats(session)
+            session.close()
+            wait = stats['wait_time'] / stats['processed'] * 1000 if stats['processed'] else 0.0
+            logger.info("[%s] %d frames processed, %d camera frames dropped, scheduler wait %.1f ms/frame",
+                        session.name, session.frame_count, session.camera_stream.dropped_frames, wait)
+            if session.pipeline is not None:
+                ea_wip = session.pipeline.inference_logic.ea_wip
+                if ea_wip.frame_count:
+                    logger.info("[%s] Occlusion suppression held the speed on %d of %d tracked frames (%.1f%%)",
+                                session.name, ea_wip.suppressed_frames, ea_wip.frame_count,
+                                100.0 * ea_wip.suppressed_frames / ea_wip.frame_count)
\ No newline at end of file
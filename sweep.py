@@ -0,0 +1,302 @@
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from core.replay import load_heel_trace
+from core.sweep import PARAM_NAMES, SWEEP_METRICS, evaluate_trace, expand_grid
+from utils.config import Config
+from utils.recording import RECORDING_SUFFIX, open_session, session_to_trace
+
+
+TRACE_SUFFIXES = ('.csv', '.npz', RECORDING_SUFFIX)
+RESULT_COLUMNS = ('session',) + PARAM_NAMES + SWEEP_METRICS + ('seconds',)
+
+
+@lru_cache(maxsize=4)
+def load_session(path):
+    if path.endswith(RECORDING_SUFFIX):
+        return session_to_trace(open_session(path))
+    return load_heel_trace(path)
+
+
+def run_job(path, params, options):
+    # runs in a worker process; jobs are queued session by session, so the cached
+    # trace serves the worker's following jobs as well
+    start = time.perf_counter()
+    metrics = evaluate_trace(load_session(path), params, **options)
+    metrics['seconds'] = time.perf_counter() - start
+    return metrics
+
+
+def find_sessions(directory):
+    sessions = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(TRACE_SUFFIXES):
+                path = os.path.join(root, name)
+                sessions.append((os.path.relpath(path, directory).replace(os.sep, '/'), path))
+    return sorted(sessions)
+
+
+def parse_grid(args):
+    grid = {}
+    if args.grid_file:
+        with open(args.grid_file) as f:
+            grid.update((name, [float(value) for value in values]) for name, values in json.load(f).items())
+    for entry in args.grid:
+        name, _, values = entry.partition('=')
+        if not values:
+            raise ValueError(f"Grid entry '{entry}' is not NAME=VALUE[,VALUE...]")
+        grid[name.strip()] = [float(value) for value in values.split(',')]
+    return grid
+
+
+def job_key(session, params):
+    return (session,) + tuple(float(params[name]) for name in PARAM_NAMES)
+
+
+def load_finished(path):
+    # rows of an earlier, interrupted run of the same sweep
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return []
+    
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        if tuple(reader.fieldnames or ()) != RESULT_COLUMNS:
+            raise ValueError(f"{path} was not written by this sweep; choose another --output")
+        # a row cut off by the interruption is dropped and its job runs again
+        return [row for row in reader if all(row.get(column) not in (None, '') for column in RESULT_COLUMNS)]
+
+
+def open_results(path):
+    empty = not os.path.exists(path) or os.path.getsize(path) == 0
+    truncated = False
+    if not empty:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            truncated = f.read(1) != b'\n'
+    
+    results_file = open(path, 'a', newline='')
+    if truncated:
+        results_file.write('\n')
+    writer = csv.DictWriter(results_file, fieldnames=RESULT_COLUMNS)
+    if empty:
+        writer.writeheader()
+    return results_file, writer
+
+
+def summarize(rows):
+    # mean over sessions for every parameter set
+    groups = {}
+    for row in rows:
+        key = tuple(float(row[name]) for name in PARAM_NAMES)
+        groups.setdefault(key, []).append(row)
+    
+    summary = []
+    for key, members in groups.items():
+        entry = dict(zip(PARAM_NAMES, key))
+        entry['sessions'] = len(members)
+        for metric in SWEEP_METRICS:
+            values = [float(row[metric]) for row in members if not math.isnan(float(row[metric]))]
+            entry[metric] = sum(values) / len(values) if values else math.nan
+        summary.append(entry)
+    return summary
+
+
+def print_summary(summary, top):
+    # rank by speed error when there is a reference, otherwise by jitter
+    metric = 'speed_mae' if any(not math.isnan(entry['speed_mae']) for entry in summary) else 'jitter'
+    ranked = sorted(summary, key=lambda entry: (math.isnan(entry[metric]), entry[metric]))
+    
+    print(f"Top {min(top, len(ranked))} of {len(ranked)} parameter sets by {metric}:")
+    header = ''.join(f"{name:>18}" for name in PARAM_NAMES)
+    print(f"{header}{'MAE':>10}{'bias':>10}{'suppressed':>12}{'jitter':>10}")
+    for entry in ranked[:top]:
+        values = ''.join(f"{entry[name]:>18.4g}" for name in PARAM_NAMES)
+        print(f"{values}{entry['speed_mae']:>10.4f}{entry['speed_bias']:>10.4f}"
+              f"{entry['suppression_rate']:>12.1%}{entry['jitter']:>10.4f}")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='EA-WIP parameter sweep over recorded sessions'
+    )
+    
+    parser.add_argument(
+        'sessions',
+        type=str,
+        help='Directory of session recordings (.ewrec) and heel traces (.csv or .npz); '
+             'a reference_speed column in a trace is used as ground truth'
+    )
+    
+    parser.add_argument(
+        '--grid',
+        type=str,
+        action='append',
+        default=[],
+        help=f'Parameter values as NAME=VALUE[,VALUE...], repeatable; NAME is one of {", ".join(PARAM_NAMES)}'
+    )
+    
+    parser.add_argument(
+        '--grid-file',
+        type=str,
+        default=None,
+        help='JSON file mapping parameter names to lists of values'
+    )
+    
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='sweep_results.csv',
+        help='Results table, one row per session and parameter set; an existing table is resumed '
+             '(run with the same options) (default: sweep_results.csv)'
+    )
+    
+    parser.add_argument(
+        '--summary',
+        type=str,
+        default=None,
+        help='Also write the per-parameter-set means over all sessions to this CSV file'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes (default: one per CPU core)'
+    )
+    
+    parser.add_argument(
+        '--reference-speed',
+        type=float,
+        default=None,
+        help='Constant ground-truth speed in m/s for traces without a reference_speed column'
+    )
+    
+    parser.add_argument(
+        '--base-speed',
+        type=float,
+        default=Config.DEFAULT_BASE_SPEED,
+        help=f'Base walking speed v0 in m/s (default: {Config.DEFAULT_BASE_SPEED})'
+    )
+    
+    parser.add_argument(
+        '--fps',
+        type=int,
+        default=Config.DEFAULT_FPS,
+        help=f'Nominal frame rate of the recordings (default: {Config.DEFAULT_FPS})'
+    )
+    
+    parser.add_argument(
+        '--calibration-duration',
+        type=float,
+        default=Config.DEFAULT_CALIBRATION_DURATION,
+        help=f'Calibration length in seconds (default: {Config.DEFAULT_CALIBRATION_DURATION})'
+    )
+    
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        help='Parameter sets to list in the report (default: 10)'
+    )
+    
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    
+    try:
+        combinations = expand_grid(parse_grid(args))
+        finished = load_finished(args.output)
+    except (OSError, ValueError) as e:
+        print(f"Sweep Error: {e}")
+        return 1
+    
+    sessions = find_sessions(args.sessions)
+    if not sessions:
+        print(f"Sweep Error: no {', '.join(TRACE_SUFFIXES)} files in {args.sessions}")
+        return 1
+    
+    done = {job_key(row['session'], row) for row in finished}
+    jobs = [(session, path, params) for session, path in sessions for params in combinations
+            if job_key(session, params) not in done]
+    options = {
+        'v0': args.base_speed,
+        'fps': args.fps,
+        'calibration_duration': args.calibration_duration,
+        'reference_speed': args.reference_speed
+    }
+    workers = args.workers or os.cpu_count() or 1
+    
+    print("=" * 60)
+    print("EA-WIP Parameter Sweep")
+    print("=" * 60)
+    print(f"Sessions: {len(sessions)}  Parameter sets: {len(combinations)}  Workers: {workers}")
+    if finished:
+        print(f"Resuming {args.output}: {len(sessions) * len(combinations) - len(jobs)} jobs already done")
+    
+    rows = list(finished)
+    failed = 0
+    interrupted = False
+    start = time.perf_counter()
+    results_file, writer = open_results(args.output)
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_job, path, params, options): (session, params)
+                       for session, path, params in jobs}
+            try:
+                for count, future in enumerate(as_completed(futures), 1):
+                    session, params = futures[future]
+                    try:
+                        metrics = future.result()
+                    except Exception as e:
+                        print(f"Sweep Error: {session}: {e}")
+                        failed += 1
+                        continue
+                    
+                    row = dict(session=session, **params, **metrics)
+                    # flushed per row so an interrupted sweep loses at most the running jobs
+                    writer.writerow(row)
+                    results_file.flush()
+                    rows.append({key: str(value) for key, value in row.items()})
+                    
+                    if count % max(len(jobs) // 10, 1) == 0 or count == len(jobs):
+                        print(f"  {count}/{len(jobs)} jobs ({time.perf_counter() - start:.1f} s)")
+            except KeyboardInterrupt:
+                interrupted = True
+                for future in futures:
+                    future.cancel()
+    finally:
+        results_file.close()
+    
+    elapsed = time.perf_counter() - start
+    if interrupted:
+        print(f"Interrupted after {elapsed:.1f} s; run the same command again to resume")
+        return 1
+    
+    summary = summarize(rows)
+    if args.summary:
+        with open(args.summary, 'w', newline='') as f:
+            summary_writer = csv.DictWriter(f, fieldnames=PARAM_NAMES + ('sessions',) + SWEEP_METRICS)
+            summary_writer.writeheader()
+            summary_writer.writerows(summary)
+    
+    print(f"Ran {len(jobs) - failed} jobs in {elapsed:.1f} s"
+          + (f" ({failed} failed, rerun to retry)" if failed else ""))
+    if summary:
+        print_summary(summary, args.top)
+    print(f"Results: {args.output}")
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
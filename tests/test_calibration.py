@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from benchmarks.calibration_benchmark import synthetic_sessions
+from core.calibration import CalibrationLogic
+
+
+class ReferenceCalibration(CalibrationLogic):
+    # the pre-incremental process_frame: ground reference and std recomputed over the
+    # whole height deques on every frame
+    def process_frame(self, left_heel_height, right_heel_height, current_time):
+        self.left_heel_heights.append(left_heel_height)
+        self.right_heel_heights.append(right_heel_height)
+        self.time_stamps.append(current_time)
+        self.frame_count += 1
+        
+        if self.frame_count <= 90:
+            self.left_steps.prime(left_heel_height)
+            self.right_steps.prime(right_heel_height)
+            return
+        
+        left_y = np.array(list(self.left_heel_heights))
+        right_y = np.array(list(self.right_heel_heights))
+        
+        self.left_mu_h = self.compute_ground_reference(self.left_heel_heights)
+        self.right_mu_h = self.compute_ground_reference(self.right_heel_heights)
+        self.left_sigma_h = np.std(left_y) if len(left_y) > 0 else 0.0
+        self.right_sigma_h = np.std(right_y) if len(right_y) > 0 else 0.0
+        
+        self.left_threshold = self.left_mu_h + self.threshold_factor * self.left_sigma_h
+        self.right_threshold = self.right_mu_h + self.threshold_factor * self.right_sigma_h
+        
+        self.left_steps.threshold = self.left_threshold
+        self.right_steps.threshold = self.right_threshold
+        self.left_steps.update(left_heel_height, current_time)
+        self.right_steps.update(right_heel_height, current_time)
+
+
+def gait_trace(frames, fps, rng):
+    left, right, timestamps = synthetic_sessions(1, frames, fps, rng)
+    return left[0].tolist(), right[0].tolist(), timestamps[0].tolist()
+
+
+ATTRIBUTES = ['left_mu_h', 'right_mu_h', 'left_sigma_h', 'right_sigma_h', 'left_threshold', 'right_threshold']
+
+
+@pytest.mark.parametrize('fps', [30, 60])
+@pytest.mark.parametrize('duration', [8.0, 30.0])
+@pytest.mark.parametrize('length', [40, 90, 91, 150, None])
+def test_matches_full_recomputation(fps, duration, length):
+    rng = np.random.default_rng(fps * 1000 + int(duration) * 10 + (length or 0))
+    frames = length if length is not None else int(fps * duration)
+    
+    for _ in range(3):
+        calibration = CalibrationLogic(fps=fps, calibration_duration=duration)
+        reference = ReferenceCalibration(fps=fps, calibration_duration=duration)
+        for left, right, current_time in zip(*gait_trace(frames, fps, rng)):
+            calibration.process_frame(left, right, current_time)
+            reference.process_frame(left, right, current_time)
+            for name in ATTRIBUTES:
+                assert getattr(calibration, name) == pytest.approx(getattr(reference, name), abs=1e-12)
+        
+        results = calibration.get_calibration_results()
+        expected = reference.get_calibration_results()
+        assert results.keys() == expected.keys()
+        for key in expected:
+            assert results[key] == pytest.approx(expected[key], abs=1e-12), key
+
+
+def test_frames_past_max_frames_are_ignored():
+    # the floor keeps drifting after calibration is complete; none of it may leak in
+    rng = np.random.default_rng(7)
+    calibration = CalibrationLogic(fps=30, calibration_duration=8.0)
+    reference = ReferenceCalibration(fps=30, calibration_duration=8.0)
+    frames = 3 * calibration.max_frames
+    left, right, timestamps = gait_trace(frames, 30, rng)
+    drift = np.linspace(0.0, 0.3, frames)
+    left = (np.array(left) + drift).tolist()
+    right = (np.array(right) + drift).tolist()
+    
+    for i in range(calibration.max_frames):
+        calibration.process_frame(left[i], right[i], timestamps[i])
+        reference.process_frame(left[i], right[i], timestamps[i])
+    assert calibration.is_calibration_complete()
+    expected = reference.get_calibration_results()
+    
+    for i in range(calibration.max_frames, frames):
+        calibration.process_frame(left[i], right[i], timestamps[i])
+    
+    assert calibration.frame_count == calibration.max_frames
+    results = calibration.get_calibration_results()
+    for key in expected:
+        assert results[key] == pytest.approx(expected[key], abs=1e-12), key
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from benchmarks.calibration_benchmark import synthetic_sessions
+from core.calibration import CalibrationLogic
+from core.calibration_batch import BatchCalibration
+
+
+def streaming_results(left, right, timestamps, fps, duration):
+    calibration_logic = CalibrationLogic(fps=fps, calibration_duration=duration)
+    for left_height, right_height, current_time in zip(left, right, timestamps):
+        calibration_logic.process_frame(float(left_height), float(right_height), float(current_time))
+    return calibration_logic
+
+
+def trace_results(trace, fps, duration):
+    # the live and replay paths skip frames without a pose and stop after max_frames
+    calibration_logic = CalibrationLogic(fps=fps, calibration_duration=duration)
+    for left_height, right_height, current_time in zip(trace['left_height'], trace['right_height'],
+                                                       trace['timestamp']):
+        if np.isnan(left_height):
+            continue
+        calibration_logic.process_frame(float(left_height), float(right_height), float(current_time))
+        if calibration_logic.is_calibration_complete():
+            break
+    return calibration_logic.get_calibration_results()
+
+
+def assert_results_equal(results, expected):
+    assert results.keys() == expected.keys()
+    for key in expected:
+        assert results[key] == pytest.approx(expected[key], abs=1e-9), key
+
+
+def pulse_trace(frames, steps, ground=-0.4, height=0.1, width=8):
+    heights = np.full(frames, ground)
+    for start in steps:
+        heights[start:start + width] = ground + height
+    return heights
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_random_sessions(seed):
+    rng = np.random.default_rng(seed)
+    fps = int(rng.integers(15, 61))
+    duration = float(rng.choice([4.0, 8.0]))
+    batch = BatchCalibration(fps=fps, calibration_duration=duration)
+    frames = int(rng.integers(50, batch.max_frames + 1))
+    left, right, timestamps = synthetic_sessions(15, frames, fps, rng, min_cadence=0.3, clock_jitter=0.002,
+                                                 clock_glitches=seed % 2 == 1)
+    
+    results = batch.calibrate_sessions(left, right, timestamps)
+    for s in range(len(results)):
+        expected = streaming_results(left[s], right[s], timestamps[s], fps, duration)
+        assert_results_equal(results[s], expected.get_calibration_results())
+
+
+@pytest.mark.parametrize('frames', [1, 50, 89, 90, 91])
+def test_shorter_than_priming(frames):
+    rng = np.random.default_rng(frames)
+    batch = BatchCalibration(fps=30, calibration_duration=8.0)
+    left, right, timestamps = synthetic_sessions(3, frames, 30, rng, clock_jitter=0.002)
+    
+    results = batch.calibrate_sessions(left, right, timestamps)
+    for s in range(len(results)):
+        expected = streaming_results(left[s], right[s], timestamps[s], 30, 8.0)
+        assert_results_equal(results[s], expected.get_calibration_results())
+        if frames <= batch.prime_frames:
+            assert results[s] == batch.fallback_results()
+
+
+def test_traces_with_missing_pose():
+    rng = np.random.default_rng(3)
+    batch = BatchCalibration(fps=30, calibration_duration=8.0)
+    traces = []
+    for frames in [60, 200, 240, 400, 400, 700]:
+        left, right, timestamps = synthetic_sessions(1, frames, 30, rng, clock_jitter=0.002)
+        left, right = left[0], right[0]
+        no_pose = rng.random(frames) < rng.uniform(0.0, 0.4)
+        left[no_pose] = np.nan
+        right[no_pose] = np.nan
+        traces.append({'left_height': left, 'right_height': right, 'timestamp': timestamps[0]})
+    
+    results = batch.calibrate_traces(traces)
+    assert len(results) == len(traces)
+    for trace, result in zip(traces, results):
+        assert_results_equal(result, trace_results(trace, 30, 8.0))
+        assert_results_equal(batch.calibrate_trace(trace), result)
+
+
+def test_clock_going_backwards():
+    batch = BatchCalibration(fps=30, calibration_duration=8.0)
+    steps = [100, 130, 160, 190, 220]
+    left = pulse_trace(240, steps)
+    right = pulse_trace(240, [s + 15 for s in steps[:-1]])
+    timestamps = np.arange(240) / 30
+    
+    glitched = timestamps.copy()
+    glitched[150:200] -= 10.0
+    
+    regular = streaming_results(left, right, timestamps, 30, 8.0)
+    expected = streaming_results(left, right, glitched, 30, 8.0)
+    # crossings timed before the last accepted one are rejected
+    assert expected.left_steps.crossing_count < regular.left_steps.crossing_count
+    assert expected.left_steps.crossing_count >= 2
+    
+    result = batch.calibrate(left, right, glitched)
+    assert_results_equal(result, expected.get_calibration_results())
+    assert result != batch.calibrate(left, right, timestamps)
+
+
+def test_frames_past_max_frames_are_ignored():
+    rng = np.random.default_rng(5)
+    batch = BatchCalibration(fps=30, calibration_duration=8.0)
+    frames = 3 * batch.max_frames
+    left, right, timestamps = synthetic_sessions(6, frames, 30, rng)
+    # a floor that keeps drifting after calibration must not change the results
+    drift = np.linspace(0.0, 0.3, frames)
+    left += drift
+    right += drift
+    
+    results = batch.calibrate_sessions(left, right, timestamps)
+    truncated = batch.calibrate_sessions(left[:, :batch.max_frames], right[:, :batch.max_frames],
+                                         timestamps[:, :batch.max_frames])
+    assert results == truncated
+    for s in range(len(results)):
+        expected = streaming_results(left[s], right[s], timestamps[s], 30, 8.0)
+        assert expected.frame_count == batch.max_frames
+        assert_results_equal(results[s], expected.get_calibration_results())
+
+
+@pytest.mark.parametrize('left_steps', [[], [120], [120, 125]])
+def test_too_few_crossings(left_steps):
+    batch = BatchCalibration(fps=30, calibration_duration=8.0)
+    left = pulse_trace(240, left_steps)
+    right = pulse_trace(240, [100, 140, 180])
+    timestamps = np.arange(240) / 30
+    
+    expected = streaming_results(left, right, timestamps, 30, 8.0)
+    assert not expected.has_measured_results()
+    result = batch.calibrate(left, right, timestamps)
+    assert_results_equal(result, expected.get_calibration_results())
+    assert result == batch.fallback_results()
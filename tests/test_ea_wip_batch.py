@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from core.ea_wip import EAWIP
+from core.ea_wip_batch import BatchEAWIP
+
+
+def user_calibrations(num_users, rng):
+    calibrations = []
+    for _ in range(num_users):
+        calibrations.append({
+            'h_c_left': float(rng.uniform(0.05, 0.2)),
+            'h_c_right': float(rng.uniform(0.05, 0.2)),
+            'f_c_left': float(rng.uniform(0.8, 2.0)),
+            'f_c_right': float(rng.uniform(0.8, 2.0))
+        })
+    # uncalibrated users fall back to a stride cadence index of 1
+    calibrations[0]['h_c_left'] = None
+    calibrations[1]['f_c_right'] = 0.0
+    return calibrations
+
+
+def frame_inputs(num_users, rng):
+    h_left = rng.uniform(0.0, 0.25, num_users)
+    h_right = rng.uniform(0.0, 0.25, num_users)
+    f_left = rng.uniform(0.5, 2.5, num_users)
+    f_right = rng.uniform(0.5, 2.5, num_users)
+    vis_left = rng.uniform(0.8, 1.0, num_users)
+    vis_right = rng.uniform(0.8, 1.0, num_users)
+    
+    # visibility dips trigger occlusion, fully hidden feet skip it
+    dips = rng.random(num_users) < 0.05
+    vis_left[dips] = rng.uniform(0.0, 0.2, dips.sum())
+    hidden = rng.random(num_users) < 0.03
+    vis_left[hidden] = 0.0
+    vis_right[hidden] = 0.0
+    return h_left, h_right, f_left, f_right, vis_left, vis_right
+
+
+@pytest.mark.parametrize('fps', [30, 60])
+def test_matches_independent_engines(fps):
+    num_users = 6
+    rng = np.random.default_rng(fps)
+    calibrations = user_calibrations(num_users, rng)
+    base_speeds = rng.uniform(1.0, 1.6, num_users)
+    
+    batch = BatchEAWIP(num_users, fps=fps)
+    engines = [EAWIP(fps=fps) for _ in range(num_users)]
+    batch.set_calibration_results(calibrations)
+    for engine, calibration in zip(engines, calibrations):
+        engine.set_calibration_results(calibration)
+    
+    for frame in range(10 * fps):
+        if frame == 5:
+            batch.set_base_speed(base_speeds)
+            for engine, v0 in zip(engines, base_speeds):
+                engine.set_base_speed(float(v0))
+        if frame == 4 * fps:
+            batch.reset([1, 4])
+            engines[1].reset()
+            engines[4].reset()
+        if frame == 7 * fps:
+            batch.reset()
+            for engine in engines:
+                engine.reset()
+        
+        inputs = frame_inputs(num_users, rng)
+        speeds = batch.update(*inputs)
+        for user, engine in enumerate(engines):
+            expected = engine.update(*(float(values[user]) for values in inputs))
+            assert speeds[user] == pytest.approx(expected, abs=1e-12), (frame, user)
+            assert batch.is_occluded[user] == engine.is_occluded, (frame, user)
+    
+    assert sum(engine.suppressed_frames for engine in engines) > 0
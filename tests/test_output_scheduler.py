@@ -0,0 +1,60 @@
+import threading
+import time
+
+from communication.output_scheduler import SpeedOutputScheduler
+
+
+class RecordingSender:
+    def __init__(self):
+        self.speeds = []
+        self._lock = threading.Lock()
+    
+    def send_speed(self, speed, **fields):
+        with self._lock:
+            self.speeds.append(speed)
+    
+    def send_message(self, message):
+        pass
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        pass
+    
+    def count(self):
+        with self._lock:
+            return len(self.speeds)
+
+
+def test_stops_sending_after_tracking_is_lost():
+    sender = RecordingSender()
+    scheduler = SpeedOutputScheduler(sender, rate_hz=200.0, stale_timeout=0.1)
+    try:
+        scheduler.send_speed(1.5, capture_time=time.monotonic())
+        time.sleep(0.05)
+        assert sender.count() > 0
+        
+        time.sleep(0.15)
+        sent = sender.count()
+        time.sleep(0.2)
+        assert sender.count() == sent
+        assert scheduler.stale_ticks > 0
+    finally:
+        scheduler.close()
+
+
+def test_resumes_on_new_sample():
+    sender = RecordingSender()
+    scheduler = SpeedOutputScheduler(sender, rate_hz=200.0, stale_timeout=0.1)
+    try:
+        scheduler.send_speed(1.5, capture_time=time.monotonic() - 1.0)
+        time.sleep(0.05)
+        assert sender.count() == 0
+        
+        scheduler.send_speed(0.8, capture_time=time.monotonic())
+        time.sleep(0.05)
+        assert sender.count() > 0
+        assert sender.speeds[-1] > 0
+    finally:
+        scheduler.close()